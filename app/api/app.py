@@ -5,10 +5,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 from app.main import ResumeEvaluator
-from flask import Flask, request, jsonify, render_template, send_file
+from app.parser.resume_parser import ResumeUpload
+from app.scoring.job_context import JobContext
+from app.models.job_store import BatchJobStore
+from app.services.job_manager import BatchJobManager
+from flask import Flask, Response, request, jsonify, render_template, send_file, stream_with_context
 import json
 from werkzeug.utils import secure_filename
+import hmac
 import traceback
+import uuid
 
 # Get the directory of the current file
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,6 +24,15 @@ static_dir = os.path.join(current_dir, '..', 'static')
 app = Flask(__name__, template_folder=template_dir, static_folder=static_dir, static_url_path='/static')
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Batch evaluation defaults (can be overridden per request)
+app.config['BATCH_WORKERS'] = int(os.environ.get('BATCH_WORKERS', 1))
+app.config['BATCH_CHUNK_SIZE'] = int(os.environ.get('BATCH_CHUNK_SIZE', 1))
+app.config['BATCH_ITEM_TIMEOUT'] = float(os.environ.get('BATCH_ITEM_TIMEOUT', 120))
+# Background workers processing asynchronous batch jobs
+app.config['BATCH_JOB_WORKERS'] = int(os.environ.get('BATCH_JOB_WORKERS', 2))
+app.config['BATCH_JOB_FOLDER'] = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs')
+# Token required (as the X-Admin-Token header) by administrative endpoints; unset disables them
+app.config['ADMIN_TOKEN'] = os.environ.get('ADMIN_TOKEN')
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -25,6 +40,40 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 # Initialize evaluator
 evaluator = ResumeEvaluator()
 
+# Initialize background batch jobs and pick up any left unfinished by a previous run
+job_manager = BatchJobManager(
+    evaluator,
+    BatchJobStore(evaluator.database.db_path),
+    workers=app.config['BATCH_JOB_WORKERS'],
+    item_timeout=app.config['BATCH_ITEM_TIMEOUT']
+)
+job_manager.resume_unfinished_jobs()
+# Finish feedback a stopped process left pending; rows other live processes have claimed are skipped
+evaluator.resume_pending_feedback()
+
+def read_job_context(jd_file) -> JobContext:
+    """Parse an uploaded job description straight from the request stream"""
+    jd_bytes = jd_file.read()
+    try:
+        jd_text = jd_bytes.decode('utf-8')
+    except UnicodeDecodeError:
+        jd_text = jd_bytes.decode('latin-1')
+    return JobContext.from_text(jd_text, evaluator.jd_parser, secure_filename(jd_file.filename))
+
+def read_parallel_settings() -> tuple:
+    """Read workers and chunk_size from the form, clamped to what this machine can run"""
+    workers = int(request.form.get('workers', app.config['BATCH_WORKERS']))
+    chunk_size = int(request.form.get('chunk_size', app.config['BATCH_CHUNK_SIZE']))
+    # One process per CPU at most; more would only add memory and contention
+    return max(1, min(workers, os.cpu_count() or 1)), max(1, chunk_size)
+
+def read_resume_uploads(resume_files) -> list:
+    """Read uploaded resumes into memory (werkzeug already spools large uploads to anonymous temp files)"""
+    return [
+        ResumeUpload(secure_filename(resume_file.filename), resume_file.read())
+        for resume_file in resume_files if resume_file.filename != ''
+    ]
+
 @app.route('/')
 def index():
     """Serve the main dashboard"""
@@ -48,35 +97,18 @@ def evaluate_resume():
             print("Error: Empty filenames")
             return jsonify({'error': 'Both resume and job description files are required'}), 400
         
-        # Save files
-        resume_filename = secure_filename(resume_file.filename)
-        jd_filename = secure_filename(jd_file.filename)
-        
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-        jd_path = os.path.join(app.config['UPLOAD_FOLDER'], jd_filename)
-        
-        print(f"Saving files: {resume_path}, {jd_path}")
-        resume_file.save(resume_path)
-        jd_file.save(jd_path)
-        
         try:
-            # Evaluate resume
+            # Evaluate straight from the uploaded streams; nothing is written to disk
             print("Starting evaluation...")
-            result = evaluator.evaluate(resume_path, jd_path)
+            job_context = read_job_context(jd_file)
+            result = evaluator.evaluate_bytes(resume_file.stream, secure_filename(resume_file.filename),
+                                              job_context=job_context)
             print("Evaluation completed successfully")
             return jsonify(result)
         except Exception as e:
             print(f"Evaluation failed: {str(e)}")
             traceback.print_exc()
             return jsonify({'error': f'Evaluation failed: {str(e)}'}), 500
-        finally:
-            # Clean up uploaded files
-            try:
-                os.remove(resume_path)
-                os.remove(jd_path)
-                print("Cleaned up uploaded files")
-            except Exception as e:
-                print(f"Failed to clean up files: {e}")
     except Exception as e:
         print(f"API endpoint failed: {str(e)}")
         traceback.print_exc()
@@ -106,6 +138,16 @@ def get_evaluation(evaluation_id):
     else:
         return jsonify({'error': 'Evaluation not found'}), 404
 
+@app.route('/api/evaluations/<int:evaluation_id>/feedback', methods=['GET'])
+def get_evaluation_feedback(evaluation_id):
+    """API endpoint to poll for improved feedback generated in the background"""
+    feedback = evaluator.get_improved_feedback(evaluation_id)
+    if feedback:
+        # 202 while the feedback is still being generated
+        return jsonify(feedback), 202 if feedback["status"] == "pending" else 200
+    else:
+        return jsonify({'error': 'Evaluation not found'}), 404
+
 @app.route('/api/statistics', methods=['GET'])
 def get_statistics():
     """API endpoint to get evaluation statistics"""
@@ -182,6 +224,12 @@ def batch_evaluate_resumes():
         # Check for send_emails parameter
         send_emails = request.form.get('send_emails', 'false').lower() == 'true'
         
+        # Parallel execution settings
+        try:
+            workers, chunk_size = read_parallel_settings()
+        except ValueError:
+            return jsonify({'error': 'workers and chunk_size must be integers'}), 400
+        
         if jd_file.filename == '':
             print("Error: Empty job description filename")
             return jsonify({'error': 'Job description file is required'}), 400
@@ -190,30 +238,24 @@ def batch_evaluate_resumes():
             print("Error: No resume files provided")
             return jsonify({'error': 'At least one resume file is required'}), 400
         
-        # Save job description
-        jd_filename = secure_filename(jd_file.filename)
-        jd_path = os.path.join(app.config['UPLOAD_FOLDER'], jd_filename)
-        print(f"Saving job description: {jd_path}")
-        jd_file.save(jd_path)
-        
-        results = []
-        resume_paths = []
+        # Hand the batch to a background job when asked to
+        if request.form.get('async', 'false').lower() == 'true':
+            return submit_batch_job(jd_file, resume_files, send_emails, workers, chunk_size)
         
         try:
-            # Save all resume files first
-            print(f"Saving {len(resume_files)} resume files...")
-            for i, resume_file in enumerate(resume_files):
-                if resume_file.filename != '':
-                    # Save resume
-                    resume_filename = secure_filename(resume_file.filename)
-                    resume_path = os.path.join(app.config['UPLOAD_FOLDER'], resume_filename)
-                    print(f"  Saving resume {i+1}: {resume_path}")
-                    resume_file.save(resume_path)
-                    resume_paths.append(resume_path)
+            # Parse the job description and read all resumes from the request, without touching disk
+            job_context = read_job_context(jd_file)
+            resume_uploads = read_resume_uploads(resume_files)
             
             # Process all resumes
-            print("Starting batch evaluation...")
-            results = evaluator.batch_evaluate(resume_paths, jd_path, send_emails)
+            print(f"Starting batch evaluation of {len(resume_uploads)} resumes...")
+            results = evaluator.batch_evaluate(
+                resume_uploads, send_emails=send_emails,
+                job_context=job_context,
+                workers=workers,
+                chunk_size=chunk_size,
+                item_timeout=app.config['BATCH_ITEM_TIMEOUT']
+            )
             print(f"Batch evaluation completed. Processed {len(results)} resumes.")
             
             return jsonify({
@@ -226,25 +268,169 @@ def batch_evaluate_resumes():
             print(f"Batch processing failed: {str(e)}")
             traceback.print_exc()
             return jsonify({'error': f'Batch processing failed: {str(e)}'}), 500
-        finally:
-            # Clean up job description file
-            try:
-                os.remove(jd_path)
-                print("Cleaned up job description file")
-            except Exception as e:
-                print(f"Failed to clean up job description file: {e}")
-            # Clean up resume files
-            for resume_path in resume_paths:
-                try:
-                    os.remove(resume_path)
-                    print(f"Cleaned up resume file: {resume_path}")
-                except Exception as e:
-                    print(f"Failed to clean up resume file {resume_path}: {e}")
     except Exception as e:
         print(f"Batch API endpoint failed: {str(e)}")
         traceback.print_exc()
         return jsonify({'error': f'Batch API processing failed: {str(e)}'}), 500
 
+def submit_batch_job(jd_file, resume_files, send_emails: bool, workers: int = 1, chunk_size: int = 1):
+    """Store uploaded files in a job directory and queue a background batch job"""
+    job_id = uuid.uuid4().hex
+    job_dir = os.path.join(app.config['BATCH_JOB_FOLDER'], job_id)
+    
+    # Each file gets its own sub-directory so identical upload names cannot collide
+    jd_dir = os.path.join(job_dir, 'jd')
+    os.makedirs(jd_dir, exist_ok=True)
+    jd_path = os.path.join(jd_dir, secure_filename(jd_file.filename))
+    jd_file.save(jd_path)
+    
+    resume_paths = []
+    for i, resume_file in enumerate(resume_files):
+        if resume_file.filename != '':
+            resume_dir = os.path.join(job_dir, str(i))
+            os.makedirs(resume_dir, exist_ok=True)
+            resume_path = os.path.join(resume_dir, secure_filename(resume_file.filename))
+            resume_file.save(resume_path)
+            resume_paths.append(resume_path)
+    
+    job_manager.submit(jd_path, resume_paths, send_emails, job_dir=job_dir, job_id=job_id,
+                       workers=workers, chunk_size=chunk_size)
+    print(f"Queued batch job {job_id} with {len(resume_paths)} resumes")
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'total': len(resume_paths),
+        'status_url': f'/api/batch-jobs/{job_id}'
+    }), 202
+
+@app.route('/api/batch-evaluate/stream', methods=['POST'])
+def stream_batch_evaluate():
+    """API endpoint that streams each batch result as soon as it is ready (NDJSON or Server-Sent Events)"""
+    try:
+        print("=== Starting streaming batch evaluation ===")
+        
+        if 'jd' not in request.files or request.files['jd'].filename == '':
+            return jsonify({'error': 'Job description file is required'}), 400
+        
+        jd_file = request.files['jd']
+        resume_files = [f for f in request.files.getlist('resumes') if f.filename != '']
+        if not resume_files:
+            return jsonify({'error': 'At least one resume file is required'}), 400
+        
+        send_emails = request.form.get('send_emails', 'false').lower() == 'true'
+        stream_format = request.form.get('format', request.args.get('format', 'ndjson')).lower()
+        if stream_format not in ('ndjson', 'sse'):
+            return jsonify({'error': 'format must be ndjson or sse'}), 400
+        try:
+            workers, chunk_size = read_parallel_settings()
+        except ValueError:
+            return jsonify({'error': 'workers and chunk_size must be integers'}), 400
+        
+        # Uploads must be read before the response starts; they are kept in memory, not saved
+        job_context = read_job_context(jd_file)
+        resume_uploads = read_resume_uploads(resume_files)
+    except Exception as e:
+        print(f"Streaming batch API endpoint failed: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'Batch API processing failed: {str(e)}'}), 500
+    
+    def format_result(result: dict) -> dict:
+        # The resume and JD texts are stored with the evaluation; repeating them in every event only bloats the stream
+        return {key: value for key, value in result.items() if key not in ('resume_text', 'jd_text')}
+    
+    def format_event(event: str, payload: dict) -> str:
+        if stream_format == 'sse':
+            return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps(dict(event=event, **payload)) + "\n"
+    
+    def generate():
+        processed = 0
+        try:
+            results = evaluator.iter_batch_evaluate(
+                resume_uploads, send_emails=send_emails,
+                job_context=job_context,
+                workers=workers,
+                chunk_size=chunk_size,
+                item_timeout=app.config['BATCH_ITEM_TIMEOUT']
+            )
+            for result in results:
+                yield format_event('result', {'index': processed, 'total': len(resume_uploads),
+                                              'result': format_result(result)})
+                processed += 1
+            yield format_event('complete', {'total_processed': processed, 'emails_sent': send_emails})
+        except Exception as e:
+            print(f"Streaming batch processing failed: {str(e)}")
+            traceback.print_exc()
+            yield format_event('error', {'error': f'Batch processing failed: {str(e)}', 'total_processed': processed})
+    
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    # Ask proxies not to buffer the stream
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/batch-jobs/<job_id>', methods=['GET'])
+def get_batch_job(job_id):
+    """API endpoint to get progress and partial results of a batch job"""
+    include_results = request.args.get('include_results', 'true').lower() == 'true'
+    job = job_manager.get_job(job_id, include_results)
+    if job:
+        return jsonify(job)
+    else:
+        return jsonify({'error': 'Batch job not found'}), 404
+
+@app.route('/api/rerank', methods=['POST'])
+def rerank_candidates():
+    """API endpoint to re-rank stored candidates against an uploaded job description"""
+    if 'jd' not in request.files or request.files['jd'].filename == '':
+        return jsonify({'error': 'Job description file is required'}), 400
+    
+    job_title = request.form.get('job_title') or None
+    try:
+        limit = int(request.form['limit']) if request.form.get('limit') else None
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    try:
+        job_context = read_job_context(request.files['jd'])
+        candidates = evaluator.rerank_candidates(job_context=job_context, job_title=job_title, limit=limit)
+        return jsonify({'job_title': job_context.job_title, 'candidates': candidates})
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'error': f'Failed to re-rank candidates: {str(e)}'}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """API endpoint to get cache hit/miss counters"""
+    try:
+        return jsonify(evaluator.get_cache_stats())
+    except Exception as e:
+        return jsonify({'error': f'Failed to get metrics: {str(e)}'}), 500
+
+def is_admin_request() -> bool:
+    """Whether the request carries the configured admin token"""
+    token = app.config.get('ADMIN_TOKEN')
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(token) and hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+@app.route('/api/corpus-model/reload', methods=['POST'])
+def reload_corpus_model():
+    """API endpoint to swap in the latest corpus TF-IDF model written by the fitting CLI (admin only)"""
+    if not is_admin_request():
+        return jsonify({'error': 'Admin token required (X-Admin-Token header; set ADMIN_TOKEN to enable)'}), 403
+    try:
+        active = evaluator.semantic_matcher.reload_corpus_model()
+        model = evaluator.semantic_matcher.corpus_model
+        return jsonify({
+            'success': active,
+            'metadata': model.metadata if model is not None else None
+        })
+    except Exception as e:
+        return jsonify({'error': f'Failed to reload corpus model: {str(e)}'}), 500
+
 @app.route('/about')
 def about_page():
     """Serve the about page"""
@@ -27,116 +27,127 @@ except Exception as e:
 
 # Use relative imports with explicit module paths
 try:
-    from app.parser.resume_parser import ResumeParser
+    from app.parser.resume_parser import ResumeParser, ResumeUpload, resume_source_name
+    from app.parser.parse_cache import ParseCache
     from app.parser.jd_parser import JdParser
     from app.scoring.relevance_scorer import RelevanceScorer
     from app.scoring.semantic_matcher import SemanticMatcher
+    from app.scoring.feedback_cache import FeedbackCache
+    from app.scoring.job_context import JobContext
+    from app.scoring.pipeline import score_resume
+    from app.scoring.evaluation_context import EvaluationContext
+    from app.scoring.similarity_cache import get_similarity_cache_stats
     from app.models.database import EvaluationDatabase
     from app.services.email_service import EmailService
+    from app.services.batch_executor import ParallelBatchExecutor
+    from app.services.feedback_manager import FeedbackManager
 except ImportError as e:
     print(f"Error importing modules: {e}")
     # Try alternative import paths
     try:
-        from parser.resume_parser import ResumeParser
+        from parser.resume_parser import ResumeParser, ResumeUpload, resume_source_name
+        from parser.parse_cache import ParseCache
         from parser.jd_parser import JdParser
         from scoring.relevance_scorer import RelevanceScorer
         from scoring.semantic_matcher import SemanticMatcher
+        from scoring.feedback_cache import FeedbackCache
+        from scoring.job_context import JobContext
+        from scoring.pipeline import score_resume
+        from scoring.evaluation_context import EvaluationContext
+        from scoring.similarity_cache import get_similarity_cache_stats
         from models.database import EvaluationDatabase
         from services.email_service import EmailService
+        from services.batch_executor import ParallelBatchExecutor
+        from services.feedback_manager import FeedbackManager
     except ImportError as e2:
         print(f"Failed to import modules with both methods: {e2}")
         raise
 
-from typing import Dict, List
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+# "async" returns evaluations before their LLM feedback is generated; background threads fill it in
+FEEDBACK_MODE = os.getenv('FEEDBACK_MODE', 'sync').lower()
+FEEDBACK_WORKERS = int(os.getenv('FEEDBACK_WORKERS', 2))
 
 class ResumeEvaluator:
     """Main orchestrator for resume evaluation"""
     
-    def __init__(self):
-        self.resume_parser = ResumeParser()
+    FEEDBACK_MODES = ("sync", "async")
+    
+    def __init__(self, feedback_mode: str = None, db_path: str = None):
+        # Evaluations, the parse cache and the feedback cache share one SQLite file (evaluations.db by default)
+        self.parse_cache = ParseCache(db_path)
+        self.resume_parser = ResumeParser(cache=self.parse_cache)
         self.jd_parser = JdParser()
         self.relevance_scorer = RelevanceScorer()
-        self.semantic_matcher = SemanticMatcher()
-        self.database = EvaluationDatabase()
+        self.feedback_cache = FeedbackCache(db_path)
+        self.semantic_matcher = SemanticMatcher(feedback_cache=self.feedback_cache)
+        self.database = EvaluationDatabase(db_path)
         self.email_service = EmailService()
+        self.feedback_mode = (feedback_mode or FEEDBACK_MODE).lower()
+        if self.feedback_mode not in self.FEEDBACK_MODES:
+            raise ValueError(f"Unknown feedback mode: {self.feedback_mode}")
+        self.feedback_manager = FeedbackManager(self.semantic_matcher, self.database, FEEDBACK_WORKERS)
         print("Applicon Resume Evaluator initialized successfully")
     
-    def evaluate(self, resume_path: str, jd_path: str) -> Dict:
-        """Evaluate a resume against a job description"""
-        # Parse resume
-        print(f"Parsing resume: {resume_path}")
-        resume_data = self.resume_parser.parse(resume_path)
-        
-        # Parse job description
+    def prepare_job(self, jd_path: str) -> JobContext:
+        """Read and parse a job description once so it can be reused across resumes"""
         print(f"Parsing job description: {jd_path}")
-        try:
-            with open(jd_path, 'r', encoding='utf-8') as f:
-                jd_text = f.read()
-        except UnicodeDecodeError:
-            # Try with different encoding if UTF-8 fails
-            with open(jd_path, 'r', encoding='latin-1') as f:
-                jd_text = f.read()
-        jd_data = self.jd_parser.parse(jd_text)
-        
-        # Use job title from JD, but if not found, try to infer from resume
-        job_title = jd_data.get("job_title", "Unknown Position")
-        if job_title == "Unknown Position" or job_title == "":
-            # Try to use resume's inferred job title
-            resume_job_title = resume_data.get("job_title", "General Applicant")
-            if resume_job_title and resume_job_title != "General Applicant":
-                job_title = resume_job_title
-            else:
-                job_title = "General Applicant"
-        
-        # Calculate relevance score
-        print("Calculating relevance score...")
-        relevance_result = self.relevance_scorer.calculate_relevance(resume_data, jd_data)
-        
-        # Calculate semantic similarity
-        print("Calculating semantic similarity...")
-        semantic_result = self.semantic_matcher.calculate_semantic_similarity(resume_data, jd_data)
+        return JobContext.from_file(jd_path, self.jd_parser)
+    
+    def evaluate(self, resume_path: Union[str, ResumeUpload], jd_path: str = None,
+                 job_context: Optional[JobContext] = None) -> Dict:
+        """Evaluate a resume (file path or in-memory upload) against a job description file or a prepared JobContext"""
+        if job_context is None:
+            if jd_path is None:
+                raise ValueError("Either jd_path or job_context is required")
+            job_context = self.prepare_job(jd_path)
         
-        # Generate improved feedback
-        print("Generating feedback...")
-        improved_feedback = self.semantic_matcher.get_improved_feedback(resume_data, jd_data)
+        # Parse resume
+        print(f"Parsing resume: {resume_source_name(resume_path)}")
+        resume_data = self.resume_parser.parse_source(resume_path)
         
-        # Combine results
-        evaluation_result = {
-            "resume_filename": os.path.basename(resume_path),
-            "jd_filename": os.path.basename(jd_path),
-            "job_title": job_title,
-            "relevance_score": relevance_result["relevance_score"],
-            "verdict": relevance_result["verdict"],
-            "missing_elements": relevance_result["missing_elements"],
-            "feedback": relevance_result["feedback"],
-            "improved_feedback": improved_feedback,
-            "semantic_similarity": semantic_result["overall_similarity"],
-            "section_similarities": semantic_result["section_similarities"],
-            "resume_text": resume_data["text"],
-            "jd_text": jd_data["text"],
-            "email": resume_data.get("email", ""),
-            "phone": resume_data.get("phone", "")
-        }
+        defer_feedback = self._defer_feedback()
+        context = EvaluationContext(resume_data, job_context)
+        evaluation_result = score_resume(
+            resume_data,
+            resume_source_name(resume_path),
+            job_context,
+            self.relevance_scorer,
+            self.semantic_matcher,
+            context=context,
+            defer_feedback=defer_feedback
+        )
         
         # Save to database
         print("Saving evaluation to database...")
         evaluation_id = self.database.save_evaluation(evaluation_result)
         evaluation_result["evaluation_id"] = evaluation_id
         
+        if defer_feedback:
+            # The row is saved as pending; the feedback is written into it when ready
+            self.feedback_manager.submit(evaluation_id, resume_data, job_context, context)
+        
         return evaluation_result
     
-    def batch_evaluate(self, resume_paths: List[str], jd_path: str, send_emails: bool = False) -> List[Dict]:
-        """Evaluate multiple resumes against a single job description"""
-        results = []
-        for resume_path in resume_paths:
-            try:
-                result = self.evaluate(resume_path, jd_path)
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    "resume_filename": os.path.basename(resume_path),
-                    "error": str(e)
-                })
+    def evaluate_bytes(self, data: Union[bytes, BinaryIO], filename: str, jd_path: str = None,
+                       job_context: Optional[JobContext] = None) -> Dict:
+        """Evaluate a resume held in memory (bytes or a binary stream) without writing it to disk"""
+        if not isinstance(data, (bytes, bytearray)):
+            data = data.read()
+        return self.evaluate(ResumeUpload(filename, bytes(data)), jd_path, job_context)
+    
+    def batch_evaluate(self, resume_paths: List[Union[str, ResumeUpload]], jd_path: str = None, send_emails: bool = False,
+                       job_context: Optional[JobContext] = None, workers: int = 1, chunk_size: int = 1,
+                       item_timeout: Optional[float] = None) -> List[Dict]:
+        """Evaluate multiple resumes against a single job description (on a process pool when workers > 1)"""
+        results = list(self.iter_batch_evaluate(
+            resume_paths, jd_path,
+            job_context=job_context,
+            workers=workers,
+            chunk_size=chunk_size,
+            item_timeout=item_timeout
+        ))
         
         # Send emails if requested
         if send_emails and self.email_service.is_configured():
@@ -146,6 +157,144 @@ class ResumeEvaluator:
         
         return results
     
+    def iter_batch_evaluate(self, resume_paths: List[Union[str, ResumeUpload]], jd_path: str = None, send_emails: bool = False,
+                            job_context: Optional[JobContext] = None, workers: int = 1, chunk_size: int = 1,
+                            item_timeout: Optional[float] = None) -> Iterator[Dict]:
+        """Evaluate multiple resumes, yielding each saved result in input order as soon as it is ready"""
+        # Parse the job description once for the whole batch
+        if job_context is None:
+            job_context = self.prepare_job(jd_path)
+        
+        # Check email configuration once rather than per candidate
+        send_emails = send_emails and self.email_service.is_configured()
+        
+        if workers and workers > 1:
+            # Workers only parse and score; results come back in input order and are saved here.
+            # LLM feedback is never generated in the workers, so this process's dispatcher holds the whole
+            # rate limit and concurrency budget instead of each worker having its own
+            uses_llm = self.semantic_matcher.uses_llm_feedback()
+            executor = ParallelBatchExecutor(workers, chunk_size, item_timeout, self.parse_cache.db_path,
+                                             defer_feedback=uses_llm)
+            results = executor.iter_run(resume_paths, job_context)
+            if uses_llm and not self._defer_feedback():
+                results = self._iter_with_feedback(results, job_context, workers * max(1, chunk_size))
+        else:
+            results = self._iter_serial_evaluate(resume_paths, job_context)
+        
+        for result in results:
+            if "error" not in result:
+                if "evaluation_id" not in result:
+                    result["evaluation_id"] = self.database.save_evaluation(result)
+                    if result.get("feedback_status") == "pending":
+                        self._submit_feedback(result["evaluation_id"], result["resume_text"], job_context)
+                if send_emails:
+                    self.email_service.send_feedback_email(result)
+            yield result
+    
+    def _iter_with_feedback(self, results: Iterator[Dict], job_context: JobContext, group_size: int) -> Iterator[Dict]:
+        """Fill in the LLM feedback workers left pending, dispatching it a group of results at a time"""
+        group = []
+        for result in results:
+            group.append(result)
+            if len(group) >= group_size:
+                yield from self._generate_feedback(group, job_context)
+                group = []
+        yield from self._generate_feedback(group, job_context)
+    
+    def _generate_feedback(self, results: List[Dict], job_context: JobContext) -> List[Dict]:
+        """Generate improved feedback for the pending results together through this process's dispatcher"""
+        pending = [r for r in results if r.get("feedback_status") == "pending"]
+        if not pending:
+            return results
+        
+        resumes = [self.resume_parser.parse_from_text(r["resume_text"] or "") for r in pending]
+        contexts = []
+        for resume_data, result in zip(resumes, pending):
+            context = EvaluationContext(resume_data, job_context)
+            # Reuse the worker's semantic similarity for rule-based fallbacks
+            context.put(EvaluationContext.SEMANTIC_SIMILARITY, {
+                "overall_similarity": result["semantic_similarity"],
+                "section_similarities": result["section_similarities"]
+            })
+            contexts.append(context)
+        
+        try:
+            feedback = self.semantic_matcher.get_improved_feedback_batch(resumes, job_context, contexts)
+        except Exception as e:
+            print(f"Batched feedback generation failed, generating it resume by resume: {e}")
+            feedback = [self.semantic_matcher.get_improved_feedback(resume_data, job_context, context)
+                        for resume_data, context in zip(resumes, contexts)]
+        for result, improved_feedback in zip(pending, feedback):
+            result["improved_feedback"] = improved_feedback
+            result["feedback_status"] = "ready"
+        return results
+    
+    def _iter_serial_evaluate(self, resume_paths: List[Union[str, ResumeUpload]], job_context: JobContext) -> Iterator[Dict]:
+        """Evaluate resumes one by one in this process"""
+        for resume_path in resume_paths:
+            try:
+                yield self.evaluate(resume_path, job_context=job_context)
+            except Exception as e:
+                yield {
+                    "resume_filename": resume_source_name(resume_path),
+                    "error": str(e)
+                }
+    
+    def get_improved_feedback(self, evaluation_id: int) -> Optional[Dict]:
+        """Get an evaluation's improved feedback and its status (pending, ready or failed)"""
+        return self.database.get_improved_feedback(evaluation_id)
+    
+    def resume_pending_feedback(self) -> List[int]:
+        """Re-queue pending feedback no live process has claimed, re-parsing the stored texts"""
+        evaluation_ids = []
+        for evaluation in self.database.get_pending_feedback():
+            try:
+                job_context = JobContext.from_text(evaluation["jd_text"] or "", self.jd_parser,
+                                                   evaluation["jd_filename"] or "")
+                self._submit_feedback(evaluation["id"], evaluation["resume_text"], job_context)
+                evaluation_ids.append(evaluation["id"])
+            except Exception as e:
+                print(f"Failed to resume feedback for evaluation {evaluation['id']}: {e}")
+        if evaluation_ids:
+            print(f"Resumed feedback generation for {len(evaluation_ids)} evaluations")
+        return evaluation_ids
+    
+    def _defer_feedback(self) -> bool:
+        """Whether feedback is left pending and generated in the background"""
+        # Rule-based feedback takes milliseconds, so only LLM feedback is deferred
+        return self.feedback_mode == "async" and self.semantic_matcher.uses_llm_feedback()
+    
+    def _submit_feedback(self, evaluation_id: int, resume_text: str, job_context: JobContext):
+        """Queue background feedback for a saved evaluation parsed elsewhere"""
+        # Parsing is lazy, so only the fields the feedback reads are extracted
+        resume_data = self.resume_parser.parse_from_text(resume_text or "")
+        self.feedback_manager.submit(evaluation_id, resume_data, job_context)
+    
+    def rerank_candidates(self, jd_path: str = None, job_context: Optional[JobContext] = None,
+                          job_title: str = None, limit: Optional[int] = None) -> List[Dict]:
+        """Re-score stored candidates against a (new or changed) job description, best first"""
+        if job_context is None:
+            job_context = self.prepare_job(jd_path)
+        
+        evaluations = self.database.get_evaluations(job_title)
+        resumes = [self.resume_parser.parse_from_text(e.get("resume_text") or "") for e in evaluations]
+        print(f"Re-ranking {len(resumes)} stored candidates...")
+        scores = self.relevance_scorer.calculate_relevance_batch(resumes, job_context)
+        
+        ranked = []
+        for evaluation, score in zip(evaluations, scores):
+            ranked.append({
+                "evaluation_id": evaluation["id"],
+                "resume_filename": evaluation["resume_filename"],
+                "email": evaluation.get("email", ""),
+                "previous_score": evaluation["relevance_score"],
+                "relevance_score": score["relevance_score"],
+                "verdict": score["verdict"],
+                "missing_elements": score["missing_elements"]
+            })
+        ranked.sort(key=lambda candidate: candidate["relevance_score"], reverse=True)
+        return ranked[:limit] if limit else ranked
+    
     def send_evaluation_email(self, evaluation_id: int) -> bool:
         """Send email for a specific evaluation"""
         evaluation = self.get_evaluation(evaluation_id)
@@ -169,6 +318,16 @@ class ResumeEvaluator:
         """Get all unique job titles from evaluations"""
         return self.database.get_unique_job_titles()
     
+    def get_cache_stats(self) -> dict:
+        """Get parse, fuzzy similarity and LLM feedback cache hit/miss counters and sizes, and LLM request counters"""
+        return {
+            "parse_cache": self.parse_cache.get_stats(),
+            "feedback_cache": self.feedback_cache.get_stats(),
+            # Counts this process only; batch worker processes keep their own caches
+            "fuzzy_cache": get_similarity_cache_stats(),
+            "llm_dispatcher": self.semantic_matcher.get_llm_stats()
+        }
+    
     def get_statistics(self) -> dict:
         """Get evaluation statistics"""
         try:
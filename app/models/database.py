@@ -4,6 +4,10 @@ import json
 import os
 from datetime import datetime
 import base64
+import time
+
+# Seconds after which another process may take over feedback a process claimed but never wrote
+FEEDBACK_LEASE = float(os.getenv('FEEDBACK_LEASE', 300))
 
 class EvaluationDatabase:
     """Handle database operations for storing evaluation results"""
@@ -37,7 +41,11 @@ class EvaluationDatabase:
                 resume_text TEXT,
                 jd_text TEXT,
                 candidate_email TEXT,
-                candidate_phone TEXT
+                candidate_phone TEXT,
+                improved_feedback TEXT,
+                feedback_status TEXT,
+                feedback_owner TEXT,
+                feedback_heartbeat REAL
             )
         ''')
         
@@ -59,6 +67,17 @@ class EvaluationDatabase:
             except sqlite3.OperationalError as e:
                 print(f"Error adding candidate_phone column: {e}")
         
+        # Improved feedback may be generated after the row is saved; feedback_status tracks it, and
+        # feedback_owner/feedback_heartbeat record which process claimed the generation and when
+        for column, column_type in (('improved_feedback', 'TEXT'), ('feedback_status', 'TEXT'),
+                                    ('feedback_owner', 'TEXT'), ('feedback_heartbeat', 'REAL')):
+            if column not in columns:
+                try:
+                    cursor.execute(f"ALTER TABLE evaluations ADD COLUMN {column} {column_type}")
+                    print(f"Added {column} column")
+                except sqlite3.OperationalError as e:
+                    print(f"Error adding {column} column: {e}")
+        
         # Create indexes for faster queries
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_job_title ON evaluations(job_title)
@@ -83,8 +102,8 @@ class EvaluationDatabase:
             INSERT INTO evaluations 
             (resume_filename, jd_filename, job_title, relevance_score, verdict, 
              missing_elements, feedback, semantic_similarity, resume_text, jd_text,
-             candidate_email, candidate_phone)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+             candidate_email, candidate_phone, improved_feedback, feedback_status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             evaluation_data.get("resume_filename", ""),
             evaluation_data.get("jd_filename", ""),
@@ -97,7 +116,9 @@ class EvaluationDatabase:
             evaluation_data.get("resume_text", ""),
             evaluation_data.get("jd_text", ""),
             evaluation_data.get("email", ""),
-            evaluation_data.get("phone", "")
+            evaluation_data.get("phone", ""),
+            evaluation_data.get("improved_feedback", ""),
+            evaluation_data.get("feedback_status", "ready")
         ))
         
         evaluation_id = cursor.lastrowid
@@ -186,6 +207,76 @@ class EvaluationDatabase:
         conn.close()
         return evaluation
     
+    def update_improved_feedback(self, evaluation_id: int, improved_feedback: str, status: str = "ready") -> bool:
+        """Store feedback generated after the evaluation was saved"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        # Writing the feedback (or resetting it to pending) releases any claim on it
+        cursor.execute(
+            "UPDATE evaluations SET improved_feedback = ?, feedback_status = ?, feedback_owner = NULL, "
+            "feedback_heartbeat = NULL WHERE id = ?",
+            (improved_feedback, status, evaluation_id)
+        )
+        rows_affected = cursor.rowcount
+        
+        conn.commit()
+        conn.close()
+        
+        return rows_affected > 0
+    
+    def get_improved_feedback(self, evaluation_id: int) -> Optional[Dict]:
+        """Get an evaluation's improved feedback and whether it is pending, ready or failed"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT improved_feedback, feedback_status FROM evaluations WHERE id = ?", (evaluation_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if not row:
+            return None
+        return {
+            "evaluation_id": evaluation_id,
+            # Rows saved before feedback was stored have no status
+            "status": row[1] or "ready",
+            "improved_feedback": row[0] or ""
+        }
+    
+    def claim_feedback(self, evaluation_id: int, owner: str, lease: float = None) -> bool:
+        """Atomically take pending feedback that is unclaimed, or whose claim has gone stale"""
+        stale_cutoff = time.time() - (FEEDBACK_LEASE if lease is None else lease)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "UPDATE evaluations SET feedback_owner = ?, feedback_heartbeat = ? WHERE id = ? "
+            "AND feedback_status = 'pending' AND (feedback_heartbeat IS NULL OR feedback_heartbeat < ?)",
+            (owner, time.time(), evaluation_id, stale_cutoff)
+        )
+        claimed = cursor.rowcount == 1
+        
+        conn.commit()
+        conn.close()
+        return claimed
+    
+    def get_pending_feedback(self, lease: float = None) -> List[Dict]:
+        """Get pending evaluations no live process has claimed (never claimed, or claim stale), oldest first"""
+        stale_cutoff = time.time() - (FEEDBACK_LEASE if lease is None else lease)
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "SELECT id, resume_text, jd_text, jd_filename FROM evaluations WHERE feedback_status = 'pending' "
+            "AND (feedback_heartbeat IS NULL OR feedback_heartbeat < ?) ORDER BY id",
+            (stale_cutoff,)
+        )
+        columns = [description[0] for description in cursor.description]
+        pending = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        conn.close()
+        return pending
+    
     def get_evaluations_by_job_title(self, job_title: str) -> List[Dict]:
         """Retrieve all evaluations for a specific job title"""
         return self.get_evaluations(job_title=job_title)
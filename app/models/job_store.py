@@ -0,0 +1,244 @@
+import sqlite3
+from typing import List, Dict, Optional
+import json
+import os
+import time
+import uuid
+
+# Seconds without a heartbeat after which a running job's owner is presumed dead and the job may be taken over
+BATCH_JOB_LEASE = float(os.getenv('BATCH_JOB_LEASE', 300))
+
+class BatchJobStore:
+    """Persist asynchronous batch job state so jobs survive a worker restart"""
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            # Share the evaluations database file
+            self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'evaluations.db')
+        else:
+            self.db_path = db_path
+        self.init_database()
+
+    def init_database(self):
+        """Initialize the batch job tables"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                id TEXT PRIMARY KEY,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                status TEXT NOT NULL,
+                jd_path TEXT NOT NULL,
+                jd_filename TEXT,
+                job_dir TEXT,
+                send_emails INTEGER DEFAULT 0,
+                total INTEGER DEFAULT 0,
+                error TEXT,
+                owner TEXT,
+                heartbeat REAL,
+                workers INTEGER DEFAULT 1,
+                chunk_size INTEGER DEFAULT 1
+            )
+        ''')
+
+        # Jobs are claimed by one process at a time; owner and heartbeat form its lease.
+        # workers and chunk_size are the job's process-pool settings
+        cursor.execute("PRAGMA table_info(batch_jobs)")
+        columns = [column[1] for column in cursor.fetchall()]
+        for column, column_type in (('owner', 'TEXT'), ('heartbeat', 'REAL'),
+                                    ('workers', 'INTEGER DEFAULT 1'), ('chunk_size', 'INTEGER DEFAULT 1')):
+            if column not in columns:
+                try:
+                    cursor.execute(f"ALTER TABLE batch_jobs ADD COLUMN {column} {column_type}")
+                    print(f"Added batch_jobs.{column} column")
+                except sqlite3.OperationalError as e:
+                    print(f"Error adding batch_jobs.{column} column: {e}")
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS batch_job_items (
+                job_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                resume_path TEXT NOT NULL,
+                resume_filename TEXT NOT NULL,
+                status TEXT NOT NULL,
+                evaluation_id INTEGER,
+                result TEXT,
+                PRIMARY KEY (job_id, position)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_batch_job_status ON batch_jobs(status)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def create_job(self, jd_path: str, resume_paths: List[str], send_emails: bool = False,
+                   job_dir: str = None, job_id: str = None, workers: int = 1, chunk_size: int = 1) -> str:
+        """Create a queued job with one pending item per resume"""
+        job_id = job_id or uuid.uuid4().hex
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            INSERT INTO batch_jobs (id, status, jd_path, jd_filename, job_dir, send_emails, total, workers, chunk_size)
+            VALUES (?, 'queued', ?, ?, ?, ?, ?, ?, ?)
+        ''', (job_id, jd_path, os.path.basename(jd_path), job_dir, int(send_emails), len(resume_paths),
+              workers, chunk_size))
+
+        cursor.executemany('''
+            INSERT INTO batch_job_items (job_id, position, resume_path, resume_filename, status)
+            VALUES (?, ?, ?, ?, 'pending')
+        ''', [(job_id, i, path, os.path.basename(path)) for i, path in enumerate(resume_paths)])
+
+        conn.commit()
+        conn.close()
+        return job_id
+
+    def set_job_status(self, job_id: str, status: str, error: str = None):
+        """Update the status of a job"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE batch_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
+        ''', (status, error, job_id))
+        conn.commit()
+        conn.close()
+
+    def record_item_result(self, job_id: str, position: int, result: Dict):
+        """Store the outcome of one resume in a job"""
+        status = "failed" if "error" in result else "done"
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE batch_job_items SET status = ?, evaluation_id = ?, result = ?
+            WHERE job_id = ? AND position = ?
+        ''', (status, result.get("evaluation_id"), json.dumps(result), job_id, position))
+        cursor.execute('''
+            UPDATE batch_jobs SET updated_at = CURRENT_TIMESTAMP WHERE id = ?
+        ''', (job_id,))
+        conn.commit()
+        conn.close()
+
+    def get_pending_items(self, job_id: str) -> List[Dict]:
+        """Get items of a job that have not been processed yet"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT position, resume_path FROM batch_job_items
+            WHERE job_id = ? AND status = 'pending' ORDER BY position
+        ''', (job_id,))
+        items = [{"position": row[0], "resume_path": row[1]} for row in cursor.fetchall()]
+        conn.close()
+        return items
+
+    def claim_job(self, job_id: str, owner: str, lease: float = None) -> bool:
+        """Atomically take a queued job, or a running one whose owner stopped renewing its lease"""
+        stale_cutoff = time.time() - (BATCH_JOB_LEASE if lease is None else lease)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE batch_jobs SET status = 'running', owner = ?, heartbeat = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND (status = 'queued' OR
+                              (status = 'running' AND (heartbeat IS NULL OR heartbeat < ?)))
+        ''', (owner, time.time(), job_id, stale_cutoff))
+        claimed = cursor.rowcount == 1
+        conn.commit()
+        conn.close()
+        return claimed
+
+    def renew_claim(self, job_id: str, owner: str) -> bool:
+        """Refresh a job's lease; False if another process has taken the job over"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE batch_jobs SET heartbeat = ? WHERE id = ? AND owner = ? AND status = 'running'
+        ''', (time.time(), job_id, owner))
+        renewed = cursor.rowcount == 1
+        conn.commit()
+        conn.close()
+        return renewed
+
+    def get_unfinished_job_ids(self, lease: float = None) -> List[str]:
+        """Get queued jobs and running jobs whose lease has expired (their process stopped)"""
+        stale_cutoff = time.time() - (BATCH_JOB_LEASE if lease is None else lease)
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id FROM batch_jobs
+            WHERE status = 'queued' OR (status = 'running' AND (heartbeat IS NULL OR heartbeat < ?))
+            ORDER BY created_at
+        ''', (stale_cutoff,))
+        job_ids = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        return job_ids
+
+    def get_job(self, job_id: str, include_results: bool = True) -> Optional[Dict]:
+        """Get a job with its progress and, optionally, the results available so far"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT * FROM batch_jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+
+        columns = [description[0] for description in cursor.description]
+        job = dict(zip(columns, row))
+        job["send_emails"] = bool(job["send_emails"])
+
+        cursor.execute('''
+            SELECT position, resume_filename, status, evaluation_id, result
+            FROM batch_job_items WHERE job_id = ? ORDER BY position
+        ''', (job_id,))
+        items = cursor.fetchall()
+        conn.close()
+
+        done = sum(1 for item in items if item[2] == "done")
+        failed = sum(1 for item in items if item[2] == "failed")
+        job["progress"] = {
+            "total": job["total"],
+            "processed": done + failed,
+            "succeeded": done,
+            "failed": failed,
+            "percent": round((done + failed) * 100 / job["total"], 1) if job["total"] else 100.0
+        }
+
+        if include_results:
+            results = []
+            for position, resume_filename, status, evaluation_id, result in items:
+                if status == "pending":
+                    continue
+                try:
+                    results.append(json.loads(result))
+                except:
+                    results.append({"resume_filename": resume_filename, "evaluation_id": evaluation_id})
+            job["results"] = results
+
+        # Internal paths and the lease are not part of the public job description
+        for key in ("jd_path", "job_dir", "owner", "heartbeat"):
+            job.pop(key, None)
+        return job
+
+    def get_job_files(self, job_id: str) -> Optional[Dict]:
+        """Get the stored file locations and options needed to run a job"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT jd_path, job_dir, send_emails, workers, chunk_size FROM batch_jobs WHERE id = ?", (job_id,)
+        )
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
+            return None
+        return {"jd_path": row[0], "job_dir": row[1], "send_emails": bool(row[2]),
+                "workers": row[3] or 1, "chunk_size": row[4] or 1}
+
+    def get_job_results(self, job_id: str) -> List[Dict]:
+        """Get the stored results of every processed item in a job"""
+        job = self.get_job(job_id, include_results=True)
+        return job["results"] if job else []
@@ -0,0 +1,233 @@
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterable, List, Sequence, Tuple
+try:
+    from app.utils.tokenizer import TokenizedText, tokenize
+except ImportError:
+    from utils.tokenizer import TokenizedText, tokenize
+
+class ParsedDocument(Mapping):
+    """Parse result stored compactly and read through a dict-compatible, read-only view"""
+
+    # Keys of the dict view, in the order the parsers used to build their dicts
+    KEYS: Tuple[str, ...] = ()
+
+    # Fields left as None are computed with the parser on first access and memoized. Two threads
+    # may both compute a missing field; they store equal values, so no lock is needed.
+    __slots__ = ("text", "_parser", "_tokens", "_keyword_ids", "_skills", "_skill_ids")
+
+    def __init__(self, text: str, parser=None):
+        self.text = text
+        self._parser = parser
+        self._tokens = None
+        self._keyword_ids = None
+        self._skills = None
+        self._skill_ids = None
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self.text)} characters)"
+
+    def __getstate__(self) -> Dict:
+        # Compute every field so the copy does not need the parser
+        self.materialize()
+        state = {slot: getattr(self, slot) for cls in type(self).__mro__ for slot in getattr(cls, '__slots__', ())}
+        state["_parser"] = None
+        return state
+
+    def __setstate__(self, state: Dict):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def materialize(self) -> "ParsedDocument":
+        """Compute every lazy field now"""
+        for key in self.KEYS:
+            getattr(self, key)
+        return self
+
+    @property
+    def tokens(self) -> TokenizedText:
+        if self._tokens is None:
+            self._tokens = tokenize(self.text)
+        return self._tokens
+
+    @property
+    def keywords(self) -> List[str]:
+        """Distinct keywords: alphabetic terms in order of first occurrence, then lowercased skill names"""
+        if self._keyword_ids is None:
+            self._set_keywords(self._parser._extract_keywords(self.tokens))
+        terms = self.tokens.terms
+        return list(dict.fromkeys([terms[term_id] for term_id in self._keyword_ids] +
+                                  [skill.lower() for skill in self._get_skills()]))
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self._get_skills())
+
+    @property
+    def skill_ids(self) -> List[int]:
+        self._get_skills()
+        return list(self._skill_ids)
+
+    def to_dict(self) -> Dict:
+        """Plain dict of every field except the tokens"""
+        return {key: self[key] for key in self.KEYS if key != "tokens"}
+
+    def _get_skills(self) -> Tuple[str, ...]:
+        if self._skills is None:
+            lexicon = self._parser.lexicon
+            skill_ids = lexicon.skill_ids(self.text)
+            self._set_skills([lexicon.names[skill_id] for skill_id in skill_ids], skill_ids)
+        return self._skills
+
+    def _set_keywords(self, keywords: Iterable[str]):
+        # Keywords are terms of the document's own tokens, kept as term IDs
+        keyword_set = set(keywords)
+        self._keyword_ids = array('I', (term_id for term_id, term in enumerate(self.tokens.terms)
+                                        if term in keyword_set))
+
+    def _set_skills(self, skills: Sequence[str], skill_ids: Sequence[int]):
+        # Canonical names are the lexicon's own strings, shared by every document
+        self._skill_ids = array('I', skill_ids)
+        self._skills = tuple(skills)
+
+    def _base_state(self) -> Dict:
+        """JSON-serializable fields shared by all parsed documents (tokens are rebuilt from the text)"""
+        return {
+            "text": self.text,
+            "keyword_ids": list(self._keyword_ids),
+            "skills": list(self._skills),
+            "skill_ids": list(self._skill_ids)
+        }
+
+    def _restore_base_state(self, state: Dict):
+        self._keyword_ids = array('I', state["keyword_ids"])
+        self._set_skills(state["skills"], state["skill_ids"])
+
+class ParsedResume(ParsedDocument):
+    """A parsed resume: the text once, sections as offsets into it, keywords and skills as IDs"""
+
+    KEYS = ("text", "tokens", "sections", "section_ranges", "keywords", "skills", "skill_ids",
+            "email", "phone", "job_title")
+
+    __slots__ = ("section_names", "_section_offsets", "_email", "_phone", "_job_title")
+
+    def __init__(self, text: str, parser):
+        """Parse lazily: each field is extracted with the parser the first time it is read"""
+        super().__init__(text, parser)
+        # Shared tuple of section names; offsets are flattened (section index, start, end) triples
+        self.section_names = parser.SECTION_NAMES if parser is not None else ()
+        self._section_offsets = None
+        self._email = None
+        self._phone = None
+        self._job_title = None
+
+    @property
+    def section_ranges(self) -> Dict[str, List[List[int]]]:
+        """Section name -> [start, end] offsets of its parts in the text"""
+        if self._section_offsets is None:
+            spans = self._parser.segment_sections(self.text)
+            self._set_section_ranges(self._parser.segmenter.ranges(self.text, spans))
+        ranges = {name: [] for name in self.section_names}
+        offsets = self._section_offsets
+        for i in range(0, len(offsets), 3):
+            ranges[self.section_names[offsets[i]]].append([offsets[i + 1], offsets[i + 2]])
+        return ranges
+
+    @property
+    def sections(self) -> Dict[str, str]:
+        """Section name -> text, sliced from the document on access (parts joined by blank lines)"""
+        text = self.text
+        return {name: "\n\n".join(text[start:end] for start, end in ranges)
+                for name, ranges in self.section_ranges.items()}
+
+    @property
+    def email(self) -> str:
+        if self._email is None:
+            self._email = self._parser.extract_email(self.text)
+        return self._email
+
+    @property
+    def phone(self) -> str:
+        if self._phone is None:
+            self._phone = self._parser.extract_phone(self.text)
+        return self._phone
+
+    @property
+    def job_title(self) -> str:
+        if self._job_title is None:
+            self._job_title = self._parser.extract_job_title(self.text)
+        return self._job_title
+
+    def to_state(self) -> Dict:
+        """Compact JSON-serializable form of every field, as stored in the parse cache"""
+        self.materialize()
+        state = self._base_state()
+        state.update({
+            "section_offsets": list(self._section_offsets),
+            "email": self._email,
+            "phone": self._phone,
+            "job_title": self._job_title
+        })
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict, parser) -> "ParsedResume":
+        """Rebuild a parsed resume from to_state() output, without re-running any extraction"""
+        resume = cls(state["text"], parser)
+        resume._restore_base_state(state)
+        resume._section_offsets = array('I', state["section_offsets"])
+        resume._email = state["email"]
+        resume._phone = state["phone"]
+        resume._job_title = state["job_title"]
+        return resume
+
+    def _set_section_ranges(self, section_ranges: Dict[str, List[List[int]]]):
+        offsets = array('I')
+        for index, name in enumerate(self.section_names):
+            for start, end in section_ranges.get(name, ()):
+                offsets.extend((index, start, end))
+        self._section_offsets = offsets
+
+class ParsedJob(ParsedDocument):
+    """A parsed job description: the text once, requirement lists as tuples, keywords and skills as IDs"""
+
+    KEYS = ("job_title", "must_have_skills", "good_to_have_skills", "qualifications", "experience",
+            "keywords", "skills", "skill_ids", "text", "tokens")
+
+    __slots__ = ("job_title", "_must_have_skills", "_good_to_have_skills", "_qualifications", "experience")
+
+    def __init__(self, text: str, tokens: TokenizedText, job_title: str, must_have_skills: Sequence[str],
+                 good_to_have_skills: Sequence[str], qualifications: Sequence[str], experience: str,
+                 keywords: Iterable[str], skills: Sequence[str], skill_ids: Sequence[int]):
+        super().__init__(text)
+        self._tokens = tokens
+        self._set_keywords(keywords)
+        self._set_skills(skills, skill_ids)
+        self.job_title = job_title
+        self._must_have_skills = tuple(must_have_skills)
+        self._good_to_have_skills = tuple(good_to_have_skills)
+        self._qualifications = tuple(qualifications)
+        self.experience = experience
+
+    @property
+    def must_have_skills(self) -> List[str]:
+        return list(self._must_have_skills)
+
+    @property
+    def good_to_have_skills(self) -> List[str]:
+        return list(self._good_to_have_skills)
+
+    @property
+    def qualifications(self) -> List[str]:
+        return list(self._qualifications)
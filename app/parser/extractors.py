@@ -0,0 +1,85 @@
+from typing import BinaryIO, List, Optional
+import io
+import re
+import threading
+import unicodedata
+import xml.etree.ElementTree as ET
+import zipfile
+
+import pypdfium2 as pdfium
+
+# pdfium keeps global state and is not thread-safe; it is fast enough to serialize
+_PDFIUM_LOCK = threading.Lock()
+
+# WordprocessingML tags, in ElementTree's {namespace}name form
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PARAGRAPH = _W + 'p'
+_TEXT = _W + 't'
+_TAB = _W + 'tab'
+_BREAKS = (_W + 'br', _W + 'cr')
+
+def extract_pdf_pdfium(data: bytes, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    """Raw text layer of a PDF via pdfium, without pdfplumber's layout analysis"""
+    texts = []
+    extracted = 0
+    with _PDFIUM_LOCK:
+        document = pdfium.PdfDocument(data)
+        try:
+            page_count = len(document)
+            if max_pages:
+                page_count = min(page_count, max_pages)
+            for index in range(page_count):
+                page = document[index]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                # pdfium ends lines with \r\n and marks soft hyphens with control characters
+                text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\ufffe', '').replace('\x02', '')
+                texts.append(text)
+                extracted += len(text)
+                if max_chars and extracted >= max_chars:
+                    break
+        finally:
+            document.close()
+    return "".join(texts)
+
+def extract_docx_xml(data: bytes) -> str:
+    """Text of a DOCX's headers, body and footers, streamed from the XML parts (same output as docx2txt)"""
+    pieces = []
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        names = package.namelist()
+        headers = [name for name in names if re.match('word/header[0-9]*.xml', name)]
+        footers = [name for name in names if re.match('word/footer[0-9]*.xml', name)]
+        for name in headers + ['word/document.xml'] + footers:
+            with package.open(name) as part:
+                _append_wordml_text(part, pieces)
+    return "".join(pieces).strip()
+
+def _append_wordml_text(part: BinaryIO, pieces: List[str]):
+    """Append the text of one WordprocessingML part without building its whole tree"""
+    for event, element in ET.iterparse(part, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            # Paragraph breaks come before the paragraph's text, as in docx2txt
+            if tag == _PARAGRAPH:
+                pieces.append('\n\n')
+            elif tag == _TAB:
+                pieces.append('\t')
+            elif tag in _BREAKS:
+                pieces.append('\n')
+        elif tag == _TEXT:
+            # Text is only complete at the end tag; w:t has no child elements, so order is kept
+            pieces.append(element.text or '')
+        elif tag == _PARAGRAPH:
+            element.clear()
+
+def is_usable_text(text: str) -> bool:
+    """Whether extracted text looks like real text rather than nothing or undecodable glyphs"""
+    visible = [char for char in text if not char.isspace()]
+    if not visible:
+        return False
+    # Unmapped glyphs come out as replacement, private-use or control characters
+    garbled = sum(1 for char in visible if char == '\ufffd' or unicodedata.category(char) in ('Cc', 'Co', 'Cn'))
+    letters = sum(1 for char in visible if char.isalpha())
+    return garbled <= 0.05 * len(visible) and letters >= 0.3 * len(visible)
@@ -1,41 +1,85 @@
 import re
-from typing import Dict, List
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+from .documents import ParsedJob
+try:
+    from app.utils.skill_lexicon import SkillLexicon, get_skill_lexicon
+    from app.utils.tokenizer import TokenizedText, tokenize
+except ImportError:
+    from utils.skill_lexicon import SkillLexicon, get_skill_lexicon
+    from utils.tokenizer import TokenizedText, tokenize
+
+# Sentences within a line end at . ! ? followed by whitespace (not "2.6" or "Node.js")
+SENTENCE_SPLIT = re.compile(r'(?<!\d)[.!?](?=\s|$)')
+BULLET_CHARS = ' \t-*\u2022\u00b7\u2013\u2014>'
+TOKEN_PATTERN = re.compile(r'[a-z]+', re.IGNORECASE)
+ITEM_SPLIT = re.compile(r'[,;&()\[\]]|\b(?:and|or)\b', re.IGNORECASE)
+QUALIFICATION_SPLIT = re.compile(r'[,;]')
+# (?<!\d) keeps a long run of digits from being retried at every position
+YEARS_PATTERN = re.compile(r'(?<!\d)\d+\+?\s*(?:years?|yrs?)\b', re.IGNORECASE)
+
+# Words after a trigger that may complete its cue ("must ... have", "experience ... with")
+CUE_WINDOW = 4
+
+# Cue words, following the phrases the original regular expressions looked for
+MUST_HAVE_CUES = frozenset({"requirements", "mandatory"})
+MUST_HAVE_PAIRS = {
+    **dict.fromkeys(["must", "should", "required", "necessary", "essential"],
+                    frozenset({"have", "possess", "know", "understand"})),
+    **dict.fromkeys(["experience", "proficiency", "expertise"], frozenset({"in", "with", "of"})),
+    "skills": frozenset({"required"})
+}
+GOOD_TO_HAVE_CUES = frozenset({"preferred", "bonus", "optional", "desirable", "advantage", "advantageous", "plus"})
+GOOD_TO_HAVE_PAIRS = {
+    **dict.fromkeys(["nice", "good", "prefer"], frozenset({"have", "if"}))
+}
+QUALIFICATION_CUES = frozenset({"degree", "bachelor", "bachelors", "master", "masters", "phd",
+                                "qualification", "qualifications", "education", "educational", "academic"})
+
+# Headers whose bullets are requirements even without cue words of their own
+SKILL_HEADERS = frozenset({"skills", "requirements", "required", "mandatory", "must"})
+QUALIFICATION_HEADERS = frozenset({"eligibility", "qualification", "qualifications", "education"})
+
+# "5+ years of experience with Python" -> "Python"
+LEAD_IN_WORDS = frozenset({"experience", "proficiency", "expertise", "knowledge", "familiarity", "understanding",
+                           "skills", "training", "proficient", "skilled", "familiar", "must", "should"})
+LEAD_IN_CUES = MUST_HAVE_CUES | GOOD_TO_HAVE_CUES
+LEAD_IN_CONNECTORS = frozenset({"in", "with", "of", "on", "have", "possess", "know", "understand"})
+
+# Items made only of these words carry no requirement ("advantageous", "is a plus")
+NOISE_WORDS = (MUST_HAVE_CUES | GOOD_TO_HAVE_CUES | frozenset(MUST_HAVE_PAIRS) | frozenset(GOOD_TO_HAVE_PAIRS)
+               | frozenset({"a", "an", "the", "is", "are", "would", "will", "to", "of", "in", "on", "as", "at",
+                            "have", "required", "considered", "highly", "big", "etc"}))
+# Not a noise word on its own: BE is also a degree
+TRAILING_WORDS = NOISE_WORDS | frozenset({"be"})
 
 class JdParser:
     """Parse job descriptions to extract key requirements"""
     
-    def __init__(self):
-        pass
+    def __init__(self, lexicon: SkillLexicon = None):
+        self.lexicon = lexicon or get_skill_lexicon()
     
-    def parse(self, text: str) -> Dict[str, any]:
+    def parse(self, text: str) -> ParsedJob:
         """Parse job description text and extract key components"""
         # Extract job title
         job_title = self._extract_job_title(text)
         
-        # Extract must-have skills
-        must_have_skills = self._extract_must_have_skills(text)
-        
-        # Extract good-to-have skills
-        good_to_have_skills = self._extract_good_to_have_skills(text)
-        
-        # Extract qualifications
-        qualifications = self._extract_qualifications(text)
+        # Extract must-have and good-to-have skills and qualifications in one pass
+        requirements = self._extract_requirements(text)
         
         # Extract experience requirements
         experience = self._extract_experience(text)
         
-        # Extract keywords
-        keywords = self._extract_keywords(text)
+        # Canonical skills from the lexicon, including multi-word and symbol names like "C++"
+        skill_ids = self.lexicon.skill_ids(text)
+        skills = [self.lexicon.names[skill_id] for skill_id in skill_ids]
         
-        return {
-            "job_title": job_title,
-            "must_have_skills": must_have_skills,
-            "good_to_have_skills": good_to_have_skills,
-            "qualifications": qualifications,
-            "experience": experience,
-            "keywords": keywords,
-            "text": text
-        }
+        # Extract keywords from tokens shared with the semantic matcher
+        tokens = tokenize(text)
+        keywords = self._extract_keywords(tokens)
+        
+        return ParsedJob(text, tokens, job_title, requirements["must_have_skills"],
+                         requirements["good_to_have_skills"], requirements["qualifications"],
+                         experience, keywords, skills, skill_ids)
     
     def _extract_job_title(self, text: str) -> str:
         """Extract job title from text"""
@@ -50,7 +94,7 @@ class JdParser:
             if match:
                 title = match.group(1).strip()
                 # Clean up the title
-                title = re.sub(r'^[^\w]*|[^\w]*$', '', title)  # Remove leading/trailing non-word chars
+                title = self._trim_item(title)  # Remove leading/trailing non-word chars
                 if len(title) > 2 and len(title) < 100:
                     return title
         
@@ -68,107 +112,173 @@ class JdParser:
     
     def _extract_must_have_skills(self, text: str) -> List[str]:
         """Extract must-have skills from job description"""
-        skills = []
-        
-        # Common patterns for required skills
-        patterns = [
-            r"(?:must|should|required|necessary|essential).*?(?:have|possess|know|understand).*?:?\s*([^.]+)",
-            r"(?:requirements|skills required|mandatory).*?:?\s*([^.]+)",
-            r"(?:experience|proficiency|expertise).*?(?:in|with|of).*?:?\s*([^.]+)"
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Split by common separators
-                items = re.split(r'[,;]', match)
-                for item in items:
-                    item = item.strip()
-                    if item and len(item) > 2:
-                        # Clean up the item
-                        item = re.sub(r'^[^\w]*|[^\w]*$', '', item)  # Remove leading/trailing non-word chars
-                        if item and len(item) > 2:
-                            skills.append(item)
-        
-        return list(set(skills))  # Remove duplicates
+        return self._extract_requirements(text)["must_have_skills"]
     
     def _extract_good_to_have_skills(self, text: str) -> List[str]:
         """Extract good-to-have skills from job description"""
-        skills = []
-        
-        # Common patterns for preferred skills
-        patterns = [
-            r"(?:nice|good|prefer|advantage).*?(?:to have|if).*?:?\s*([^.]+)",
-            r"(?:preferred|bonus|extra|nice to have).*?:?\s*([^.]+)",
-            r"(?:optional|desirable).*?:?\s*([^.]+)"
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Split by common separators
-                items = re.split(r'[,;]', match)
-                for item in items:
-                    item = item.strip()
-                    if item and len(item) > 2:
-                        # Clean up the item
-                        item = re.sub(r'^[^\w]*|[^\w]*$', '', item)  # Remove leading/trailing non-word chars
-                        if item and len(item) > 2:
-                            skills.append(item)
-        
-        return list(set(skills))  # Remove duplicates
+        return self._extract_requirements(text)["good_to_have_skills"]
     
     def _extract_qualifications(self, text: str) -> List[str]:
         """Extract educational qualifications from job description"""
-        qualifications = []
+        return self._extract_requirements(text)["qualifications"]
+    
+    def _extract_requirements(self, text: str) -> Dict[str, List[str]]:
+        """Split the JD into sentences/bullets once and classify each by its cue words"""
+        # Linear in len(text): one split, then work proportional to each segment's length.
+        # No pattern used here has nested or overlapping quantifiers, so none can backtrack.
+        requirements = {"must_have_skills": {}, "good_to_have_skills": {}, "qualifications": {}}
+        # Category inherited by bullets under a header such as "Requirements:" or "NICE TO HAVE"
+        context = None
+        context_used = False
         
-        # Common patterns for qualifications
-        patterns = [
-            r"(?:degree|bachelor|master|phd|qualification).*?:?\s*([^.]+)",
-            r"(?:education|educational).*?:?\s*([^.]+)",
-            r"(?:academic).*?:?\s*([^.]+)"
-        ]
+        for segment in self._iter_segments(text):
+            if segment is None:
+                # A blank line after a header's list ends that list
+                if context_used:
+                    context, context_used = None, False
+                continue
+            
+            tokens = [(m.group(0).lower(), m.end()) for m in TOKEN_PATTERN.finditer(segment)]
+            words = [word for word, _ in tokens]
+            category, content_start = self._classify_segment(segment, tokens)
+            header_category = category or self._header_category(words)
+            # Upper-case headers ("NICE TO HAVE") need a cue; "AWS" or "SQL" alone is a bullet
+            is_header = segment.endswith(':') or (segment.isupper() and len(words) <= 6 and header_category)
+            if is_header:
+                # A header's own cue (or lack of one) decides what the lines below it are
+                context, context_used = header_category, False
+                continue
+            
+            if context is not None:
+                context_used = True
+                # Bullets follow their header unless their own cue is more specific;
+                # "Key: value" lines without a cue are fields of their own, not list items
+                if category == "must_have_skills" or (category is None and ':' not in segment):
+                    category = context
+                    content_start = self._strip_lead_in(tokens)
+            if category is None:
+                continue
+            
+            for item in self._split_items(segment[content_start:], category):
+                requirements[category].setdefault(item, None)
+        
+        return {category: list(items) for category, items in requirements.items()}
+    
+    def _iter_segments(self, text: str) -> Iterator[Optional[str]]:
+        """Sentences and bullets without their bullet markers, with None for each blank line"""
+        for line in text.split('\n'):
+            if not line.strip():
+                yield None
+                continue
+            for segment in SENTENCE_SPLIT.split(line):
+                segment = segment.strip().lstrip(BULLET_CHARS).strip()
+                if segment:
+                    yield segment
+    
+    def _classify_segment(self, segment: str, tokens: List[Tuple[str, int]]) -> Tuple[Optional[str], int]:
+        """Category of a segment from its own cue words, and where its requirement text starts"""
+        words = [word for word, _ in tokens]
+        word_set = set(words)
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Split by common separators
-                items = re.split(r'[,;]', match)
-                for item in items:
-                    item = item.strip()
-                    if item and len(item) > 2:
-                        # Clean up the item
-                        item = re.sub(r'^[^\w]*|[^\w]*$', '', item)  # Remove leading/trailing non-word chars
-                        if item and len(item) > 2:
-                            qualifications.append(item)
+        if word_set & QUALIFICATION_CUES:
+            category = "qualifications"
+        elif word_set & GOOD_TO_HAVE_CUES or self._has_cue_pair(words, GOOD_TO_HAVE_PAIRS):
+            category = "good_to_have_skills"
+        elif word_set & MUST_HAVE_CUES or self._has_cue_pair(words, MUST_HAVE_PAIRS):
+            category = "must_have_skills"
+        else:
+            return None, 0
         
-        return list(set(qualifications))  # Remove duplicates
+        # "Key: value" lines list their requirements after the colon
+        colon = segment.find(':')
+        if colon >= 0 and segment[colon + 1:].strip():
+            return category, colon + 1
+        return category, self._strip_lead_in(tokens)
+    
+    def _has_cue_pair(self, words: List[str], pairs: Dict[str, FrozenSet[str]]) -> bool:
+        """Whether a trigger word is followed (within a few words) by one of its connectors"""
+        for i, word in enumerate(words):
+            connectors = pairs.get(word)
+            if connectors and connectors.intersection(words[i + 1:i + 1 + CUE_WINDOW]):
+                return True
+        return False
+    
+    def _header_category(self, words: List[str]) -> Optional[str]:
+        """Category implied by a section header such as Skills or Eligibility Criteria"""
+        word_set = set(words)
+        if word_set & QUALIFICATION_HEADERS:
+            return "qualifications"
+        if word_set & SKILL_HEADERS:
+            return "must_have_skills"
+        return None
+    
+    def _strip_lead_in(self, tokens: List[Tuple[str, int]]) -> int:
+        """Offset after a lead-in such as "must have experience with" or "Knowledge of", else 0"""
+        offset = 0
+        start = next((i for i, (word, _) in enumerate(tokens) if word in LEAD_IN_WORDS), None)
+        while start is not None:
+            connector = next((j for j in range(start + 1, min(start + 1 + CUE_WINDOW, len(tokens)))
+                              if tokens[j][0] in LEAD_IN_CONNECTORS), None)
+            if connector is None:
+                if not offset and tokens[start][0] in LEAD_IN_CUES:
+                    offset = tokens[start][1]
+                break
+            offset = tokens[connector][1]
+            # Lead-ins chain ("must have strong experience in"); each step moves past a connector
+            start = next((j for j in range(connector + 1, min(connector + 1 + CUE_WINDOW, len(tokens)))
+                          if tokens[j][0] in LEAD_IN_WORDS), None)
+        return offset
+    
+    def _split_items(self, text: str, category: str) -> List[str]:
+        """Split requirement text into individual items"""
+        # "Bachelor's degree in Computer Science or related field" is one qualification
+        splitter = QUALIFICATION_SPLIT if category == "qualifications" else ITEM_SPLIT
+        items = []
+        for item in splitter.split(text):
+            if category != "qualifications":
+                # Drop trailing cue clauses such as "is a plus" or "would be preferred"
+                words = item.split()
+                while words and words[-1].lower().strip('.,:;!?()') in TRAILING_WORDS:
+                    words.pop()
+                item = " ".join(words)
+            item = self._trim_item(item)
+            # Two characters is enough for skills like Go, C# or ML
+            if len(item) > 1 and not set(TOKEN_PATTERN.findall(item.lower())) <= NOISE_WORDS:
+                items.append(item)
+        return items
+    
+    def _trim_item(self, item: str) -> str:
+        """Remove leading/trailing punctuation, keeping the + and # of names like C++ and C#"""
+        start, end = 0, len(item)
+        while start < end and not (item[start].isalnum() or item[start] == '_'):
+            start += 1
+        while end > start and not (item[end - 1].isalnum() or item[end - 1] in '_+#'):
+            end -= 1
+        return item[start:end]
     
     def _extract_experience(self, text: str) -> str:
         """Extract experience requirements"""
-        # Look for experience patterns
-        patterns = [
-            r"(\d+\+?\s*(?:years?|yrs?)\s*(?:experience|exp))",
-            r"(?:experience.*?:?\s*(\d+\+?\s*(?:years?|yrs?)))",
-            r"(\d+\+?\s*(?:years?|yrs?)\s*(?:of|in)\s*[a-z\s]+)"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        # Prefer a duration stated next to "experience", then any "N years of/in ..."
+        fallback = None
+        for segment in self._iter_segments(text):
+            match = YEARS_PATTERN.search(segment) if segment else None
+            if not match:
+                continue
+            if 'experience' in segment.lower() or ' exp' in segment.lower():
+                return match.group(0).strip()
+            if fallback is None and segment[match.end():].lstrip().lower().startswith(('of ', 'in ')):
+                fallback = match.group(0).strip()
         
-        return "Not specified"
+        return fallback or "Not specified"
     
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from job description"""
+    def _extract_keywords(self, tokens: TokenizedText) -> List[str]:
+        """Extract keywords from the tokenized job description"""
         # This is a simplified implementation
-        words = re.findall(r'\b[A-Za-z]{3,}\b', text.lower())
+        words = tokens.words(3)
         # Remove common stop words
         stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 
                       'job', 'description', 'position', 'role', 'responsibilities', 'requirements', 'required', 'must', 'should',
                       'we', 'are', 'looking', 'for', 'a', 'an', 'this', 'that', 'these', 'those', 'have', 'has', 'had', 'do',
                       'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can'}
-        keywords = [word for word in words if word not in stop_words]
-        # Return unique keywords
-        return list(set(keywords))
\ No newline at end of file
+        # Tokens are already distinct, in order of first occurrence
+        return [word for word in words if word not in stop_words]
\ No newline at end of file
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class ParseCache:
+    """Cache parsed resumes by content hash: an in-memory LRU in front of a size-bounded SQLite store"""
+
+    def __init__(self, db_path: str = None, max_memory_bytes: int = 32 * 1024 * 1024,
+                 max_disk_bytes: int = 256 * 1024 * 1024):
+        if db_path is None:
+            # Share the evaluations database file
+            self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'evaluations.db')
+        else:
+            self.db_path = db_path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        # key -> serialized parse result, least recently used first
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self.init_database()
+
+    def init_database(self):
+        """Initialize the parse cache table"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                cache_key TEXT PRIMARY KEY,
+                parsed TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_parse_cache_access ON parse_cache(last_access)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(data: bytes, file_format: str, parser_version: str) -> str:
+        """Cache key for file contents, so a parser change or a different format never reuses an entry"""
+        return f"{parser_version}:{file_format}:{hashlib.sha256(data).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a fresh copy of the cached parse result, or None"""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.stats["hits"] += 1
+                self.stats["memory_hits"] += 1
+                return json.loads(payload)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('SELECT parsed FROM parse_cache WHERE cache_key = ?', (key,))
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.execute('UPDATE parse_cache SET last_access = ? WHERE cache_key = ?', (time.time(), key))
+            conn.commit()
+        conn.close()
+
+        with self._lock:
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self.stats["disk_hits"] += 1
+            self._remember(key, row[0])
+        return json.loads(row[0])
+
+    def put(self, key: str, parsed: Dict):
+        """Store a parse result in memory and on disk, evicting least recently used entries"""
+        payload = json.dumps(parsed)
+        with self._lock:
+            self._remember(key, payload)
+            self.stats["stores"] += 1
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO parse_cache (cache_key, parsed, size, last_access)
+            VALUES (?, ?, ?, ?)
+        ''', (key, payload, len(payload), time.time()))
+
+        # Drop least recently used rows until the store is back under its size bound
+        cursor.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache')
+        excess = cursor.fetchone()[0] - self.max_disk_bytes
+        evicted = 0
+        if excess > 0:
+            cursor.execute('SELECT cache_key, size FROM parse_cache ORDER BY last_access')
+            doomed = []
+            for cache_key, size in cursor.fetchall():
+                if excess <= 0:
+                    break
+                doomed.append((cache_key,))
+                excess -= size
+            cursor.executemany('DELETE FROM parse_cache WHERE cache_key = ?', doomed)
+            evicted = len(doomed)
+
+        conn.commit()
+        conn.close()
+
+        if evicted:
+            with self._lock:
+                self.stats["evictions"] += evicted
+
+    def clear(self):
+        """Remove every cached parse result"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('DELETE FROM parse_cache')
+        conn.commit()
+        conn.close()
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters for this process plus current cache sizes"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache')
+        disk_entries, disk_bytes = cursor.fetchone()
+        conn.close()
+
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats.update({
+                "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": disk_entries,
+                "disk_bytes": disk_bytes
+            })
+        return stats
+
+    def _remember(self, key: str, payload: str):
+        """Insert into the memory LRU (lock held), evicting the oldest entries past the size bound"""
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        if len(payload) > self.max_memory_bytes:
+            return
+        self._memory[key] = payload
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["evictions"] += 1
@@ -1,28 +1,169 @@
 import pdfplumber
 import docx2txt
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import io
+import os
 import re
-from typing import Dict, List
+import threading
+from typing import BinaryIO, Dict, List, NamedTuple, Union
+from .extractors import extract_docx_xml, extract_pdf_pdfium, is_usable_text
+from .parse_cache import ParseCache
+from .documents import ParsedResume
+from .sections import SectionSegmenter, SectionSpan
+try:
+    from app.utils.skill_lexicon import SkillLexicon, get_skill_lexicon
+    from app.utils.tokenizer import TokenizedText
+except ImportError:
+    from utils.skill_lexicon import SkillLexicon, get_skill_lexicon
+    from utils.tokenizer import TokenizedText
+
+class ResumeUpload(NamedTuple):
+    """An uploaded resume held in memory instead of on disk"""
+    filename: str
+    data: bytes
+
+def resume_source_name(source: Union[str, ResumeUpload]) -> str:
+    """Display filename of a resume given as a path or an upload"""
+    if isinstance(source, str):
+        return os.path.basename(source)
+    return source.filename
+
+def _extract_pdf_pages(data: bytes, page_numbers: List[int]) -> List[str]:
+    """Extract the text of some pages inside a worker process"""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [pdf.pages[number].extract_text() or "" for number in page_numbers]
 
 class ResumeParser:
     """Parse resumes from PDF and DOCX formats"""
     
-    def __init__(self):
-        pass
+    # Bump whenever extraction changes so cached parse results are not reused
+    PARSER_VERSION = "5"
     
-    def parse_pdf(self, file_path: str) -> str:
-        """Extract text from PDF resume"""
-        text = ""
+    # Page-parallel extraction only pays for sending the PDF to the workers on long documents
+    PARALLEL_MIN_PAGES = 8
+    PAGES_PER_TASK = 4
+    
+    # Text extraction backends per format, in "auto" order: fast raw text first, then the thorough path
+    EXTRACTION_BACKENDS = {
+        "pdf": {"pdfium": "_extract_pdf_pdfium", "pdfplumber": "_extract_pdf_pdfplumber"},
+        "docx": {"xml": "_extract_docx_xml", "docx2txt": "_extract_docx_docx2txt"},
+    }
+    
+    # Header phrases that start each resume section
+    SECTION_HEADERS = {
+        "contact": ["contact", "contact information", "contact details", "address", "phone", "email", "linkedin"],
+        "summary": ["summary", "professional summary", "career summary", "objective", "career objective",
+                    "profile", "professional profile"],
+        "experience": ["experience", "work experience", "professional experience", "relevant experience",
+                       "work history", "employment", "employment history", "internships"],
+        "education": ["education", "academic", "academics", "academic background", "educational qualifications"],
+        "skills": ["skills", "technical skills", "key skills", "core skills", "expertise", "technical expertise",
+                   "core competencies"],
+        "projects": ["projects", "project", "personal projects", "academic projects", "key projects"],
+        "certifications": ["certifications", "certification", "certificates", "licenses and certifications"]
+    }
+    SECTION_NAMES = tuple(SECTION_HEADERS)
+    
+    def __init__(self, cache: ParseCache = None, max_chars: int = None, max_pages: int = None,
+                 page_workers: int = None, pdf_backend: str = None, docx_backend: str = None,
+                 lexicon: SkillLexicon = None):
+        self.cache = cache
+        self.segmenter = SectionSegmenter(self.SECTION_HEADERS)
+        self.lexicon = lexicon or get_skill_lexicon()
+        # PDF extraction budgets; None reads the whole document, which relevance scoring expects
+        self.max_chars = max_chars or int(os.getenv('PDF_MAX_CHARS', 0)) or None
+        self.max_pages = max_pages or int(os.getenv('PDF_MAX_PAGES', 0)) or None
+        # Pages are split across processes only by pdfplumber; pdfium (tried first in auto mode) reads them serially
+        self.page_workers = page_workers or int(os.getenv('PDF_PAGE_WORKERS', 1))
+        # Page worker pool, created on the first long PDF and reused for every later one
+        self._page_pool = None
+        self._page_pool_lock = threading.Lock()
+        
+        # "auto" tries each backend in order until one returns usable text
+        self.backends = {
+            "pdf": pdf_backend or os.getenv('PDF_BACKEND', 'auto'),
+            "docx": docx_backend or os.getenv('DOCX_BACKEND', 'auto'),
+        }
+        for file_format, backend in self.backends.items():
+            if backend != "auto" and backend not in self.EXTRACTION_BACKENDS[file_format]:
+                raise ValueError(f"Unknown {file_format} backend '{backend}'. "
+                                 f"Use auto or one of: {', '.join(self.EXTRACTION_BACKENDS[file_format])}")
+    
+    def parse_pdf(self, file_path: Union[str, BinaryIO]) -> str:
+        """Extract text from PDF resume (path or binary file-like object), stopping at the page/character budget"""
+        texts = []
         try:
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
+                page_count = len(pdf.pages)
+                if self.max_pages:
+                    page_count = min(page_count, self.max_pages)
+                parallel = self.page_workers > 1 and page_count >= self.PARALLEL_MIN_PAGES
+                if not parallel:
+                    for page in pdf.pages[:page_count]:
+                        texts.append(page.extract_text() or "")
+                        if self._budget_reached(texts):
+                            break
+            if parallel:
+                self._extract_pages_parallel(self._read_bytes(file_path), page_count, texts)
         except Exception as e:
             print(f"Error parsing PDF: {e}")
         
-        return text
+        text = "".join(texts)
+        return text[:self.max_chars] if self.max_chars else text
+    
+    def _extract_pages_parallel(self, data: bytes, page_count: int, texts: List[str]):
+        """Extract pages on worker processes, appending in page order until the budget is reached"""
+        tasks = [list(range(start, min(start + self.PAGES_PER_TASK, page_count)))
+                 for start in range(0, page_count, self.PAGES_PER_TASK)]
+        executor = self._get_page_pool()
+        futures = []
+        try:
+            futures = [executor.submit(_extract_pdf_pages, data, pages) for pages in tasks]
+            for future in futures:
+                for text in future.result():
+                    texts.append(text)
+                    if self._budget_reached(texts):
+                        return
+        except BrokenProcessPool:
+            # A dead worker breaks the pool; the next long PDF gets a new one
+            self._discard_page_pool(executor)
+            raise
+        finally:
+            # Pages past the budget are never extracted; the pool stays up for the next PDF
+            for future in futures:
+                future.cancel()
+    
+    def _get_page_pool(self) -> ProcessPoolExecutor:
+        """Return the shared page worker pool, creating it on first use"""
+        with self._page_pool_lock:
+            if self._page_pool is None:
+                self._page_pool = ProcessPoolExecutor(max_workers=self.page_workers)
+            return self._page_pool
+    
+    def _discard_page_pool(self, executor: ProcessPoolExecutor):
+        """Drop a broken page worker pool unless another thread already replaced it"""
+        with self._page_pool_lock:
+            if self._page_pool is executor:
+                self._page_pool = None
+        executor.shutdown(wait=False, cancel_futures=True)
     
-    def parse_docx(self, file_path: str) -> str:
-        """Extract text from DOCX resume"""
+    def _budget_reached(self, texts: List[str]) -> bool:
+        """Whether the extracted pages already cover the character budget"""
+        return bool(self.max_chars) and sum(len(text) for text in texts) >= self.max_chars
+    
+    def _read_bytes(self, source: Union[str, BinaryIO]) -> bytes:
+        """Raw contents of a path or binary file-like object"""
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return f.read()
+        if hasattr(source, 'getvalue'):
+            return source.getvalue()
+        source.seek(0)
+        return source.read()
+    
+    def parse_docx(self, file_path: Union[str, BinaryIO]) -> str:
+        """Extract text from DOCX resume (path or binary file-like object)"""
         try:
             text = docx2txt.process(file_path)
             return text
@@ -34,8 +175,9 @@ class ResumeParser:
         """Extract email address from resume text"""
         # Regular expression for email matching
         email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        return emails[0] if emails else ""
+        # Only the first address is used, so stop scanning there
+        match = re.search(email_pattern, text)
+        return match.group(0) if match else ""
     
     def extract_phone(self, text: str) -> str:
         """Extract phone number from resume text"""
@@ -46,15 +188,15 @@ class ResumeParser:
         ]
         
         for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                return phones[0]
+            match = re.search(pattern, text)
+            if match:
+                return match.group(0)
         return ""
     
     def extract_job_title(self, text: str) -> str:
         """Extract potential job title from resume"""
-        # Look for common job title patterns
-        lines = text.split('\n')
+        # Look for common job title patterns (only the first lines are needed)
+        lines = text.split('\n', 5)
         
         # Check first few lines for potential job titles
         for i, line in enumerate(lines[:5]):
@@ -87,102 +229,120 @@ class ResumeParser:
         
         return "General Applicant"
     
+    def segment_sections(self, text: str) -> List[SectionSpan]:
+        """Find resume sections as offsets into the text, in one pass over it"""
+        return self.segmenter.segment(text)
+    
     def extract_sections(self, text: str) -> Dict[str, str]:
-        """Extract common resume sections"""
-        sections = {
-            "contact": "",
-            "summary": "",
-            "experience": "",
-            "education": "",
-            "skills": "",
-            "projects": "",
-            "certifications": ""
-        }
-        
-        # Normalize text by removing extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        # Define section headers patterns
-        patterns = {
-            "contact": r"(contact|address|phone|email|linkedin)[:\n\s]*.*?(?=\n\n|\Z)",
-            "summary": r"(summary|objective|profile)[:\n\s]*.*?(?=\n\n|\Z)",
-            "experience": r"(experience|work history|employment)[:\n\s]*.*?(?=\n\n|\Z)",
-            "education": r"(education|academic)[:\n\s]*.*?(?=\n\n|\Z)",
-            "skills": r"(skills|technical skills|expertise)[:\n\s]*.*?(?=\n\n|\Z)",
-            "projects": r"(projects|personal projects)[:\n\s]*.*?(?=\n\n|\Z)",
-            "certifications": r"(certifications|certificates)[:\n\s]*.*?(?=\n\n|\Z)"
-        }
-        
-        # Extract sections using patterns
-        for section, pattern in patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                sections[section] = match.group(0)
-        
-        return sections
+        """Extract common resume sections (whitespace and line breaks are kept)"""
+        return self.segmenter.materialize(text, self.segment_sections(text))
     
-    def parse_from_text(self, text: str) -> Dict[str, any]:
-        """Parse resume from text content"""
-        # Extract sections
-        sections = self.extract_sections(text)
-        
-        # Extract contact information
-        email = self.extract_email(text)
-        phone = self.extract_phone(text)
-        
-        # Extract potential job title
-        job_title = self.extract_job_title(text)
-        
-        # Extract keywords and entities (simplified)
-        keywords = self._extract_keywords(text)
-        
-        return {
-            "text": text,
-            "sections": sections,
-            "keywords": keywords,
-            "email": email,
-            "phone": phone,
-            "job_title": job_title
-        }
+    def parse_from_text(self, text: str) -> ParsedResume:
+        """Parse resume from text content; each field is extracted on first access and memoized"""
+        # Sections, contact details, job title, skills and keywords are computed lazily by
+        # ParsedResume with the methods below, so callers only pay for what they read
+        return ParsedResume(text, self)
     
-    def parse(self, file_path: str) -> Dict[str, any]:
+    def parse(self, file_path: str) -> ParsedResume:
         """Main parsing function that determines file type and extracts content"""
-        if file_path.lower().endswith('.pdf'):
-            text = self.parse_pdf(file_path)
-        elif file_path.lower().endswith('.docx'):
-            text = self.parse_docx(file_path)
-        else:
-            raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
-        
-        # Extract sections
-        sections = self.extract_sections(text)
-        
-        # Extract contact information
-        email = self.extract_email(text)
-        phone = self.extract_phone(text)
-        
-        # Extract potential job title
-        job_title = self.extract_job_title(text)
+        file_format = self._file_format(file_path)
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            print(f"Error reading resume {file_path}: {e}")
+            return self.parse_from_text("")
+        return self._parse_data(data, file_format)
+    
+    def parse_bytes(self, data: Union[bytes, BinaryIO], kind: str) -> ParsedResume:
+        """Parse a resume held in memory; kind is 'pdf', 'docx' or the upload's filename"""
+        if not isinstance(data, (bytes, bytearray)):
+            data = data.read()
+        return self._parse_data(bytes(data), self._file_format(kind))
+    
+    def parse_source(self, source: Union[str, ResumeUpload]) -> ParsedResume:
+        """Parse a resume given as a file path or an in-memory upload"""
+        if isinstance(source, str):
+            return self.parse(source)
+        return self.parse_bytes(source.data, source.filename)
+    
+    def _parse_data(self, data: bytes, file_format: str) -> ParsedResume:
+        """Extract and analyse resume text from file contents, using the parse cache when set"""
+        # Identical bytes parse identically, so look the content up before extracting text
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ParseCache.make_key(data, file_format, self._cache_version())
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                # Tokens are not cached (see below); rebuilding them is cheap next to text extraction
+                return ParsedResume.from_state(cached, self)
         
-        # Extract keywords and entities (simplified)
-        keywords = self._extract_keywords(text)
+        text = self._extract_text(data, file_format)
+        parsed = self.parse_from_text(text)
         
-        return {
-            "text": text,
-            "sections": sections,
-            "keywords": keywords,
-            "email": email,
-            "phone": phone,
-            "job_title": job_title
-        }
+        # Empty text usually means extraction failed; do not pin that result
+        if cache_key is not None and text.strip():
+            # The compact state of every field is stored; tokens are rebuilt on a cache hit
+            self.cache.put(cache_key, parsed.to_state())
+        return parsed
+    
+    def _extract_text(self, data: bytes, file_format: str) -> str:
+        """Extract text with the configured backend, falling back when a fast path returns nothing usable"""
+        backend = self.backends[file_format]
+        names = list(self.EXTRACTION_BACKENDS[file_format]) if backend == "auto" else [backend]
+        text = ""
+        for name in names:
+            try:
+                text = getattr(self, self.EXTRACTION_BACKENDS[file_format][name])(data)
+            except Exception as e:
+                print(f"Error extracting {file_format} text with {name}: {e}")
+                text = ""
+            if is_usable_text(text):
+                return text
+            if name != names[-1]:
+                print(f"{name} returned no usable text, falling back to {names[names.index(name) + 1]}")
+        return text
+    
+    def _extract_pdf_pdfium(self, data: bytes) -> str:
+        """Fast raw text layer via pdfium"""
+        text = extract_pdf_pdfium(data, self.max_pages, self.max_chars)
+        return text[:self.max_chars] if self.max_chars else text
+    
+    def _extract_pdf_pdfplumber(self, data: bytes) -> str:
+        """Layout-aware text via pdfplumber"""
+        return self.parse_pdf(io.BytesIO(data))
+    
+    def _extract_docx_xml(self, data: bytes) -> str:
+        """Streaming read of the DOCX XML parts"""
+        return extract_docx_xml(data)
+    
+    def _extract_docx_docx2txt(self, data: bytes) -> str:
+        """Text via docx2txt"""
+        return self.parse_docx(io.BytesIO(data))
+    
+    def _cache_version(self) -> str:
+        """Parser version, skill lexicon, backends and budgets, since each can change the parse result"""
+        version = (f"{self.PARSER_VERSION}:skills={self.lexicon.version}"
+                   f":pdf={self.backends['pdf']}:docx={self.backends['docx']}")
+        if self.max_chars or self.max_pages:
+            version += f":chars={self.max_chars}:pages={self.max_pages}"
+        return version
+    
+    def _file_format(self, kind: str) -> str:
+        """Normalise a format name or filename to 'pdf' or 'docx'"""
+        kind = kind.lower()
+        if kind == "pdf" or kind.endswith('.pdf'):
+            return "pdf"
+        elif kind == "docx" or kind.endswith('.docx'):
+            return "docx"
+        raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
     
-    def _extract_keywords(self, text: str) -> List[str]:
-        """Extract keywords from text (simplified implementation)"""
+    def _extract_keywords(self, tokens: TokenizedText) -> List[str]:
+        """Extract keywords from the tokenized text (simplified implementation)"""
         # This is a placeholder - in a real implementation, you'd use NLP techniques
         # like spaCy or NLTK for entity extraction
-        words = re.findall(r'\b[A-Za-z]{3,}\b', text.lower())
+        words = tokens.words(3)
         # Remove common stop words (simplified)
         stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'i', 'have', 'am', 'my', 'me', 'as', 'a', 'an', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'}
-        keywords = [word for word in words if word not in stop_words]
-        # Return unique keywords
-        return list(set(keywords))
\ No newline at end of file
+        # Tokens are already distinct, in order of first occurrence
+        return [word for word in words if word not in stop_words]
\ No newline at end of file
@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple
+import re
+
+class SectionSpan(NamedTuple):
+    """A section as offsets into the original text: header start, body start and end"""
+    name: str
+    start: int
+    body_start: int
+    end: int
+
+    def text(self, document: str) -> str:
+        """Section text including its header"""
+        return document[self.start:self.end]
+
+    def body(self, document: str) -> str:
+        """Section text after its header"""
+        return document[self.body_start:self.end]
+
+class SectionSegmenter:
+    """Split a document into sections at header lines, finding every header in one pass"""
+
+    def __init__(self, headers: Dict[str, Iterable[str]]):
+        self.section_names = list(headers)
+        # Normalised header phrase -> section name
+        self.phrases = {}
+        for name, phrases in headers.items():
+            for phrase in phrases:
+                self.phrases[" ".join(phrase.lower().split())] = name
+
+        # A header starts a line (or follows a sentence that text extraction ran into it) and
+        # is either alone on the line or followed by a colon. Longest phrases first.
+        alternatives = "|".join(
+            r'[ \t]+'.join(re.escape(word) for word in phrase.split())
+            for phrase in sorted(self.phrases, key=len, reverse=True)
+        )
+        self.pattern = re.compile(
+            r'(?:^[ \t]*|(?<=[.!?])[ \t]+)(?P<header>' + alternatives + r')[ \t]*(?::|$)',
+            re.IGNORECASE | re.MULTILINE
+        )
+
+    def segment(self, text: str) -> List[SectionSpan]:
+        """Sections in document order; each runs from its header to the next header"""
+        spans = []
+        for match in self.pattern.finditer(text):
+            name = self.phrases[" ".join(match.group("header").lower().split())]
+            # A repeated header (Email: ... Phone: ...) continues the open section
+            if spans and spans[-1].name == name:
+                continue
+            start = match.start("header")
+            if spans:
+                spans[-1] = spans[-1]._replace(end=start)
+            spans.append(SectionSpan(name, start, match.end(), len(text)))
+        return spans
+
+    def materialize(self, text: str, spans: List[SectionSpan]) -> Dict[str, str]:
+        """Section name -> text, joining sections whose header appears more than once"""
+        parts = defaultdict(list)
+        for span in spans:
+            parts[span.name].append(span.text(text).strip())
+        return {name: "\n\n".join(parts[name]) for name in self.section_names}
+
+    def ranges(self, text: str, spans: List[SectionSpan]) -> Dict[str, List[List[int]]]:
+        """Section name -> [start, end] offsets of the stripped parts materialize() joins, in the same order"""
+        ranges = defaultdict(list)
+        for span in spans:
+            part = span.text(text)
+            stripped = part.strip()
+            if stripped:
+                start = span.start + part.index(stripped)
+                ranges[span.name].append([start, start + len(stripped)])
+        return {name: ranges[name] for name in self.section_names}
@@ -0,0 +1,128 @@
+from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, List, Optional, Sequence, Union
+from datetime import datetime
+import argparse
+import copy
+import os
+import pickle
+import sqlite3
+import tempfile
+try:
+    from app.utils.tokenizer import NgramAnalyzer
+except ImportError:
+    from utils.tokenizer import NgramAnalyzer
+
+# Default locations, next to evaluations.db
+BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..')
+DEFAULT_MODEL_PATH = os.getenv('CORPUS_MODEL_PATH', os.path.join(BASE_DIR, 'tfidf_corpus.pkl'))
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, 'evaluations.db')
+
+class CorpusTfidfModel:
+    """TF-IDF model fitted offline on stored resumes and job descriptions, used transform-only at request time"""
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, vectorizer: TfidfVectorizer, metadata: Dict = None):
+        self.vectorizer = vectorizer
+        self.metadata = metadata or {}
+        # The fitted vocabulary and IDF weights with an analyzer over pre-tokenized terms
+        self.term_vectorizer = copy.copy(vectorizer)
+        self.term_vectorizer.analyzer = NgramAnalyzer.like(vectorizer)
+
+    @classmethod
+    def fit(cls, documents: List[str], max_features: int = 50000) -> "CorpusTfidfModel":
+        """Fit a new model on a corpus of documents"""
+        documents = [doc for doc in documents if doc and doc.strip()]
+        if not documents:
+            raise ValueError("Cannot fit a corpus model without documents")
+
+        vectorizer = TfidfVectorizer(
+            max_features=max_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            sublinear_tf=True
+        )
+        vectorizer.fit(documents)
+
+        metadata = {
+            "format_version": cls.FORMAT_VERSION,
+            "fitted_at": datetime.now().isoformat(),
+            "document_count": len(documents),
+            "vocabulary_size": len(vectorizer.vocabulary_)
+        }
+        return cls(vectorizer, metadata)
+
+    @classmethod
+    def fit_from_database(cls, db_path: str = None, max_features: int = 50000) -> "CorpusTfidfModel":
+        """Fit a model on the distinct resumes and job descriptions stored in the evaluations database"""
+        conn = sqlite3.connect(db_path or DEFAULT_DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT DISTINCT resume_text FROM evaluations WHERE resume_text IS NOT NULL AND resume_text != ''")
+        documents = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute("SELECT DISTINCT jd_text FROM evaluations WHERE jd_text IS NOT NULL AND jd_text != ''")
+        documents.extend(row[0] for row in cursor.fetchall())
+
+        conn.close()
+        return cls.fit(documents, max_features)
+
+    @classmethod
+    def load(cls, path: str = None) -> Optional["CorpusTfidfModel"]:
+        """Load a persisted model, returning None if there is none or it cannot be read"""
+        path = path or DEFAULT_MODEL_PATH
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except Exception as e:
+            print(f"Failed to load corpus TF-IDF model from {path}: {e}")
+            return None
+        if not isinstance(state, dict) or state.get("metadata", {}).get("format_version") != cls.FORMAT_VERSION:
+            print(f"Ignoring incompatible corpus TF-IDF model at {path}")
+            return None
+        model = cls(state["vectorizer"], state["metadata"])
+        print(f"Loaded corpus TF-IDF model ({model.metadata.get('vocabulary_size')} terms, "
+              f"{model.metadata.get('document_count')} documents)")
+        return model
+
+    def save(self, path: str = None) -> str:
+        """Persist the model, atomically replacing any existing file so readers never see a partial model"""
+        path = os.path.abspath(path or DEFAULT_MODEL_PATH)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(prefix='.tfidf_corpus.', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                # Plain dict so the file does not depend on how this module was imported
+                pickle.dump({"vectorizer": self.vectorizer, "metadata": self.metadata}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def transform(self, documents: List[Union[str, Sequence[str]]]):
+        """Vectorize texts or term lists with the fitted vocabulary and IDF weights (never refits)"""
+        return self.term_vectorizer.transform(documents)
+
+def main(argv: List[str] = None):
+    """Command line entry point to refit the corpus model and swap it in"""
+    parser = argparse.ArgumentParser(description="Fit the corpus TF-IDF model from stored evaluations")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Path to evaluations.db")
+    parser.add_argument('--output', default=DEFAULT_MODEL_PATH, help="Where to write the model")
+    parser.add_argument('--max-features', type=int, default=50000, help="Maximum vocabulary size")
+    args = parser.parse_args(argv)
+
+    print(f"Fitting corpus TF-IDF model from {args.db}...")
+    model = CorpusTfidfModel.fit_from_database(args.db, args.max_features)
+    path = model.save(args.output)
+    print(f"Saved corpus model to {path}: {model.metadata}")
+    print("Restart the server or POST /api/corpus-model/reload to start using it")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from typing import Any, Callable, Dict
+from .job_context import JobContext
+
+class EvaluationContext:
+    """Intermediate results of evaluating one resume against one job, computed once and shared"""
+
+    # Names of the artifacts the scorers and feedback generators record
+    SEMANTIC_SIMILARITY = "semantic_similarity"
+    RELEVANCE = "relevance"
+    IMPROVED_FEEDBACK = "improved_feedback"
+
+    def __init__(self, resume_data: Dict, jd_data):
+        self.resume_data = resume_data
+        self.job = JobContext.ensure(jd_data)
+        self._artifacts = {}
+
+    def get(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return an artifact, computing it the first time it is asked for"""
+        # One evaluation runs on one thread, so no lock is needed
+        if name not in self._artifacts:
+            self._artifacts[name] = compute()
+        return self._artifacts[name]
+
+    def put(self, name: str, value: Any):
+        """Record an artifact computed elsewhere (e.g. by a batched computation)"""
+        self._artifacts[name] = value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._artifacts
@@ -0,0 +1,143 @@
+from typing import Dict, Optional
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+# Cached feedback older than this is regenerated; the cache is bounded by the total size of its entries
+FEEDBACK_CACHE_TTL = float(os.getenv('FEEDBACK_CACHE_TTL', 7 * 24 * 3600))
+FEEDBACK_CACHE_MAX_BYTES = int(os.getenv('FEEDBACK_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+class FeedbackCache:
+    """Persist generated LLM feedback in SQLite so re-evaluations reuse it across restarts and workers"""
+
+    def __init__(self, db_path: str = None, ttl: float = None, max_bytes: int = None):
+        if db_path is None:
+            # Share the evaluations database file
+            self.db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'evaluations.db')
+        else:
+            self.db_path = db_path
+        self.ttl = FEEDBACK_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = FEEDBACK_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+        self.init_database()
+
+    def init_database(self):
+        """Initialize the feedback cache table"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feedback_cache (
+                cache_key TEXT PRIMARY KEY,
+                feedback TEXT NOT NULL,
+                model TEXT,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_feedback_cache_access ON feedback_cache(last_access)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(resume_text: str, jd_text: str, prompt_template: str, model_name: str) -> str:
+        """Cache key for one prompt: any change to the texts sent, the template or the model misses"""
+        digest = hashlib.sha256()
+        for part in (model_name, prompt_template, jd_text, resume_text):
+            encoded = part.encode('utf-8')
+            # Length-prefixed, so moving text between parts changes the key
+            digest.update(str(len(encoded)).encode('ascii') + b':' + encoded)
+        return f"{model_name}:{digest.hexdigest()}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached feedback that is younger than the TTL, or None"""
+        now = time.time()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('SELECT feedback, created FROM feedback_cache WHERE cache_key = ?', (key,))
+        row = cursor.fetchone()
+        expired = row is not None and now - row[1] > self.ttl
+        if expired:
+            cursor.execute('DELETE FROM feedback_cache WHERE cache_key = ?', (key,))
+            conn.commit()
+        elif row is not None:
+            cursor.execute('UPDATE feedback_cache SET last_access = ? WHERE cache_key = ?', (now, key))
+            conn.commit()
+        conn.close()
+
+        with self._lock:
+            if row is None or expired:
+                self.stats["misses"] += 1
+                if expired:
+                    self.stats["expired"] += 1
+                return None
+            self.stats["hits"] += 1
+        return row[0]
+
+    def put(self, key: str, feedback: str, model_name: str = ""):
+        """Store generated feedback, dropping expired and then least recently used entries past the size bound"""
+        now = time.time()
+        size = len(feedback.encode('utf-8'))
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO feedback_cache (cache_key, feedback, model, size, created, last_access)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (key, feedback, model_name, size, now, now))
+
+        cursor.execute('DELETE FROM feedback_cache WHERE created < ?', (now - self.ttl,))
+        evicted = cursor.rowcount
+
+        cursor.execute('SELECT COALESCE(SUM(size), 0) FROM feedback_cache')
+        excess = cursor.fetchone()[0] - self.max_bytes
+        if excess > 0:
+            cursor.execute('SELECT cache_key, size FROM feedback_cache ORDER BY last_access')
+            doomed = []
+            for cache_key, entry_size in cursor.fetchall():
+                if excess <= 0:
+                    break
+                doomed.append((cache_key,))
+                excess -= entry_size
+            cursor.executemany('DELETE FROM feedback_cache WHERE cache_key = ?', doomed)
+            evicted += len(doomed)
+
+        conn.commit()
+        conn.close()
+
+        with self._lock:
+            self.stats["stores"] += 1
+            self.stats["evictions"] += evicted
+
+    def clear(self):
+        """Remove every cached feedback entry"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('DELETE FROM feedback_cache')
+        conn.commit()
+        conn.close()
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters for this process plus the current size of the shared store"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM feedback_cache')
+        entries, size = cursor.fetchone()
+        conn.close()
+
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size
+        })
+        return stats
@@ -0,0 +1,85 @@
+from collections import defaultdict
+from typing import Iterable, Iterator, List, Set
+from .similarity_cache import is_similar
+
+class FuzzyIndex:
+    """Character bigram index answering the same question as a linear SequenceMatcher scan, faster"""
+
+    # has_match(target) is True exactly when some candidate equals target or has
+    # SequenceMatcher(None, target, candidate).ratio() > threshold; exact matches are a dict
+    # lookup, and SequenceMatcher only runs on candidates that survive the bigram and length
+    # filters and are not already in the process-wide pair cache.
+
+    # Below this threshold a match no longer has to share a bigram (see _bigram_pruning_safe)
+    MIN_PRUNING_THRESHOLD = 0.8
+
+    def __init__(self, candidates: Iterable[str], threshold: float = 0.8):
+        self.threshold = threshold
+        self.candidates = list(dict.fromkeys(candidates))
+        self.exact = {candidate: candidate_id for candidate_id, candidate in enumerate(self.candidates)}
+        self.lengths = [len(c) for c in self.candidates]
+
+        # bigram -> ids of candidates containing it
+        self.postings = defaultdict(list)
+        for candidate_id, candidate in enumerate(self.candidates):
+            for bigram in self._bigrams(candidate):
+                self.postings[bigram].append(candidate_id)
+
+    def has_match(self, target: str) -> bool:
+        """Check whether any candidate equals target or is more than threshold similar to it"""
+        if target in self.exact:
+            return True
+        for _ in self._iter_matches(target, self._candidate_ids(target)):
+            return True
+        return False
+
+    def find_all(self, target: str) -> List[int]:
+        """Return the ids of every candidate that equals target or is more than threshold similar to it"""
+        exact_id = self.exact.get(target)
+        matches = [exact_id] if exact_id is not None else []
+        matches.extend(
+            candidate_id for candidate_id in self._iter_matches(target, self._candidate_ids(target))
+            if candidate_id != exact_id
+        )
+        return matches
+
+    def _candidate_ids(self, target: str):
+        """Ids of candidates that could be above the threshold, most promising first"""
+        if not self._bigram_pruning_safe():
+            return range(len(self.candidates))
+
+        # Any pair above the threshold shares at least one bigram, so only those are candidates
+        shared = defaultdict(int)
+        for bigram in self._bigrams(target):
+            for candidate_id in self.postings.get(bigram, ()):
+                shared[candidate_id] += 1
+
+        # Candidates sharing the most bigrams are the most likely matches; try them first
+        return sorted(shared, key=shared.get, reverse=True)
+
+    def _iter_matches(self, target: str, candidate_ids) -> Iterator[int]:
+        """Verify candidates with (memoized) SequenceMatcher ratios, cheapest upper bounds first"""
+        threshold = self.threshold
+        target_length = len(target)
+        for candidate_id in candidate_ids:
+            candidate_length = self.lengths[candidate_id]
+            total = target_length + candidate_length
+            # ratio = 2M / total and M <= min length
+            if total == 0 or 2.0 * min(target_length, candidate_length) / total <= threshold:
+                continue
+            # The same pairs recur in every evaluation; their verdicts are memoized process-wide
+            if is_similar(target, self.candidates[candidate_id], threshold):
+                yield candidate_id
+
+    def _bigram_pruning_safe(self) -> bool:
+        """Whether every pair above the threshold is guaranteed to share a bigram"""
+        # SequenceMatcher merges adjacent matching blocks, so k blocks of length 1 need at
+        # least k - 1 unmatched characters between them: ratio <= 2M / (3M - 1), which is at
+        # most 0.8 for M >= 2. M = 1 only exceeds 0.8 for two equal single characters, which
+        # the exact lookup already handles.
+        return self.threshold >= self.MIN_PRUNING_THRESHOLD
+
+    @staticmethod
+    def _bigrams(text: str) -> Set[str]:
+        """Distinct character bigrams of a string"""
+        return {text[i:i + 2] for i in range(len(text) - 1)}
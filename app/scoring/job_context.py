@@ -0,0 +1,125 @@
+from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict
+import os
+import threading
+try:
+    from app.utils.skill_lexicon import get_skill_lexicon
+    from app.utils.tokenizer import NgramAnalyzer, document_tokens
+except ImportError:
+    from utils.skill_lexicon import get_skill_lexicon
+    from utils.tokenizer import NgramAnalyzer, document_tokens
+
+class JobContext:
+    """Parsed job description prepared once and reused for every resume scored against it"""
+
+    # Text limits applied by SemanticMatcher when comparing documents
+    OVERALL_TEXT_LIMIT = 5000
+    SECTION_TEXT_LIMIT = 1000
+
+    def __init__(self, jd_data: Dict, jd_filename: str = ""):
+        self.jd_data = jd_data
+        self.jd_filename = jd_filename
+        self.text = jd_data.get("text", "")
+        self.job_title = jd_data.get("job_title", "Unknown Position")
+        self.experience = jd_data.get("experience", "")
+
+        # Original skill lists (used for reporting) and lowercased lists (used for matching)
+        self.must_have_skills = list(jd_data.get("must_have_skills", []))
+        self.good_to_have_skills = list(jd_data.get("good_to_have_skills", []))
+        self.qualifications = list(jd_data.get("qualifications", []))
+        self.keywords = list(jd_data.get("keywords", []))
+        self.must_have_skills_lower = [s.lower() for s in self.must_have_skills]
+        self.good_to_have_skills_lower = [s.lower() for s in self.good_to_have_skills]
+        self.qualifications_lower = [q.lower() for q in self.qualifications]
+        self.keywords_lower = [k.lower() for k in self.keywords]
+        
+        # Lexicon ID of each skill requirement that names a known skill, None for free-form ones
+        lexicon = get_skill_lexicon()
+        self.must_have_skill_ids = [lexicon.lookup(s) for s in self.must_have_skills]
+        self.good_to_have_skill_ids = [lexicon.lookup(s) for s in self.good_to_have_skills]
+
+        # Truncated texts, and their terms from the parser's tokens, used by the semantic matcher
+        self.overall_text = self.text[:self.OVERALL_TEXT_LIMIT]
+        self.section_text = self.text[:self.SECTION_TEXT_LIMIT]
+        tokens = document_tokens(self.jd_data)
+        self.overall_terms = tokens.terms_between(0, self.OVERALL_TEXT_LIMIT)
+        self.section_terms = tokens.terms_between(0, self.SECTION_TEXT_LIMIT)
+
+        # The section representation is fitted lazily so that callers which only
+        # need relevance scoring never pay for TF-IDF
+        self._section_vectorizer = None
+        self._section_vector = None
+        self._section_fitted = False
+        # Vectors of the job texts under the fixed vectorizer they were computed with
+        self._fixed_vectors = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_text(cls, jd_text: str, jd_parser, jd_filename: str = "") -> "JobContext":
+        """Parse job description text and build a context from it"""
+        return cls(jd_parser.parse(jd_text), jd_filename)
+
+    @classmethod
+    def from_file(cls, jd_path: str, jd_parser) -> "JobContext":
+        """Read and parse a job description file and build a context from it"""
+        try:
+            with open(jd_path, 'r', encoding='utf-8') as f:
+                jd_text = f.read()
+        except UnicodeDecodeError:
+            # Try with different encoding if UTF-8 fails
+            with open(jd_path, 'r', encoding='latin-1') as f:
+                jd_text = f.read()
+        return cls.from_text(jd_text, jd_parser, os.path.basename(jd_path))
+
+    @classmethod
+    def ensure(cls, jd_data) -> "JobContext":
+        """Return jd_data unchanged if it is already a context, otherwise wrap the parsed dict"""
+        if isinstance(jd_data, cls):
+            return jd_data
+        return cls(jd_data or {})
+
+    def get_section_representation(self):
+        """Return the TF-IDF vectorizer fitted on the job description and its vector"""
+        if not self._section_fitted:
+            with self._lock:
+                if not self._section_fitted:
+                    # Same terms as stop_words='english', ngram_range=(1, 2), from the shared tokens
+                    vectorizer = TfidfVectorizer(
+                        max_features=5000,
+                        analyzer=NgramAnalyzer()
+                    )
+                    try:
+                        self._section_vector = vectorizer.fit_transform([self.section_terms])
+                        self._section_vectorizer = vectorizer
+                    except ValueError:
+                        # Empty vocabulary (blank or stop-word only description)
+                        self._section_vectorizer, self._section_vector = None, None
+                    self._section_fitted = True
+        return self._section_vectorizer, self._section_vector
+
+    def get_fixed_vectors(self, vectorizer):
+        """Return the overall and section vectors of the job under a fixed (pre-fitted or stateless) vectorizer"""
+        # A single tuple is swapped in, so concurrent readers always see a consistent entry
+        cached = self._fixed_vectors
+        if cached is None or cached[0] is not vectorizer:
+            vectors = vectorizer.transform([self.overall_terms, self.section_terms])
+            cached = (vectorizer, vectors[0], vectors[1])
+            self._fixed_vectors = cached
+        return cached[1], cached[2]
+
+    def get(self, key: str, default=None):
+        """Dict-style access to the underlying parsed job description"""
+        return self.jd_data.get(key, default)
+
+    def __getitem__(self, key: str):
+        return self.jd_data[key]
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        # Locks cannot be pickled; worker processes get a fresh one
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
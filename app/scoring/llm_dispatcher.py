@@ -0,0 +1,384 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Sequence
+import os
+import random
+import re
+import threading
+import time
+
+# Requests in flight at once, sustained request rate and burst, and retries after a quota error
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 4))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv('LLM_REQUESTS_PER_MINUTE', 60))
+LLM_BURST = int(os.getenv('LLM_BURST', LLM_MAX_CONCURRENCY))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 4))
+# Prompts packed into one request by generate_many (1 disables packing) and the packed prompt's size limit
+LLM_BATCH_SIZE = int(os.getenv('LLM_BATCH_SIZE', 1))
+LLM_BATCH_MAX_CHARS = int(os.getenv('LLM_BATCH_MAX_CHARS', 12000))
+# Seconds a prompt may take end to end, including rate limiting and retries (0 disables the deadline)
+LLM_DEADLINE = float(os.getenv('LLM_DEADLINE', 20))
+# Consecutive failures that open the circuit, and seconds it stays open before one probe request is let through
+LLM_BREAKER_THRESHOLD = int(os.getenv('LLM_BREAKER_THRESHOLD', 5))
+LLM_BREAKER_RESET = float(os.getenv('LLM_BREAKER_RESET', 30))
+
+ANSWER_MARKER = re.compile(r'^### ANSWER (\d+)\s*$', re.MULTILINE)
+
+class RateLimitError(Exception):
+    """Raised by a backend when the provider rejects a request for quota reasons"""
+
+class DeadlineExceededError(Exception):
+    """Raised when a prompt is not answered within the dispatcher's deadline"""
+
+class QueueTimeoutError(DeadlineExceededError):
+    """Raised when a prompt's deadline passes while it waits locally, before it ever reaches the provider"""
+
+class CircuitOpenError(Exception):
+    """Raised without contacting the provider while the circuit breaker is open"""
+
+def is_quota_error(error: Exception) -> bool:
+    """Whether an error means "slow down" (HTTP 429 / resource exhausted) rather than a failed request"""
+    if isinstance(error, RateLimitError):
+        return True
+    # google.api_core raises ResourceExhausted / TooManyRequests; avoid importing it just to compare
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    return getattr(error, "code", None) == 429 or "quota" in str(error).lower()
+
+class TokenBucket:
+    """Thread-safe token bucket: rate tokens per second, at most capacity saved up for bursts"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, sleeping until one is available; False if that would take longer than timeout"""
+        if self.rate <= 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if timeout is not None:
+                if wait > timeout:
+                    return False
+                timeout -= wait
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """Stop calling a failing provider: open after consecutive failures, then probe with one request at a time"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None):
+        self.failure_threshold = max(1, failure_threshold or LLM_BREAKER_THRESHOLD)
+        self.reset_timeout = LLM_BREAKER_RESET if reset_timeout is None else reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        # Bumped on every trip; outcomes of requests admitted before the last trip are ignored
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stats = {"trips": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        """Whether a request may go out now; after reset_timeout an open circuit lets one probe through"""
+        return self.admit() is not None
+
+    def admit(self) -> Optional[int]:
+        """Like allow(), but returns the generation to report the request's outcome with (None if rejected)"""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.CLOSED:
+                return self._generation
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return self._generation
+            self.stats["rejected"] += 1
+            return None
+
+    def record_success(self, generation: Optional[int] = None):
+        with self._lock:
+            if self._is_stale(generation):
+                # A slow request from before the trip must not close the circuit ahead of the probe
+                return
+            self.state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_skipped(self, generation: Optional[int] = None):
+        """An admitted request that never reached the provider: neither outcome counts, but a probe slot is freed"""
+        with self._lock:
+            if not self._is_stale(generation):
+                self._probing = False
+
+    def record_failure(self, generation: Optional[int] = None):
+        with self._lock:
+            if self._is_stale(generation):
+                return
+            self._failures += 1
+            # A failed probe re-opens the circuit for another reset_timeout
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.stats["trips"] += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._generation += 1
+            self._probing = False
+
+    def is_open(self) -> bool:
+        """Whether requests are currently being rejected (open and not yet due for a probe)"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats.update({"state": self.state, "consecutive_failures": self._failures})
+        return stats
+
+    def _is_stale(self, generation: Optional[int]) -> bool:
+        return generation is not None and generation != self._generation
+
+class ModelBackend:
+    """A generative model client (e.g. genai.GenerativeModel) created once and reused for every request"""
+
+    def __init__(self, model):
+        self.model = model
+
+    def generate(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+class FakeLLMBackend:
+    """Local stand-in for an LLM with a fixed latency, for tests and throughput benchmarks"""
+
+    def __init__(self, latency: float = 0.05, quota_errors: int = 0):
+        self.latency = latency
+        # The first quota_errors requests are rejected as over quota
+        self.quota_errors = quota_errors
+        # While True every request fails, as during a provider outage
+        self.outage = False
+        self.requests = 0
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate(self, prompt: str) -> str:
+        with self._lock:
+            self.requests += 1
+            if self.requests <= self.quota_errors:
+                raise RateLimitError("429 Resource has been exhausted (e.g. check quota)")
+            if self.outage:
+                raise ConnectionError("503 Service unavailable")
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        # Answer packed prompts the way pack_prompts asks to be answered
+        requests = re.findall(r'^### REQUEST (\d+)\s*$', prompt, re.MULTILINE)
+        if requests:
+            return "\n".join(f"### ANSWER {number}\nFake feedback for request {number}" for number in requests)
+        return f"Fake feedback ({len(prompt)} characters of prompt)"
+
+def pack_prompts(prompts: Sequence[str]) -> str:
+    """Combine several prompts into one request whose answers can be told apart"""
+    parts = [
+        f"Answer each of the following {len(prompts)} requests independently. "
+        "Start each answer with a line containing only '### ANSWER <n>', where <n> is the request number."
+    ]
+    for number, prompt in enumerate(prompts, 1):
+        parts.append(f"### REQUEST {number}\n{prompt.strip()}")
+    return "\n\n".join(parts)
+
+def unpack_answers(response: str, count: int) -> List[Optional[str]]:
+    """Split a packed response into count answers (None for any the model left out)"""
+    answers = [None] * count
+    markers = list(ANSWER_MARKER.finditer(response))
+    for i, marker in enumerate(markers):
+        number = int(marker.group(1))
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(response)
+        answer = response[marker.end():end].strip()
+        if 1 <= number <= count and answer and answers[number - 1] is None:
+            answers[number - 1] = answer
+    return answers
+
+class LLMDispatcher:
+    """Send prompts to one shared backend with a concurrency cap, a rate limit, backoff on quota errors,
+    a per-prompt deadline and a circuit breaker"""
+
+    def __init__(self, backend, max_concurrency: int = None, requests_per_minute: float = None,
+                 burst: int = None, max_retries: int = None, base_delay: float = 1.0, max_delay: float = 30.0,
+                 deadline: float = None, breaker: CircuitBreaker = None):
+        self.backend = backend
+        self.max_concurrency = max(1, max_concurrency or LLM_MAX_CONCURRENCY)
+        requests_per_minute = LLM_REQUESTS_PER_MINUTE if requests_per_minute is None else requests_per_minute
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst or LLM_BURST)
+        self.max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = LLM_DEADLINE if deadline is None else deadline
+        self.breaker = breaker or CircuitBreaker()
+
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        # Backend calls run here so a caller can stop waiting at its deadline; abandoned calls finish in the
+        # background, holding their request slot, so there are never more than max_concurrency of them
+        self._calls = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm-call")
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "prompts": 0, "packed_requests": 0, "retries": 0,
+                      "quota_errors": 0, "deadline_exceeded": 0, "short_circuited": 0, "failures": 0}
+
+    def generate(self, prompt: str) -> str:
+        """Send one prompt, waiting for a free slot and a rate token; quota errors are retried"""
+        self._count("prompts")
+        return self._send(prompt)
+
+    def generate_many(self, prompts: Sequence[str], batch_size: int = None,
+                      max_chars: int = None) -> List[Optional[str]]:
+        """Answer many prompts concurrently, packing up to batch_size short ones per request (None where one failed)"""
+        batch_size = max(1, batch_size or LLM_BATCH_SIZE)
+        max_chars = max_chars or LLM_BATCH_MAX_CHARS
+        self._count("prompts", len(prompts))
+
+        # Greedily group consecutive prompts that fit together
+        groups = []
+        for index, prompt in enumerate(prompts):
+            if (groups and len(groups[-1]) < batch_size and
+                    sum(len(prompts[i]) for i in groups[-1]) + len(prompt) <= max_chars):
+                groups[-1].append(index)
+            else:
+                groups.append([index])
+
+        results = [None] * len(prompts)
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(groups) or 1),
+                                thread_name_prefix="llm-dispatch") as executor:
+            for group, answers in zip(groups, executor.map(lambda group: self._answer_group(prompts, group), groups)):
+                for index, answer in zip(group, answers):
+                    results[index] = answer
+        return results
+
+    def get_stats(self) -> Dict:
+        """Request, retry, quota error and deadline counters for this process, and the circuit breaker's state"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["circuit"] = self.breaker.get_stats()
+        return stats
+
+    def _answer_group(self, prompts: Sequence[str], group: List[int]) -> List[Optional[str]]:
+        """Answer one group of prompts, packed when it has several; unanswered ones are sent on their own"""
+        answers = [None] * len(group)
+        if len(group) > 1:
+            try:
+                self._count("packed_requests")
+                answers = unpack_answers(self._send(pack_prompts([prompts[i] for i in group])), len(group))
+            except CircuitOpenError:
+                return answers
+            except Exception as e:
+                print(f"Packed LLM request failed, sending its prompts one by one: {e}")
+
+        for position, index in enumerate(group):
+            if answers[position] is None:
+                try:
+                    answers[position] = self._send(prompts[index])
+                except CircuitOpenError:
+                    break
+                except Exception as e:
+                    print(f"LLM request failed: {e}")
+        return answers
+
+    def _send(self, prompt: str) -> str:
+        """One prompt through the circuit breaker, answered within the deadline or failed"""
+        generation = self.breaker.admit()
+        if generation is None:
+            self._count("short_circuited")
+            raise CircuitOpenError("LLM circuit breaker is open")
+        deadline = time.monotonic() + self.deadline if self.deadline > 0 else None
+        try:
+            answer = self._send_with_retries(prompt, deadline)
+        except QueueTimeoutError:
+            # Only provider calls say anything about its health; waiting in our own queue does not
+            self._count("failures")
+            self.breaker.record_skipped(generation)
+            raise
+        except Exception:
+            self._count("failures")
+            self.breaker.record_failure(generation)
+            raise
+        self.breaker.record_success(generation)
+        return answer
+
+    def _send_with_retries(self, prompt: str, deadline: Optional[float]) -> str:
+        """Requests through the token bucket and the semaphore, retrying quota errors with jittered backoff"""
+        attempt = 0
+        while True:
+            # After a quota error the provider has answered, so a later timeout counts against it
+            if not self.bucket.acquire(self._remaining(deadline)):
+                raise self._deadline_exceeded("waiting for the rate limit", queued=attempt == 0)
+            if not self._semaphore.acquire(timeout=self._remaining(deadline)):
+                raise self._deadline_exceeded("waiting for a free request slot", queued=attempt == 0)
+            try:
+                self._count("requests")
+                # _call releases the slot
+                return self._call(prompt, deadline).strip()
+            except Exception as e:
+                quota_error = is_quota_error(e)
+                if quota_error:
+                    self._count("quota_errors")
+                if not quota_error or attempt >= self.max_retries:
+                    raise
+            # Full jitter, so callers rejected together do not retry together
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+            remaining = self._remaining(deadline)
+            if remaining is not None and delay >= remaining:
+                raise self._deadline_exceeded("backing off after a rate limit error")
+            attempt += 1
+            self._count("retries")
+            time.sleep(delay)
+
+    def _call(self, prompt: str, deadline: Optional[float]) -> str:
+        """Call the backend in a held request slot, giving up when the deadline passes; the slot is released
+        once the backend call returns"""
+        if deadline is None:
+            try:
+                return self.backend.generate(prompt)
+            finally:
+                self._semaphore.release()
+        try:
+            future = self._calls.submit(self.backend.generate, prompt)
+        except Exception:
+            self._semaphore.release()
+            raise
+        # An abandoned call keeps its slot until it returns, so in-flight requests never exceed max_concurrency
+        future.add_done_callback(lambda _: self._semaphore.release())
+        try:
+            return future.result(timeout=self._remaining(deadline))
+        except FutureTimeoutError:
+            raise self._deadline_exceeded("waiting for the model")
+
+    def _remaining(self, deadline: Optional[float]) -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def _deadline_exceeded(self, step: str, queued: bool = False) -> DeadlineExceededError:
+        self._count("deadline_exceeded")
+        error_type = QueueTimeoutError if queued else DeadlineExceededError
+        return error_type(f"LLM deadline of {self.deadline:g}s exceeded {step}")
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.stats[name] += amount
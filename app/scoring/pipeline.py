@@ -0,0 +1,69 @@
+from typing import Dict, Optional
+from .job_context import JobContext
+from .evaluation_context import EvaluationContext
+
+# improved_feedback of an evaluation whose feedback is still being generated in the background
+FEEDBACK_PENDING = "pending"
+
+def resolve_job_title(job_context: JobContext, resume_data: Dict) -> str:
+    """Use job title from JD, but if not found, try to infer from resume"""
+    job_title = job_context.job_title
+    if job_title == "Unknown Position" or job_title == "":
+        # Try to use resume's inferred job title
+        resume_job_title = resume_data.get("job_title", "General Applicant")
+        if resume_job_title and resume_job_title != "General Applicant":
+            job_title = resume_job_title
+        else:
+            job_title = "General Applicant"
+    return job_title
+
+def score_resume(resume_data: Dict, resume_filename: str, job_context: JobContext,
+                 relevance_scorer, semantic_matcher, semantic_result: Optional[Dict] = None,
+                 context: Optional[EvaluationContext] = None, defer_feedback: bool = False,
+                 improved_feedback: Optional[str] = None) -> Dict:
+    """Score a parsed resume against a prepared job and build the evaluation result (not saved)"""
+    job_title = resolve_job_title(job_context, resume_data)
+
+    # Results computed once here are reused by the feedback generators
+    if context is None:
+        context = EvaluationContext(resume_data, job_context)
+    if semantic_result is not None:
+        # Semantic similarity was computed for the whole batch
+        context.put(EvaluationContext.SEMANTIC_SIMILARITY, semantic_result)
+    if improved_feedback is not None:
+        # Feedback was generated for the whole batch
+        context.put(EvaluationContext.IMPROVED_FEEDBACK, improved_feedback)
+
+    # Calculate relevance score
+    print("Calculating relevance score...")
+    relevance_result = relevance_scorer.calculate_relevance(resume_data, job_context, context)
+
+    # Calculate semantic similarity
+    print("Calculating semantic similarity...")
+    semantic_result = semantic_matcher.calculate_semantic_similarity(resume_data, job_context, context)
+
+    # Generate improved feedback, unless the caller generates it in the background
+    if defer_feedback:
+        improved_feedback = FEEDBACK_PENDING
+    else:
+        print("Generating feedback...")
+        improved_feedback = semantic_matcher.get_improved_feedback(resume_data, job_context, context)
+
+    # Combine results
+    return {
+        "resume_filename": resume_filename,
+        "jd_filename": job_context.jd_filename,
+        "job_title": job_title,
+        "relevance_score": relevance_result["relevance_score"],
+        "verdict": relevance_result["verdict"],
+        "missing_elements": relevance_result["missing_elements"],
+        "feedback": relevance_result["feedback"],
+        "improved_feedback": improved_feedback,
+        "feedback_status": FEEDBACK_PENDING if defer_feedback else "ready",
+        "semantic_similarity": semantic_result["overall_similarity"],
+        "section_similarities": semantic_result["section_similarities"],
+        "resume_text": resume_data["text"],
+        "jd_text": job_context.text,
+        "email": resume_data.get("email", ""),
+        "phone": resume_data.get("phone", "")
+    }
@@ -1,6 +1,10 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import re
-from difflib import SequenceMatcher
+import numpy as np
+from scipy import sparse
+from .job_context import JobContext
+from .fuzzy_index import FuzzyIndex
+from .evaluation_context import EvaluationContext
 
 class RelevanceScorer:
     """Calculate relevance score between resume and job description"""
@@ -14,34 +18,54 @@ class RelevanceScorer:
             "experience": 0.15,
             "keywords": 0.1
         }
+        # Similarity ratio above which two keywords are considered a match
+        self.fuzzy_threshold = 0.8
     
-    def calculate_relevance(self, resume_data: Dict, jd_data: Dict) -> Dict[str, any]:
-        """Calculate overall relevance score and provide feedback"""
+    def calculate_relevance(self, resume_data: Dict, jd_data,
+                            context: Optional[EvaluationContext] = None) -> Dict[str, any]:
+        """Calculate overall relevance score and provide feedback (jd_data may be a dict or a JobContext)"""
+        if context is not None:
+            return context.get(EvaluationContext.RELEVANCE,
+                               lambda: self.calculate_relevance(resume_data, jd_data))
+        
+        job = JobContext.ensure(jd_data)
+        
+        # Lowercase resume keywords once and index them for all keyword-based components
+        resume_keywords_lower = [k.lower() for k in resume_data.get("keywords", [])]
+        resume_index = FuzzyIndex(resume_keywords_lower, self.fuzzy_threshold)
+        resume_skill_ids = self._skill_id_set(resume_data)
         
         # Calculate scores for each component
         must_have_score, missing_must_haves = self._score_must_have_skills(
-            resume_data.get("keywords", []), 
-            jd_data.get("must_have_skills", [])
+            resume_index, 
+            job.must_have_skills,
+            job.must_have_skills_lower,
+            resume_skill_ids,
+            job.must_have_skill_ids
         )
         
         good_to_have_score, missing_good_to_haves = self._score_good_to_have_skills(
-            resume_data.get("keywords", []), 
-            jd_data.get("good_to_have_skills", [])
+            resume_index, 
+            job.good_to_have_skills,
+            job.good_to_have_skills_lower,
+            resume_skill_ids,
+            job.good_to_have_skill_ids
         )
         
         qualification_score, missing_qualifications = self._score_qualifications(
             resume_data.get("sections", {}).get("education", ""), 
-            jd_data.get("qualifications", [])
+            job.qualifications,
+            job.qualifications_lower
         )
         
         experience_score = self._score_experience(
             resume_data.get("sections", {}).get("experience", ""), 
-            jd_data.get("experience", "")
+            job.experience
         )
         
         keyword_score = self._score_keywords(
-            resume_data.get("keywords", []), 
-            jd_data.get("keywords", [])
+            resume_index, 
+            job.keywords_lower
         )
         
         # Calculate weighted score
@@ -61,7 +85,7 @@ class RelevanceScorer:
             missing_must_haves, 
             missing_good_to_haves, 
             missing_qualifications,
-            jd_data.get("experience", "")
+            job.experience
         )
         
         return {
@@ -75,7 +99,145 @@ class RelevanceScorer:
             "feedback": feedback
         }
     
-    def _score_must_have_skills(self, resume_keywords: List[str], jd_skills: List[str]) -> Tuple[float, List[str]]:
+    def calculate_relevance_batch(self, resumes: List[Dict], jd_data) -> List[Dict[str, any]]:
+        """Score many resumes against one job description with vectorized coverage computations"""
+        job = JobContext.ensure(jd_data)
+        if not resumes:
+            return []
+        
+        # Encode every resume's keywords against a shared vocabulary as a binary sparse matrix
+        vocabulary = {}
+        rows, cols = [], []
+        for row, resume_data in enumerate(resumes):
+            for keyword in set(k.lower() for k in resume_data.get("keywords", [])):
+                cols.append(vocabulary.setdefault(keyword, len(vocabulary)))
+                rows.append(row)
+        resume_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(resumes), len(vocabulary))
+        )
+        vocabulary_index = FuzzyIndex(vocabulary, self.fuzzy_threshold)
+        resume_skill_ids = [self._skill_id_set(resume_data) for resume_data in resumes]
+        
+        must_have_scores, must_have_matched = self._batch_skill_coverage(
+            resume_matrix, vocabulary_index, job.must_have_skills_lower,
+            resume_skill_ids, job.must_have_skill_ids)
+        good_to_have_scores, good_to_have_matched = self._batch_skill_coverage(
+            resume_matrix, vocabulary_index, job.good_to_have_skills_lower,
+            resume_skill_ids, job.good_to_have_skill_ids)
+        keyword_scores, _ = self._batch_skill_coverage(
+            resume_matrix, vocabulary_index, job.keywords_lower)
+        
+        # Qualifications: substring containment of each requirement in each education section
+        if job.qualifications:
+            education = np.array([
+                " ".join(resume_data.get("sections", {}).get("education", "").lower().split())
+                for resume_data in resumes
+            ])
+            qualifications = np.array(job.qualifications_lower)
+            qualification_matched = np.char.find(education[:, None], qualifications[None, :]) >= 0
+            qualification_scores = qualification_matched.mean(axis=1)
+        else:
+            qualification_matched = np.zeros((len(resumes), 0), dtype=bool)
+            qualification_scores = np.ones(len(resumes))
+        
+        experience_scores = np.array([
+            self._score_experience(resume_data.get("sections", {}).get("experience", ""), job.experience)
+            for resume_data in resumes
+        ])
+        
+        weighted_scores = (
+            must_have_scores * self.weights["must_have_skills"] +
+            good_to_have_scores * self.weights["good_to_have_skills"] +
+            qualification_scores * self.weights["qualifications"] +
+            experience_scores * self.weights["experience"] +
+            keyword_scores * self.weights["keywords"]
+        ) * 100
+        
+        results = []
+        for row in range(len(resumes)):
+            missing_must_haves = [s for s, m in zip(job.must_have_skills, must_have_matched[row]) if not m]
+            missing_good_to_haves = [s for s, m in zip(job.good_to_have_skills, good_to_have_matched[row]) if not m]
+            missing_qualifications = [q for q, m in zip(job.qualifications, qualification_matched[row]) if not m]
+            weighted_score = float(weighted_scores[row])
+            results.append({
+                "relevance_score": round(weighted_score, 2),
+                "verdict": self._get_verdict(weighted_score),
+                "missing_elements": {
+                    "must_have_skills": missing_must_haves,
+                    "good_to_have_skills": missing_good_to_haves,
+                    "qualifications": missing_qualifications
+                },
+                "feedback": self._generate_feedback(
+                    missing_must_haves,
+                    missing_good_to_haves,
+                    missing_qualifications,
+                    job.experience
+                )
+            })
+        return results
+    
+    def _batch_skill_coverage(self, resume_matrix, vocabulary_index: FuzzyIndex, jd_items_lower: List[str],
+                              resume_skill_ids: List[Optional[Set[int]]] = None,
+                              jd_item_ids: List[Optional[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return per-resume coverage scores and the (resumes x items) matched matrix for a JD item list"""
+        num_resumes = resume_matrix.shape[0]
+        if not jd_items_lower:
+            return np.ones(num_resumes), np.zeros((num_resumes, 0), dtype=bool)
+        
+        resume_skill_ids = resume_skill_ids or [None] * num_resumes
+        jd_item_ids = jd_item_ids or [None] * len(jd_items_lower)
+        lexicon_rows = np.array([skill_ids is not None for skill_ids in resume_skill_ids])
+        lexicon_items = [col for col, skill_id in enumerate(jd_item_ids) if skill_id is not None]
+        
+        # items x vocabulary matrix marking every vocabulary term that fuzzy-matches each item;
+        # lexicon skills only need it for resumes parsed without skill IDs
+        rows, cols = [], []
+        for row, item in enumerate(jd_items_lower):
+            if jd_item_ids[row] is not None and lexicon_rows.all():
+                continue
+            for term_id in vocabulary_index.find_all(item):
+                rows.append(row)
+                cols.append(term_id)
+        item_matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(jd_items_lower), resume_matrix.shape[1])
+        )
+        
+        # A resume covers an item when it contains at least one matching term
+        matched = (resume_matrix @ item_matrix.T).toarray() > 0
+        
+        # Lexicon skills are covered when the resume mentions the same skill ID
+        if lexicon_items and lexicon_rows.any():
+            skill_rows, skill_cols = [], []
+            for row, skill_ids in enumerate(resume_skill_ids):
+                for skill_id in skill_ids or ():
+                    skill_rows.append(row)
+                    skill_cols.append(skill_id)
+            num_skills = max(skill_cols + [jd_item_ids[col] for col in lexicon_items]) + 1
+            skill_matrix = sparse.csr_matrix(
+                (np.ones(len(skill_rows), dtype=bool), (skill_rows, skill_cols)),
+                shape=(num_resumes, num_skills)
+            )
+            has_skill = skill_matrix[:, [jd_item_ids[col] for col in lexicon_items]].toarray()
+            matched[np.ix_(lexicon_rows, lexicon_items)] = has_skill[lexicon_rows]
+        return matched.mean(axis=1), matched
+    
+    def _skill_id_set(self, resume_data: Dict) -> Optional[Set[int]]:
+        """Lexicon skill IDs of a parsed resume, or None if it was parsed without them"""
+        skill_ids = resume_data.get("skill_ids")
+        return set(skill_ids) if skill_ids is not None else None
+    
+    def _has_skill(self, resume_index: FuzzyIndex, resume_skill_ids: Optional[Set[int]],
+                   skill_lower: str, skill_id: Optional[int]) -> bool:
+        """Skills in the lexicon match on their canonical ID; other requirements match keywords fuzzily"""
+        if skill_id is not None and resume_skill_ids is not None:
+            return skill_id in resume_skill_ids
+        return resume_index.has_match(skill_lower)
+    
+    def _score_must_have_skills(self, resume_index: FuzzyIndex, jd_skills: List[str],
+                                jd_skills_lower: List[str], resume_skill_ids: Optional[Set[int]] = None,
+                                jd_skill_ids: List[Optional[int]] = None) -> Tuple[float, List[str]]:
         """Score must-have skills match"""
         if not jd_skills:
             return 1.0, []  # No skills required
@@ -83,19 +245,18 @@ class RelevanceScorer:
         matched = 0
         missing = []
         
-        resume_keywords_lower = [k.lower() for k in resume_keywords]
-        
-        for skill in jd_skills:
-            skill_lower = skill.lower()
-            # Check for exact or fuzzy match
-            if self._fuzzy_match(skill_lower, resume_keywords_lower):
+        for skill, skill_lower, skill_id in zip(jd_skills, jd_skills_lower, jd_skill_ids or [None] * len(jd_skills)):
+            # Check for a lexicon skill, or an exact or fuzzy match
+            if self._has_skill(resume_index, resume_skill_ids, skill_lower, skill_id):
                 matched += 1
             else:
                 missing.append(skill)
         
         return matched / len(jd_skills), missing
     
-    def _score_good_to_have_skills(self, resume_keywords: List[str], jd_skills: List[str]) -> Tuple[float, List[str]]:
+    def _score_good_to_have_skills(self, resume_index: FuzzyIndex, jd_skills: List[str],
+                                   jd_skills_lower: List[str], resume_skill_ids: Optional[Set[int]] = None,
+                                   jd_skill_ids: List[Optional[int]] = None) -> Tuple[float, List[str]]:
         """Score good-to-have skills match"""
         if not jd_skills:
             return 1.0, []  # No preferred skills
@@ -103,12 +264,9 @@ class RelevanceScorer:
         matched = 0
         missing = []
         
-        resume_keywords_lower = [k.lower() for k in resume_keywords]
-        
-        for skill in jd_skills:
-            skill_lower = skill.lower()
-            # Check for exact or fuzzy match
-            if self._fuzzy_match(skill_lower, resume_keywords_lower):
+        for skill, skill_lower, skill_id in zip(jd_skills, jd_skills_lower, jd_skill_ids or [None] * len(jd_skills)):
+            # Check for a lexicon skill, or an exact or fuzzy match
+            if self._has_skill(resume_index, resume_skill_ids, skill_lower, skill_id):
                 matched += 1
             else:
                 missing.append(skill)
@@ -117,7 +275,8 @@ class RelevanceScorer:
         score = matched / len(jd_skills) if jd_skills else 1.0
         return score, missing
     
-    def _score_qualifications(self, resume_education: str, jd_qualifications: List[str]) -> Tuple[float, List[str]]:
+    def _score_qualifications(self, resume_education: str, jd_qualifications: List[str],
+                              jd_qualifications_lower: List[str]) -> Tuple[float, List[str]]:
         """Score educational qualifications match"""
         if not jd_qualifications:
             return 1.0, []  # No qualifications required
@@ -125,10 +284,10 @@ class RelevanceScorer:
         matched = 0
         missing = []
         
-        education_lower = resume_education.lower()
+        # Sections keep their line breaks; a qualification may wrap across lines
+        education_lower = " ".join(resume_education.lower().split())
         
-        for qual in jd_qualifications:
-            qual_lower = qual.lower()
+        for qual, qual_lower in zip(jd_qualifications, jd_qualifications_lower):
             # Check for exact or partial match
             if qual_lower in education_lower:
                 matched += 1
@@ -162,32 +321,18 @@ class RelevanceScorer:
         else:
             return 0.25
     
-    def _score_keywords(self, resume_keywords: List[str], jd_keywords: List[str]) -> float:
+    def _score_keywords(self, resume_index: FuzzyIndex, jd_keywords_lower: List[str]) -> float:
         """Score general keyword match"""
-        if not jd_keywords:
+        if not jd_keywords_lower:
             return 1.0
         
         matched = 0
-        resume_keywords_lower = [k.lower() for k in resume_keywords]
-        jd_keywords_lower = [k.lower() for k in jd_keywords]
         
         for keyword in jd_keywords_lower:
-            if self._fuzzy_match(keyword, resume_keywords_lower):
+            if resume_index.has_match(keyword):
                 matched += 1
         
-        return matched / len(jd_keywords)
-    
-    def _fuzzy_match(self, target: str, candidates: List[str]) -> bool:
-        """Check for fuzzy match between target and candidates"""
-        for candidate in candidates:
-            # Exact match
-            if target == candidate:
-                return True
-            # Similarity ratio
-            similarity = SequenceMatcher(None, target, candidate).ratio()
-            if similarity > 0.8:  # 80% similarity threshold
-                return True
-        return False
+        return matched / len(jd_keywords_lower)
     
     def _extract_years(self, text: str) -> int:
         """Extract years from text"""
@@ -1,85 +1,228 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import google.generativeai as genai
 import os
+import threading
+from .job_context import JobContext
+from .corpus_model import CorpusTfidfModel
+from .evaluation_context import EvaluationContext
+from .feedback_cache import FeedbackCache
+from .llm_dispatcher import CircuitOpenError, LLMDispatcher, ModelBackend
+try:
+    from app.utils.tokenizer import NgramAnalyzer, document_tokens, tokenize
+except ImportError:
+    from utils.tokenizer import NgramAnalyzer, document_tokens, tokenize
 
 class SemanticMatcher:
     """Perform semantic matching between resume and job description using TF-IDF"""
     
-    def __init__(self):
-        # Initialize TF-IDF vectorizer instead of sentence transformer
-        self.vectorizer = TfidfVectorizer(
-            max_features=5000,
-            stop_words='english',
-            ngram_range=(1, 2)
+    # Matching never mutates shared state, so one instance can serve concurrent requests:
+    # "auto" transforms with the corpus model when one is loaded and otherwise fits a
+    # request-local vectorizer per pair; "hashing" uses stateless hashed term frequencies
+    VECTORIZER_MODES = ("auto", "hashing")
+    
+    # LLM feedback: model, characters of each document sent, and the prompt (part of the feedback cache key)
+    FEEDBACK_MODEL = 'gemini-pro'
+    FEEDBACK_TEXT_LIMIT = 2000
+    FEEDBACK_PROMPT = """
+        As a resume expert, analyze the following resume against the job description.
+        Provide specific, actionable feedback to improve the candidate's chances.
+        
+        Job Description:
+        {jd_text}
+        
+        Resume:
+        {resume_text}
+        
+        Please provide:
+        1. A brief summary of the match quality (1-2 sentences)
+        2. Three specific suggestions for improvement
+        3. Any sections that are particularly strong
+        """
+    
+    def __init__(self, corpus_model_path: str = None, vectorizer_mode: str = None,
+                 feedback_cache: Optional[FeedbackCache] = None, llm_dispatcher: Optional[LLMDispatcher] = None):
+        self.vectorizer_mode = (vectorizer_mode or os.getenv('SEMANTIC_VECTORIZER', 'auto')).lower()
+        if self.vectorizer_mode not in self.VECTORIZER_MODES:
+            raise ValueError(f"Unknown vectorizer mode: {self.vectorizer_mode}")
+        
+        # Stateless vectorizer; transform() is safe to call from any thread. Every vectorizer
+        # here takes the parser's tokens and builds the same English-stop-word 1-2 grams
+        self.hashing_vectorizer = HashingVectorizer(
+            n_features=2 ** 18,
+            analyzer=NgramAnalyzer(),
+            alternate_sign=False,
+            norm='l2'
         )
         
+        # Corpus-fitted model used transform-only when available (see corpus_model.py)
+        self.corpus_model_path = corpus_model_path
+        self.corpus_model = CorpusTfidfModel.load(corpus_model_path)
+        
+        # Persistent cache of generated LLM feedback (None disables caching)
+        self.feedback_cache = feedback_cache
+        
+        # Shared, rate-limited LLM client; created on first use unless one is given
+        self.llm_dispatcher = llm_dispatcher
+        self._llm_lock = threading.Lock()
+        
         # Try to get Google API key from environment
         self.google_api_key = os.getenv('GOOGLE_API_KEY')
         if self.google_api_key:
             genai.configure(api_key=self.google_api_key)
     
-    def calculate_semantic_similarity(self, resume_data: Dict, jd_data: Dict) -> Dict[str, float]:
-        """Calculate semantic similarity between resume and job description using TF-IDF"""
+    def calculate_semantic_similarity(self, resume_data: Dict, jd_data,
+                                      context: Optional[EvaluationContext] = None) -> Dict[str, float]:
+        """Calculate semantic similarity between resume and job description using TF-IDF (once per context)"""
+        if context is not None:
+            return context.get(EvaluationContext.SEMANTIC_SIMILARITY,
+                               lambda: self.calculate_semantic_similarity(resume_data, jd_data))
+        
+        job = JobContext.ensure(jd_data)
+        # Resolve the vectorizer once so a concurrent model reload cannot mix two models in one result
+        fixed_vectorizer = self._get_fixed_vectorizer()
         
         # Get TF-IDF vectors for resume and job description
-        resume_vector, jd_vector = self._get_tfidf_vectors(resume_data, jd_data)
+        resume_vector, jd_vector = self._get_tfidf_vectors(resume_data, job, fixed_vectorizer)
         
         # Calculate cosine similarity
         similarity = cosine_similarity(resume_vector, jd_vector)[0][0]
         
         # Get section-wise similarities
-        section_similarities = self._get_section_similarities(resume_data, jd_data)
+        section_similarities = self._get_section_similarities(resume_data, job, fixed_vectorizer)
         
         return {
             "overall_similarity": float(similarity),
             "section_similarities": section_similarities
         }
     
-    def _get_tfidf_vectors(self, resume_data: Dict, jd_data: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    def calculate_semantic_similarity_batch(self, resumes: List[Dict], jd_data) -> List[Dict]:
+        """Calculate semantic similarity of many resumes against one job description in a few sparse products"""
+        job = JobContext.ensure(jd_data)
+        vectorizer = self._get_batch_vectorizer()
+        if not resumes:
+            return []
+        
+        # Overall similarity: vectorize every resume in one transform
+        jd_vector, jd_section_vector = job.get_fixed_vectors(vectorizer)
+        resume_matrix = vectorizer.transform([self._resume_terms(resume_data) for resume_data in resumes])
+        overall = cosine_similarity(resume_matrix, jd_vector).ravel()
+        
+        # Section similarities: every non-empty section of every resume in one transform
+        sections = ["experience", "skills", "education", "projects"]
+        section_keys = []
+        section_terms = []
+        for index, resume_data in enumerate(resumes):
+            resume_sections = resume_data.get("sections", {})
+            for section in sections:
+                resume_section = resume_sections.get(section, "")
+                if resume_section:
+                    section_keys.append((index, section))
+                    section_terms.append(self._resume_section_terms(resume_data, section))
+        
+        section_similarities = [{} for _ in resumes]
+        if section_terms:
+            try:
+                section_matrix = vectorizer.transform(section_terms)
+                section_scores = cosine_similarity(section_matrix, jd_section_vector).ravel()
+            except:
+                # If vectorizer fails, use a default value
+                section_scores = np.full(len(section_terms), 0.5)
+            for (index, section), score in zip(section_keys, section_scores):
+                section_similarities[index][section] = float(score)
+        
+        return [
+            {
+                "overall_similarity": float(overall[index]),
+                "section_similarities": section_similarities[index]
+            }
+            for index in range(len(resumes))
+        ]
+    
+    def reload_corpus_model(self) -> bool:
+        """Load the latest persisted corpus model and swap it in; returns whether a model is active"""
+        model = CorpusTfidfModel.load(self.corpus_model_path)
+        if model is not None:
+            self.corpus_model = model
+        return self.corpus_model is not None
+    
+    def _get_fixed_vectorizer(self):
+        """Return the vectorizer that needs no fitting for this mode, or None to fit per pair"""
+        if self.vectorizer_mode == "hashing":
+            return self.hashing_vectorizer
+        return self.corpus_model
+    
+    def _get_batch_vectorizer(self):
+        """Return the vectorizer for batches: the fixed one, or the hashing vectorizer when auto mode has no corpus model"""
+        # Fitting per pair cannot be batched, and a vectorizer fitted on the batch would make scores
+        # depend on which resumes share it, so batches fall back to the stateless hashing vectorizer
+        fixed_vectorizer = self._get_fixed_vectorizer()
+        return fixed_vectorizer if fixed_vectorizer is not None else self.hashing_vectorizer
+    
+    def _new_pair_vectorizer(self) -> TfidfVectorizer:
+        """Create a request-local TF-IDF vectorizer so concurrent requests never share a vocabulary"""
+        return TfidfVectorizer(
+            max_features=5000,
+            analyzer=NgramAnalyzer()
+        )
+    
+    def _get_tfidf_vectors(self, resume_data: Dict, job: JobContext,
+                           fixed_vectorizer=None) -> Tuple[np.ndarray, np.ndarray]:
         """Get TF-IDF vectors for resume and job description"""
-        resume_text = resume_data.get("text", "")
-        jd_text = jd_data.get("text", "")
-        
-        # Limit text length to prevent memory issues
-        if len(resume_text) > 5000:
-            resume_text = resume_text[:5000]
-        if len(jd_text) > 5000:
-            jd_text = jd_text[:5000]
+        # Terms of the first OVERALL_TEXT_LIMIT characters, to prevent memory issues
+        resume_terms = self._resume_terms(resume_data)
+        
+        if fixed_vectorizer is not None:
+            # Transform only; the job's vector is computed once per vectorizer
+            jd_vector, _ = job.get_fixed_vectors(fixed_vectorizer)
+            return fixed_vectorizer.transform([resume_terms]), jd_vector
             
         # Fit vectorizer and transform texts
-        texts = [resume_text, jd_text]
-        tfidf_matrix = self.vectorizer.fit_transform(texts)
+        documents = [resume_terms, job.overall_terms]
+        tfidf_matrix = self._new_pair_vectorizer().fit_transform(documents)
         
         return tfidf_matrix[0], tfidf_matrix[1]
     
-    def _get_section_similarities(self, resume_data: Dict, jd_data: Dict) -> Dict[str, float]:
+    def _resume_terms(self, resume_data: Dict) -> List[str]:
+        """Terms of the resume's first OVERALL_TEXT_LIMIT characters, from its shared tokens"""
+        return document_tokens(resume_data).terms_between(0, JobContext.OVERALL_TEXT_LIMIT)
+    
+    def _resume_section_terms(self, resume_data: Dict, section: str) -> List[str]:
+        """Terms of a section's first SECTION_TEXT_LIMIT characters, sliced from the resume's tokens by offset"""
+        ranges = resume_data.get("section_ranges", {}).get(section)
+        if ranges is None:
+            # Parsed without section offsets; tokenize the section text on its own
+            section_text = resume_data.get("sections", {}).get(section, "")
+            return tokenize(section_text).terms_between(0, JobContext.SECTION_TEXT_LIMIT)
+        return document_tokens(resume_data).terms_in(ranges, JobContext.SECTION_TEXT_LIMIT)
+    
+    def _get_section_similarities(self, resume_data: Dict, job: JobContext,
+                                  fixed_vectorizer=None) -> Dict[str, float]:
         """Calculate similarity for key sections"""
         similarities = {}
         
         sections = ["experience", "skills", "education", "projects"]
         
-        # Get job description vector once
-        jd_text = jd_data.get("text", "")
-        if len(jd_text) > 1000:
-            jd_text = jd_text[:1000]
-        jd_vector = self.vectorizer.fit_transform([jd_text])
+        if fixed_vectorizer is not None:
+            section_vectorizer = fixed_vectorizer
+            _, jd_vector = job.get_fixed_vectors(fixed_vectorizer)
+        else:
+            # The job description vector is fitted once per job and reused
+            section_vectorizer, jd_vector = job.get_section_representation()
         
         for section in sections:
             resume_section = resume_data.get("sections", {}).get(section, "")
             
             if resume_section:
-                # Limit section length
-                if len(resume_section) > 1000:
-                    resume_section = resume_section[:1000]
+                # Terms of the section's first SECTION_TEXT_LIMIT characters
+                section_terms = self._resume_section_terms(resume_data, section)
                 
                 if resume_section:
-                    # Transform both texts using the same vectorizer
+                    # Transform the section using the job's vectorizer
                     try:
-                        resume_vector = self.vectorizer.transform([resume_section])
-                        jd_vector = self.vectorizer.transform([jd_text])
+                        resume_vector = section_vectorizer.transform([section_terms])
                         similarity = cosine_similarity(resume_vector, jd_vector)[0][0]
                         similarities[section] = float(similarity)
                     except:
@@ -88,56 +231,122 @@ class SemanticMatcher:
         
         return similarities
     
-    def get_improved_feedback(self, resume_data: Dict, jd_data: Dict) -> str:
-        """Generate improved feedback using semantic understanding"""
+    def uses_llm_feedback(self) -> bool:
+        """Whether improved feedback comes from a (slow, remote) LLM rather than the rule-based generator"""
+        return bool(self.google_api_key)
+    
+    def get_improved_feedback(self, resume_data: Dict, jd_data, context: Optional[EvaluationContext] = None) -> str:
+        """Generate improved feedback using semantic understanding (reusing the context's results)"""
+        if context is not None:
+            return context.get(EvaluationContext.IMPROVED_FEEDBACK,
+                               lambda: self._generate_improved_feedback(resume_data, jd_data, context))
+        return self._generate_improved_feedback(resume_data, jd_data)
+    
+    def get_improved_feedback_batch(self, resumes: List[Dict], jd_data,
+                                    contexts: Optional[List[EvaluationContext]] = None) -> List[str]:
+        """Generate improved feedback for many resumes against one job, dispatching the LLM prompts together"""
+        contexts = contexts or [None] * len(resumes)
+        if not self.google_api_key:
+            return [self.get_improved_feedback(resume_data, jd_data, context)
+                    for resume_data, context in zip(resumes, contexts)]
+        
+        feedback = [None] * len(resumes)
+        requests = []
+        for index, resume_data in enumerate(resumes):
+            prompt, cache_key, cached = self._prepare_gemini_request(resume_data, jd_data)
+            if cached is not None:
+                feedback[index] = cached
+            else:
+                requests.append((index, prompt, cache_key))
+        
+        try:
+            answers = self._get_llm_dispatcher().generate_many([prompt for _, prompt, _ in requests])
+        except Exception as e:
+            print(f"Failed to generate Gemini feedback: {e}")
+            answers = [None] * len(requests)
+        
+        for (index, _, cache_key), answer in zip(requests, answers):
+            if answer is None:
+                # Fall back to rule-based feedback
+                feedback[index] = self._generate_rule_based_feedback(resumes[index], jd_data, contexts[index])
+            else:
+                self._cache_feedback(cache_key, answer)
+                feedback[index] = answer
+        return feedback
+    
+    def get_llm_stats(self) -> Optional[Dict]:
+        """LLM dispatcher counters and circuit breaker state, or None when no LLM is configured"""
+        if not self.google_api_key and self.llm_dispatcher is None:
+            return None
+        return self._get_llm_dispatcher().get_stats()
+    
+    def _generate_improved_feedback(self, resume_data: Dict, jd_data,
+                                    context: Optional[EvaluationContext] = None) -> str:
+        """Generate improved feedback with Gemini when configured, otherwise (or on failure) rule-based"""
         # If Google API key is available, use Gemini for feedback generation
         if self.google_api_key:
             try:
                 return self._generate_gemini_feedback(resume_data, jd_data)
+            except CircuitOpenError:
+                # Gemini is failing; answer at once instead of waiting on it
+                return self._generate_rule_based_feedback(resume_data, jd_data, context)
             except Exception as e:
                 print(f"Failed to generate Gemini feedback: {e}")
                 # Fall back to rule-based feedback
-                return self._generate_rule_based_feedback(resume_data, jd_data)
+                return self._generate_rule_based_feedback(resume_data, jd_data, context)
         else:
             # Use rule-based feedback generation
-            return self._generate_rule_based_feedback(resume_data, jd_data)
+            return self._generate_rule_based_feedback(resume_data, jd_data, context)
     
-    def _generate_gemini_feedback(self, resume_data: Dict, jd_data: Dict) -> str:
-        """Generate feedback using Google's Gemini"""
-        resume_text = resume_data.get("text", "")[:2000]  # Limit length
-        jd_text = jd_data.get("text", "")[:2000]  # Limit length
+    def _generate_gemini_feedback(self, resume_data: Dict, jd_data) -> str:
+        """Generate feedback using Google's Gemini, reusing cached feedback for an identical prompt"""
+        prompt, cache_key, cached = self._prepare_gemini_request(resume_data, jd_data)
+        if cached is not None:
+            return cached
         
-        prompt = f"""
-        As a resume expert, analyze the following resume against the job description.
-        Provide specific, actionable feedback to improve the candidate's chances.
+        # Use the Gemini model through the shared dispatcher
+        feedback = self._get_llm_dispatcher().generate(prompt)
         
-        Job Description:
-        {jd_text}
-        
-        Resume:
-        {resume_text}
-        
-        Please provide:
-        1. A brief summary of the match quality (1-2 sentences)
-        2. Three specific suggestions for improvement
-        3. Any sections that are particularly strong
-        """
-        
-        # Use the Gemini model
-        model = genai.GenerativeModel('gemini-pro')
-        response = model.generate_content(prompt)
+        self._cache_feedback(cache_key, feedback)
+        return feedback
+    
+    def _prepare_gemini_request(self, resume_data: Dict, jd_data) -> Tuple[str, Optional[str], Optional[str]]:
+        """Prompt for one resume, its feedback cache key, and its cached feedback if there is any"""
+        resume_text = resume_data.get("text", "")[:self.FEEDBACK_TEXT_LIMIT]  # Limit length
+        jd_text = jd_data.get("text", "")[:self.FEEDBACK_TEXT_LIMIT]  # Limit length
+        prompt = self.FEEDBACK_PROMPT.format(jd_text=jd_text, resume_text=resume_text)
         
-        return response.text.strip()
+        if self.feedback_cache is None:
+            return prompt, None, None
+        cache_key = FeedbackCache.make_key(resume_text, jd_text, self.FEEDBACK_PROMPT, self.FEEDBACK_MODEL)
+        return prompt, cache_key, self.feedback_cache.get(cache_key)
+    
+    def _cache_feedback(self, cache_key: Optional[str], feedback: str):
+        if cache_key is not None:
+            self.feedback_cache.put(cache_key, feedback, self.FEEDBACK_MODEL)
+    
+    def _get_llm_dispatcher(self) -> LLMDispatcher:
+        """Dispatcher for LLM feedback, wrapping one model client that every request reuses"""
+        if self.llm_dispatcher is None:
+            with self._llm_lock:
+                if self.llm_dispatcher is None:
+                    self.llm_dispatcher = LLMDispatcher(ModelBackend(self._get_feedback_model()))
+        return self.llm_dispatcher
+    
+    def _get_feedback_model(self):
+        """Model used for LLM feedback"""
+        return genai.GenerativeModel(self.FEEDBACK_MODEL)
     
-    def _generate_rule_based_feedback(self, resume_data: Dict, jd_data: Dict) -> str:
+    def _generate_rule_based_feedback(self, resume_data: Dict, jd_data,
+                                      context: Optional[EvaluationContext] = None) -> str:
         """Generate feedback using rule-based approach"""
         # This is a simplified implementation
         # In a real system, you would use an LLM to generate detailed feedback
         
         feedback = "Based on semantic analysis:\n"
         
-        # Get overall similarity
-        semantic_result = self.calculate_semantic_similarity(resume_data, jd_data)
+        # Get overall similarity (already computed for this evaluation when a context is given)
+        semantic_result = self.calculate_semantic_similarity(resume_data, jd_data, context)
         overall_sim = semantic_result["overall_similarity"]
         
         if overall_sim > 0.8:
@@ -0,0 +1,30 @@
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict
+import os
+
+# Distinct (target, candidate) pairs remembered per process; JD vocabularies repeat across postings
+FUZZY_CACHE_SIZE = int(os.getenv('FUZZY_CACHE_SIZE', 65536))
+
+@lru_cache(maxsize=FUZZY_CACHE_SIZE)
+def is_similar(target: str, candidate: str, threshold: float) -> bool:
+    """Whether SequenceMatcher(None, target, candidate).ratio() > threshold, memoized across evaluations"""
+    # ratio() is not symmetric, so the pair is cached in the order given
+    matcher = SequenceMatcher(None, target, candidate)
+    return matcher.quick_ratio() > threshold and matcher.ratio() > threshold
+
+def get_similarity_cache_stats() -> Dict:
+    """Hit/miss counters and size of this process's pair similarity cache"""
+    info = is_similar.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+        "entries": info.currsize,
+        "max_entries": info.maxsize
+    }
+
+def clear_similarity_cache():
+    """Forget every cached pair and reset the counters"""
+    is_similar.cache_clear()
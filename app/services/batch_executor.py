@@ -0,0 +1,260 @@
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Union
+import os
+import time
+
+try:
+    from app.parser.resume_parser import ResumeParser, ResumeUpload, resume_source_name
+    from app.parser.parse_cache import ParseCache
+    from app.scoring.relevance_scorer import RelevanceScorer
+    from app.scoring.semantic_matcher import SemanticMatcher
+    from app.scoring.pipeline import score_resume
+except ImportError:
+    from parser.resume_parser import ResumeParser, ResumeUpload, resume_source_name
+    from parser.parse_cache import ParseCache
+    from scoring.relevance_scorer import RelevanceScorer
+    from scoring.semantic_matcher import SemanticMatcher
+    from scoring.pipeline import score_resume
+
+# Per-process state created once by the pool initializer
+_worker_state = {}
+
+def _init_worker(job_context, parse_cache_path=None, defer_feedback=False):
+    """Create parsers and scorers once per worker process"""
+    # Workers share the persistent parse cache; memory tiers and counters are per process
+    cache = ParseCache(parse_cache_path) if parse_cache_path else None
+    # The batch is already spread over processes, so pages are not split further
+    _worker_state["resume_parser"] = ResumeParser(cache=cache, page_workers=1)
+    _worker_state["relevance_scorer"] = RelevanceScorer()
+    _worker_state["semantic_matcher"] = SemanticMatcher()
+    _worker_state["job_context"] = job_context
+    # LLM feedback is then left pending and generated by the parent process, whose single dispatcher
+    # holds the whole rate and concurrency budget
+    _worker_state["defer_feedback"] = defer_feedback
+
+def _evaluate_chunk(resume_paths: List[Union[str, ResumeUpload]]) -> List[Dict]:
+    """Parse and score a chunk of resumes inside a worker process"""
+    results = [None] * len(resume_paths)
+    parsed = []
+    for index, resume_path in enumerate(resume_paths):
+        try:
+            parsed.append((index, _worker_state["resume_parser"].parse_source(resume_path)))
+        except Exception as e:
+            results[index] = {
+                "resume_filename": resume_source_name(resume_path),
+                "error": str(e)
+            }
+
+    # Semantic similarity for the whole chunk in one batched computation
+    job_context = _worker_state["job_context"]
+    try:
+        semantic_results = _worker_state["semantic_matcher"].calculate_semantic_similarity_batch(
+            [resume_data for _, resume_data in parsed], job_context
+        )
+    except Exception as e:
+        print(f"Batched semantic similarity failed, scoring resumes one by one: {e}")
+        semantic_results = [None] * len(parsed)
+
+    for (index, resume_data), semantic_result in zip(parsed, semantic_results):
+        try:
+            results[index] = score_resume(
+                resume_data,
+                resume_source_name(resume_paths[index]),
+                job_context,
+                _worker_state["relevance_scorer"],
+                _worker_state["semantic_matcher"],
+                semantic_result,
+                defer_feedback=_worker_state["defer_feedback"]
+            )
+        except Exception as e:
+            results[index] = {
+                "resume_filename": resume_source_name(resume_paths[index]),
+                "error": str(e)
+            }
+    return results
+
+class _ChunkRun:
+    """One chunk's place in a parallel batch: its current future and deadline, and its results once known"""
+
+    __slots__ = ("chunk", "future", "deadline", "retry", "results")
+
+    def __init__(self, chunk: List[Union[str, ResumeUpload]]):
+        self.chunk = chunk
+        self.future = None
+        self.deadline = None
+        # Already lost once with a crashed worker; it is rerun alone, and a second crash is reported
+        self.retry = False
+        self.results = None
+
+class ParallelBatchExecutor:
+    """Evaluate a batch of resumes on a process pool, returning results in input order"""
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 1, item_timeout: Optional[float] = None,
+                 parse_cache_path: Optional[str] = None, defer_feedback: bool = False):
+        # One process per CPU at most
+        self.workers = max(1, min(workers or os.cpu_count() or 1, os.cpu_count() or 1))
+        self.chunk_size = max(1, chunk_size)
+        # Seconds allowed per resume; a chunk gets item_timeout * len(chunk), counted from its submission
+        self.item_timeout = item_timeout
+        self.parse_cache_path = parse_cache_path
+        # Leave improved feedback pending for the caller to generate
+        self.defer_feedback = defer_feedback
+
+    def run(self, resume_paths: List[Union[str, ResumeUpload]], job_context) -> List[Dict]:
+        """Score every resume against the job context (results are not saved)"""
+        return list(self.iter_run(resume_paths, job_context))
+
+    def iter_run(self, resume_paths: List[Union[str, ResumeUpload]], job_context) -> Iterator[Dict]:
+        """Score every resume against the job context, yielding results in input order"""
+        chunks = deque(resume_paths[i:i + self.chunk_size] for i in range(0, len(resume_paths), self.chunk_size))
+        if not chunks:
+            return
+
+        workers = min(self.workers, len(chunks))
+        print(f"Evaluating {len(resume_paths)} resumes on {workers} worker processes (chunk size {self.chunk_size})")
+
+        executor = self._new_pool(workers, job_context)
+        try:
+            # Chunk runs in submission order, so results line up with resume_paths
+            pending = deque()
+            while pending or chunks:
+                executor = self._submit_ready(executor, workers, job_context, pending, chunks)
+                executor = self._collect(executor, workers, job_context, pending)
+                while pending and pending[0].results is not None:
+                    for result in pending.popleft().results:
+                        yield result
+                running = [run.future for run in pending if run.future is not None and not run.future.done()]
+                if running:
+                    # Wake on any completion so a freed worker gets its next chunk at once
+                    wait(running, timeout=self._next_timeout(pending), return_when=FIRST_COMPLETED)
+        finally:
+            # Do not leave stuck (or, if the caller stopped early, busy) workers running
+            self._terminate_pool(executor)
+
+    def _submit_ready(self, executor: ProcessPoolExecutor, workers: int, job_context, pending: deque,
+                      chunks: deque) -> ProcessPoolExecutor:
+        """Submit chunks while workers are free; chunks lost with a crashed worker rerun one at a time"""
+        running = sum(1 for run in pending if run.future is not None and not run.future.done())
+        suspects = [run for run in pending if run.results is None and run.future is None]
+        if suspects:
+            # Alone in the pool, a chunk that crashes it again is known to be the cause
+            if not running and not self._submit(executor, suspects[0]):
+                executor = self._replace_broken_pool(executor, workers, job_context, pending)
+            return executor
+
+        # Submit a chunk only when a worker is free (its deadline runs from submission) and hold at most
+        # two chunks per worker so memory does not grow with the batch
+        while chunks and running < workers and len(pending) < workers * 2:
+            run = _ChunkRun(chunks.popleft())
+            pending.append(run)
+            if not self._submit(executor, run):
+                return self._replace_broken_pool(executor, workers, job_context, pending)
+            running += 1
+        return executor
+
+    def _collect(self, executor: ProcessPoolExecutor, workers: int, job_context, pending: deque) -> ProcessPoolExecutor:
+        """Take the results of finished chunks, replacing the pool if a worker died or a chunk overran"""
+        broken = False
+        for run in pending:
+            if run.results is None and run.future is not None and run.future.done():
+                if self._is_lost(run.future):
+                    broken = True
+                else:
+                    run.results = self._future_results(run)
+        if broken:
+            return self._replace_broken_pool(executor, workers, job_context, pending)
+
+        now = time.monotonic()
+        expired = [run for run in pending if run.results is None and run.future is not None
+                   and not run.future.done() and run.deadline is not None and run.deadline <= now]
+        if expired:
+            for run in expired:
+                limit = self.item_timeout * len(run.chunk)
+                run.results = self._chunk_errors(run.chunk, f"Evaluation timed out after {limit:.0f} seconds")
+            # A stuck worker cannot be interrupted: kill the pool and rerun the other unfinished chunks
+            executor = self._recycle_pool(executor, workers, job_context, pending)
+        return executor
+
+    def _new_pool(self, workers: int, job_context) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(job_context, self.parse_cache_path, self.defer_feedback)
+        )
+
+    def _submit(self, executor: ProcessPoolExecutor, run: "_ChunkRun") -> bool:
+        """Submit a chunk with a deadline counted from now; False if the pool has already broken"""
+        try:
+            run.future = executor.submit(_evaluate_chunk, run.chunk)
+        except BrokenProcessPool:
+            run.future = None
+            return False
+        run.deadline = self._deadline(run.chunk)
+        return True
+
+    def _deadline(self, chunk: List[Union[str, ResumeUpload]]) -> Optional[float]:
+        """Monotonic time by which a chunk submitted now must finish (item_timeout per resume)"""
+        return time.monotonic() + self.item_timeout * len(chunk) if self.item_timeout else None
+
+    def _next_timeout(self, pending: deque) -> Optional[float]:
+        """Seconds until the earliest deadline of a running chunk (None if none has one)"""
+        deadlines = [run.deadline for run in pending
+                     if run.results is None and run.future is not None and run.deadline is not None]
+        return max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+
+    def _replace_broken_pool(self, executor: ProcessPoolExecutor, workers: int, job_context,
+                             pending: deque) -> ProcessPoolExecutor:
+        """A worker died and broke the pool: chunks lost with it are retried once on their own, then reported"""
+        self._terminate_pool(executor)
+        for run in pending:
+            if run.results is not None or run.future is None:
+                continue
+            if not self._is_lost(run.future):
+                # Finished before the crash
+                run.results = self._future_results(run)
+            elif run.retry:
+                run.results = self._chunk_errors(run.chunk, "Worker process crashed while evaluating this resume")
+            else:
+                run.retry = True
+                run.future = None
+        return self._new_pool(workers, job_context)
+
+    def _recycle_pool(self, executor: ProcessPoolExecutor, workers: int, job_context, pending: deque) -> ProcessPoolExecutor:
+        """Replace a pool with a stuck worker, resubmitting the pending chunks that had not finished"""
+        self._terminate_pool(executor)
+        executor = self._new_pool(workers, job_context)
+        for run in pending:
+            if run.results is None and run.future is not None:
+                if self._is_lost(run.future):
+                    self._submit(executor, run)
+                else:
+                    run.results = self._future_results(run)
+        return executor
+
+    def _is_lost(self, future: Future) -> bool:
+        """Whether a chunk's future went down with its pool rather than finishing"""
+        return future.cancelled() or not future.done() or isinstance(future.exception(), BrokenProcessPool)
+
+    def _future_results(self, run: "_ChunkRun") -> List[Dict]:
+        """Results of a finished chunk, or error results for all of its resumes if it raised"""
+        error = run.future.exception()
+        if error is not None:
+            return self._chunk_errors(run.chunk, str(error) or type(error).__name__)
+        return run.future.result()
+
+    def _terminate_pool(self, executor: ProcessPoolExecutor):
+        """Shut a pool down without waiting, killing worker processes that are still running"""
+        # ProcessPoolExecutor cannot interrupt a running call; terminating its processes is the only way
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=5)
+
+    def _chunk_errors(self, chunk: List[Union[str, ResumeUpload]], message: str) -> List[Dict]:
+        """Build error results for every resume in a failed chunk"""
+        return [{"resume_filename": resume_source_name(path), "error": message} for path in chunk]
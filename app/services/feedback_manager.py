@@ -0,0 +1,53 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+import os
+import socket
+import threading
+import traceback
+import uuid
+
+class FeedbackManager:
+    """Generate improved feedback in the background and write it into each evaluation's row"""
+
+    def __init__(self, semantic_matcher, database, workers: int = 2):
+        self.semantic_matcher = semantic_matcher
+        self.database = database
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="feedback")
+        self._active = set()
+        self._lock = threading.Lock()
+        # Rows are claimed in the database under this owner, so processes sharing it never generate one twice
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def submit(self, evaluation_id: int, resume_data: Dict, jd_data, context=None) -> Optional[Future]:
+        """Queue feedback generation for a saved evaluation; returns at once (None if already queued)"""
+        with self._lock:
+            if evaluation_id in self._active:
+                return None
+            self._active.add(evaluation_id)
+        return self.executor.submit(self._generate, evaluation_id, resume_data, jd_data, context)
+
+    def pending_count(self) -> int:
+        """Number of evaluations whose feedback is queued or being generated"""
+        with self._lock:
+            return len(self._active)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work, optionally waiting for queued feedback to be written"""
+        self.executor.shutdown(wait=wait)
+
+    def _generate(self, evaluation_id: int, resume_data: Dict, jd_data, context):
+        """Generate one evaluation's feedback and store it with its final status"""
+        try:
+            if not self.database.claim_feedback(evaluation_id, self.owner):
+                # Another process is generating it (or it is no longer pending)
+                return
+            # Falls back to rule-based feedback itself when the LLM call fails
+            feedback = self.semantic_matcher.get_improved_feedback(resume_data, jd_data, context)
+            self.database.update_improved_feedback(evaluation_id, feedback, "ready")
+        except Exception as e:
+            print(f"Feedback generation for evaluation {evaluation_id} failed: {e}")
+            traceback.print_exc()
+            self.database.update_improved_feedback(evaluation_id, "", "failed")
+        finally:
+            with self._lock:
+                self._active.discard(evaluation_id)
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import os
+import shutil
+import socket
+import threading
+import traceback
+import uuid
+
+# Large text fields are kept in the evaluations table, not in job results
+_RESULT_EXCLUDED_FIELDS = ("resume_text", "jd_text")
+
+class BatchJobManager:
+    """Run batch evaluations in the background and track their progress in a BatchJobStore"""
+
+    def __init__(self, evaluator, job_store, workers: int = 2, item_timeout: Optional[float] = None):
+        self.evaluator = evaluator
+        self.job_store = job_store
+        # Per-resume timeout for jobs that run on a process pool
+        self.item_timeout = item_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch-job")
+        # Jobs are claimed in the store under this owner, so processes sharing the database never run one twice
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._active_jobs = set()
+        self._lock = threading.Lock()
+
+    def submit(self, jd_path: str, resume_paths: List[str], send_emails: bool = False,
+               job_dir: str = None, job_id: str = None, workers: int = 1, chunk_size: int = 1) -> str:
+        """Record a new job and queue it for processing; returns the job ID immediately"""
+        job_id = self.job_store.create_job(jd_path, resume_paths, send_emails, job_dir, job_id,
+                                           workers, chunk_size)
+        self._schedule(job_id)
+        return job_id
+
+    def resume_unfinished_jobs(self) -> List[str]:
+        """Re-queue jobs that are queued, or were running in a process whose lease has expired"""
+        job_ids = self.job_store.get_unfinished_job_ids()
+        for job_id in job_ids:
+            print(f"Resuming batch job {job_id}")
+            self._schedule(job_id)
+        return job_ids
+
+    def get_job(self, job_id: str, include_results: bool = True) -> Optional[Dict]:
+        """Get job status, progress and the results available so far"""
+        return self.job_store.get_job(job_id, include_results)
+
+    def _schedule(self, job_id: str):
+        """Queue a job unless it is already queued in this process (it runs only if claimed)"""
+        with self._lock:
+            if job_id in self._active_jobs:
+                return
+            self._active_jobs.add(job_id)
+        self.executor.submit(self._run_job, job_id)
+
+    def _run_job(self, job_id: str):
+        """Process every pending resume of a job, recording each result as it completes"""
+        try:
+            job_files = self.job_store.get_job_files(job_id)
+            if job_files is None:
+                return
+            # Another live process may have claimed the job first
+            if not self.job_store.claim_job(job_id, self.owner):
+                print(f"Batch job {job_id} is being run by another process")
+                return
+
+            job_context = self.evaluator.prepare_job(job_files["jd_path"])
+
+            # Only pending items are processed, so a resumed job skips finished resumes. Results come back
+            # in item order, serially or from a process pool, and each is recorded as it arrives
+            items = self.job_store.get_pending_items(job_id)
+            results = self.evaluator.iter_batch_evaluate(
+                [item["resume_path"] for item in items],
+                job_context=job_context,
+                workers=job_files["workers"],
+                chunk_size=job_files["chunk_size"],
+                item_timeout=self.item_timeout
+            )
+            try:
+                for item, result in zip(items, results):
+                    if not self.job_store.renew_claim(job_id, self.owner):
+                        # The lease expired and another process took the job over
+                        print(f"Batch job {job_id} was taken over by another process")
+                        return
+                    stored = {k: v for k, v in result.items() if k not in _RESULT_EXCLUDED_FIELDS}
+                    self.job_store.record_item_result(job_id, item["position"], stored)
+            finally:
+                # Stops the process pool if the job ends early
+                results.close()
+
+            if job_files["send_emails"] and self.evaluator.email_service.is_configured():
+                print(f"Sending feedback emails for batch job {job_id}...")
+                evaluations = [
+                    self.evaluator.get_evaluation(r["evaluation_id"])
+                    for r in self.job_store.get_job_results(job_id) if r.get("evaluation_id")
+                ]
+                self.evaluator.email_service.send_batch_feedback_emails([e for e in evaluations if e])
+
+            self.job_store.set_job_status(job_id, "completed")
+        except Exception as e:
+            print(f"Batch job {job_id} failed: {e}")
+            traceback.print_exc()
+            self.job_store.set_job_status(job_id, "failed", str(e))
+        else:
+            # Files of failed jobs are kept so the job can be inspected or retried
+            self._cleanup(job_files["job_dir"])
+        finally:
+            with self._lock:
+                self._active_jobs.discard(job_id)
+
+    def _cleanup(self, job_dir: Optional[str]):
+        """Remove the uploaded files of a finished job"""
+        if job_dir and os.path.isdir(job_dir):
+            try:
+                shutil.rmtree(job_dir)
+                print(f"Cleaned up batch job directory: {job_dir}")
+            except Exception as e:
+                print(f"Failed to clean up batch job directory {job_dir}: {e}")
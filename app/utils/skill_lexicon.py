@@ -0,0 +1,190 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills.json')
+SKILL_LEXICON_PATH = os.getenv('SKILL_LEXICON_PATH', DEFAULT_LEXICON_PATH)
+
+# Characters that continue a term on either side: "c" must not match inside "c++" or "etc"
+WORD_CHARS = frozenset('+#_')
+
+# Context terms ("C", "R") touching one of these are part of an abbreviation or label: "R&D", "D.C.", "C-suite"
+CONTEXT_JOINERS = frozenset("&.-'")
+# Punctuation that separates the items of a skills list, before and after a context term
+LIST_BEFORE = frozenset(',;/|:([•·*-–')
+LIST_AFTER = frozenset(',;/|)]')
+# Words that mark a context term as a language name when they appear on its line nearby
+CONTEXT_WORDS = ("language", "programming")
+CONTEXT_WINDOW = 40
+
+class SkillLexicon:
+    """Skill names and synonyms compiled into an Aho-Corasick automaton that finds them all in one pass"""
+
+    def __init__(self, entries: Iterable[Dict], version: str = ""):
+        self.version = version
+        # Skill ID -> canonical name; an ID is the entry's position in the lexicon
+        self.names = []
+        # Normalised term (any case) -> skill ID, for looking up a whole phrase
+        self.terms = {}
+
+        # Automaton: goto transitions, failure links and (term length, skill ID, exact-case term,
+        # needs context) outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for entry in entries:
+            skill_id = len(self.names)
+            self.names.append(entry["name"])
+            case_sensitive = set(entry.get("case_sensitive", []))
+            needs_context = set(entry.get("needs_context", []))
+            for term in [entry["name"]] + list(entry.get("aliases", [])):
+                term = self._normalize(term)
+                if not term:
+                    continue
+                self.terms.setdefault(term.lower(), skill_id)
+                self._add(term, skill_id, term if term in case_sensitive else None, term in needs_context)
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillLexicon":
+        """Load a lexicon from a JSON file of {"name", "aliases", "case_sensitive", "needs_context"} entries"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        entries = json.loads(data.decode('utf-8'))
+        return cls(entries, hashlib.sha256(data).hexdigest()[:12])
+
+    def find(self, text: str) -> List[Tuple[int, int, int]]:
+        """(start, end, skill ID) of each skill mention in text, longest first where mentions overlap"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two; keep offsets aligned with the original text
+            lowered = "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+        matches = []
+        # Original offset of every character fed to the automaton; whitespace runs are fed as one space
+        positions = []
+        state = 0
+        previous_space = True
+        for index, char in enumerate(lowered):
+            if char.isspace():
+                if previous_space:
+                    continue
+                char = ' '
+                previous_space = True
+            else:
+                previous_space = False
+            positions.append(index)
+
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for length, skill_id, exact, needs_context in self._output[state]:
+                start = positions[len(positions) - length]
+                end = index + 1
+                if (self._is_bounded(text, start, end)
+                        and (exact is None or self._matches_case(text, start, end, exact))
+                        and (not needs_context or self._has_context(text, start, end))):
+                    matches.append((start, end, skill_id))
+
+        # "Node.js" also contains the alias "js"; keep only the leftmost-longest mentions
+        selected = []
+        last_end = 0
+        for start, end, skill_id in sorted(matches, key=lambda match: (match[0], -match[1])):
+            if start >= last_end:
+                selected.append((start, end, skill_id))
+                last_end = end
+        return selected
+
+    def skill_ids(self, text: str) -> List[int]:
+        """IDs of the skills mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(skill_id for _, _, skill_id in self.find(text)))
+
+    def skills(self, text: str) -> List[str]:
+        """Canonical names of the skills mentioned in text, in order of first mention"""
+        return [self.names[skill_id] for skill_id in self.skill_ids(text)]
+
+    def lookup(self, phrase: str) -> Optional[int]:
+        """ID of the skill a whole phrase names ("Postgres" -> PostgreSQL), or None"""
+        return self.terms.get(self._normalize(phrase).lower())
+
+    def _add(self, term: str, skill_id: int, exact: Optional[str], needs_context: bool = False):
+        """Insert one term into the trie (lowercased; exact keeps the capitalization it must have)"""
+        state = 0
+        for char in term.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(term), skill_id, exact, needs_context))
+
+    def _build_failure_links(self):
+        """Breadth-first failure links; each state also reports the terms its failure chain ends in"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] = self._output[next_state] + self._output[fail]
+
+    def _normalize(self, term: str) -> str:
+        """Collapse whitespace, as find() does for the text it scans"""
+        return " ".join(term.split())
+
+    def _is_bounded(self, text: str, start: int, end: int) -> bool:
+        """Whether a match is a whole term rather than part of a longer word"""
+        if start > 0 and self._is_word_char(text[start]) and self._is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and self._is_word_char(text[end - 1]) and self._is_word_char(text[end]):
+            return False
+        return True
+
+    def _is_word_char(self, char: str) -> bool:
+        return char.isalnum() or char in WORD_CHARS
+
+    def _matches_case(self, text: str, start: int, end: int, exact: str) -> bool:
+        """Case-sensitive terms ("Go", "R") only match with their own capitalization"""
+        return self._normalize(text[start:end]) == exact
+
+    def _has_context(self, text: str, start: int, end: int) -> bool:
+        """Whether a context term such as C or R reads as a skill: a skills-list item, or near a language word"""
+        if (start > 0 and text[start - 1] in CONTEXT_JOINERS) or (end < len(text) and text[end] in CONTEXT_JOINERS):
+            return False
+
+        line_start = text.rfind('\n', 0, start) + 1
+        line_end = text.find('\n', end)
+        if line_end == -1:
+            line_end = len(text)
+        before = text[line_start:start].rstrip()
+        after = text[end:line_end].lstrip()
+        # Listed on its own line or between separators: "Languages: C, Python", "- C"
+        if (not before or before[-1] in LIST_BEFORE) and (not after or after[0] in LIST_AFTER):
+            return True
+
+        nearby = text[max(line_start, start - CONTEXT_WINDOW):min(line_end, end + CONTEXT_WINDOW)].lower()
+        return any(word in nearby for word in CONTEXT_WORDS)
+
+_default_lexicon = None
+_default_lexicon_lock = threading.Lock()
+
+def get_skill_lexicon() -> SkillLexicon:
+    """The lexicon at SKILL_LEXICON_PATH, compiled once per process"""
+    global _default_lexicon
+    if _default_lexicon is None:
+        with _default_lexicon_lock:
+            if _default_lexicon is None:
+                _default_lexicon = SkillLexicon.from_file(SKILL_LEXICON_PATH)
+    return _default_lexicon
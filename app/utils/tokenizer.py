@@ -0,0 +1,117 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+import re
+import sys
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# scikit-learn's default token pattern, so vectorizers see the terms they always have
+TOKEN_PATTERN = re.compile(r'(?u)\b\w\w+\b')
+
+class TokenizedText:
+    """A document tokenized once: its distinct terms, and the term ID and offsets of every token"""
+
+    __slots__ = ("terms", "term_ids", "starts", "ends", "_counts")
+
+    def __init__(self, text: str):
+        # Distinct lowercased terms in order of first occurrence; a term's ID is its index
+        self.terms = []
+        self.term_ids = array('I')
+        self.starts = array('I')
+        self.ends = array('I')
+        self._counts = None
+
+        ids = {}
+        for match in TOKEN_PATTERN.finditer(text):
+            # Interned, so a term shared by many documents is stored once
+            term = sys.intern(match.group(0).lower())
+            term_id = ids.get(term)
+            if term_id is None:
+                term_id = ids[term] = len(self.terms)
+                self.terms.append(term)
+            self.term_ids.append(term_id)
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+
+    def __len__(self) -> int:
+        return len(self.term_ids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TokenizedText):
+            return NotImplemented
+        return (self.terms, self.term_ids, self.starts, self.ends) == (other.terms, other.term_ids,
+                                                                       other.starts, other.ends)
+
+    def __getstate__(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    def __setstate__(self, state: Dict):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    def counts(self) -> Dict[str, int]:
+        """Term -> number of occurrences"""
+        if self._counts is None:
+            self._counts = {self.terms[term_id]: count for term_id, count in Counter(self.term_ids).items()}
+        return self._counts
+
+    def terms_between(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Terms of the tokens lying entirely within text[start:end], in order"""
+        first = bisect_left(self.starts, start)
+        last = len(self.ends) if end is None else bisect_right(self.ends, end)
+        terms = self.terms
+        return [terms[term_id] for term_id in self.term_ids[first:max(first, last)]]
+
+    def terms_in(self, ranges: Iterable[Sequence[int]], limit: int, separator_length: int = 2) -> List[str]:
+        """Terms within the first limit characters of text ranges joined by separators (a materialized section)"""
+        terms = []
+        remaining = limit
+        for start, end in ranges:
+            if remaining <= 0:
+                break
+            terms.extend(self.terms_between(start, min(end, start + remaining)))
+            remaining -= (end - start) + separator_length
+        return terms
+
+    def words(self, min_length: int = 3) -> List[str]:
+        """Distinct purely alphabetic (ASCII) terms, as the parsers' [A-Za-z]{3,} keyword pattern found them"""
+        return [term for term in self.terms if len(term) >= min_length and term.isascii() and term.isalpha()]
+
+def tokenize(text: str) -> TokenizedText:
+    """Tokenize a document once"""
+    return TokenizedText(text or "")
+
+def document_tokens(document: Dict) -> TokenizedText:
+    """Tokens of a parsed resume or job description, tokenizing and caching them on it if needed"""
+    tokens = document.get("tokens")
+    if tokens is None:
+        tokens = document["tokens"] = tokenize(document.get("text", ""))
+    return tokens
+
+class NgramAnalyzer:
+    """Vectorizer analyzer over already tokenized terms, equivalent to scikit-learn's word n-grams"""
+
+    # Picklable (unlike a closure), so fitted vectorizers can still be sent to worker processes
+
+    def __init__(self, stop_words: Optional[FrozenSet[str]] = ENGLISH_STOP_WORDS,
+                 ngram_range: Tuple[int, int] = (1, 2)):
+        self.stop_words = frozenset(stop_words or ())
+        self.ngram_range = tuple(ngram_range)
+
+    @classmethod
+    def like(cls, vectorizer) -> "NgramAnalyzer":
+        """The analyzer matching a vectorizer configured with analyzer='word'"""
+        return cls(vectorizer.get_stop_words(), vectorizer.ngram_range)
+
+    def __call__(self, document: Union[str, Sequence[str]]) -> List[str]:
+        terms = tokenize(document).terms_between() if isinstance(document, str) else document
+        if self.stop_words:
+            terms = [term for term in terms if term not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        ngrams = list(terms) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n, len(terms)) + 1):
+            ngrams.extend(" ".join(terms[i:i + n]) for i in range(len(terms) - n + 1))
+        return ngrams
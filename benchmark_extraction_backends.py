@@ -0,0 +1,37 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLE_FILES = [
+    os.path.join(BASE_DIR, 'samples', 'Resume - 4 - Copy.pdf'),
+    os.path.join(BASE_DIR, 'sample_resume.docx'),
+]
+
+def benchmark_extraction_backends(repeats=20):
+    print("=== Benchmarking Text Extraction Backends ===")
+
+    for path in SAMPLE_FILES:
+        with open(path, 'rb') as f:
+            data = f.read()
+        parser = ResumeParser()
+        file_format = parser._file_format(path)
+        print(f"{os.path.basename(path)} ({len(data) / 1024:.0f} KB)")
+
+        texts = {}
+        for name in ResumeParser.EXTRACTION_BACKENDS[file_format]:
+            parser = ResumeParser(**{f"{file_format}_backend": name})
+            start = time.perf_counter()
+            for _ in range(repeats):
+                texts[name] = parser._extract_text(data, file_format)
+            elapsed = (time.perf_counter() - start) / repeats
+            print(f"  {name:<11} {elapsed * 1000:8.2f} ms/file {1 / elapsed:8.1f} files/s ({len(texts[name])} chars)")
+
+        fast, thorough = texts.values()
+        print(f"  Identical text: {fast == thorough}")
+
+if __name__ == "__main__":
+    benchmark_extraction_backends()
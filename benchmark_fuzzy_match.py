@@ -0,0 +1,74 @@
+import sys
+import os
+import random
+import time
+from difflib import SequenceMatcher
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.fuzzy_index import FuzzyIndex
+from scoring.similarity_cache import clear_similarity_cache, get_similarity_cache_stats
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def build_vocabulary(words, size, rng):
+    """Pad a word list with misspelled variants up to the requested size"""
+    vocabulary = list(dict.fromkeys(words))
+    while len(vocabulary) < size:
+        word = list(rng.choice(words))
+        pos = rng.randrange(len(word))
+        word[pos] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        vocabulary.append("".join(word) + rng.choice(["", "s", "ing", "ed", "er"]))
+    return vocabulary[:size]
+
+def linear_match(target, candidates, threshold=0.8):
+    """The matcher FuzzyIndex replaced: a SequenceMatcher ratio against every candidate"""
+    if target in candidates:
+        return True
+    return any(SequenceMatcher(None, target, c).ratio() > threshold for c in candidates)
+
+def benchmark_fuzzy_match(resume_size=300, jd_size=200, repeats=5):
+    print("=== Benchmarking Fuzzy Skill Matching ===")
+    rng = random.Random(7)
+
+    resume_words = ResumeParser().parse_from_text(read_sample('sample_resume.txt'))["keywords"]
+    jd_words = JdParser().parse(read_sample('sample_jd.txt') + read_sample('sample_jd_2.txt'))["keywords"]
+    resume_keywords = build_vocabulary(sorted(resume_words), resume_size, rng)
+    jd_keywords = build_vocabulary(sorted(jd_words), jd_size, rng)
+    print(f"{len(resume_keywords)} resume keywords x {len(jd_keywords)} JD keywords")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        linear = [linear_match(keyword, resume_keywords) for keyword in jd_keywords]
+    linear_time = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        clear_similarity_cache()
+        # Building the index is part of every evaluation, so it is timed too
+        index = FuzzyIndex(resume_keywords)
+        indexed = [index.has_match(keyword) for keyword in jd_keywords]
+    indexed_time = (time.perf_counter() - start) / repeats
+
+    # Repeated evaluations over the same vocabulary find their pairs already in the cache
+    start = time.perf_counter()
+    for _ in range(repeats):
+        index = FuzzyIndex(resume_keywords)
+        cached = [index.has_match(keyword) for keyword in jd_keywords]
+    cached_time = (time.perf_counter() - start) / repeats
+
+    assert linear == indexed == cached, "Indexed matcher disagrees with the linear scan"
+    print(f"Matched {sum(indexed)}/{len(jd_keywords)} JD keywords")
+    print(f"Linear SequenceMatcher scan: {linear_time * 1000:.1f} ms per evaluation")
+    print(f"Indexed matcher:             {indexed_time * 1000:.1f} ms per evaluation")
+    print(f"Indexed, warm pair cache:    {cached_time * 1000:.1f} ms per evaluation")
+    print(f"Pair cache: {get_similarity_cache_stats()}")
+    print(f"Speedup: {linear_time / indexed_time:.1f}x cold, {linear_time / cached_time:.1f}x warm")
+
+if __name__ == "__main__":
+    benchmark_fuzzy_match()
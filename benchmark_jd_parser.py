@@ -0,0 +1,64 @@
+import sys
+import os
+import re
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.jd_parser import JdParser
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+# The requirement patterns JdParser used before segment-then-classify, for comparison
+LEGACY_PATTERNS = [
+    r"(?:must|should|required|necessary|essential).*?(?:have|possess|know|understand).*?:?\s*([^.]+)",
+    r"(?:requirements|skills required|mandatory).*?:?\s*([^.]+)",
+    r"(?:experience|proficiency|expertise).*?(?:in|with|of).*?:?\s*([^.]+)",
+    r"(?:nice|good|prefer|advantage).*?(?:to have|if).*?:?\s*([^.]+)",
+    r"(?:preferred|bonus|extra|nice to have).*?:?\s*([^.]+)",
+    r"(?:optional|desirable).*?:?\s*([^.]+)",
+    r"(?:degree|bachelor|master|phd|qualification).*?:?\s*([^.]+)",
+    r"(?:education|educational).*?:?\s*([^.]+)",
+    r"(?:academic).*?:?\s*([^.]+)",
+    r"(\d+\+?\s*(?:years?|yrs?)\s*(?:experience|exp))",
+]
+
+def legacy_extract(text):
+    for pattern in LEGACY_PATTERNS:
+        re.findall(pattern, text, re.IGNORECASE)
+
+def new_extract(text):
+    parser = JdParser()
+    parser._extract_requirements(text)
+    parser._extract_experience(text)
+
+def adversarial_jds(size):
+    """JDs built to make lazy cross-line patterns rescan the rest of the text"""
+    with open(os.path.join(SAMPLES_DIR, 'sample_jd.txt'), 'r', encoding='utf-8') as f:
+        realistic = f.read()
+    return {
+        "realistic (repeated sample)": (realistic * (size // len(realistic) + 1))[:size],
+        "trigger words, no connector": ("must " * size)[:size],
+        "unpunctuated experience": ("experience python " * size)[:size],
+        "nice without to have": ("nice good prefer " * size)[:size],
+        "digit run": "1" * size,
+    }
+
+def time_call(function, text):
+    start = time.perf_counter()
+    function(text)
+    return time.perf_counter() - start
+
+def benchmark_jd_parser(legacy_sizes=(5000, 10000, 20000), size=100 * 1024):
+    print("=== Benchmarking JD Requirement Extraction ===")
+
+    for name in adversarial_jds(1):
+        print(name)
+        for legacy_size in legacy_sizes:
+            text = adversarial_jds(legacy_size)[name]
+            print(f"  {legacy_size // 1000:>3} KB  legacy {time_call(legacy_extract, text) * 1000:9.1f} ms"
+                  f"   segment-then-classify {time_call(new_extract, text) * 1000:7.1f} ms")
+        text = adversarial_jds(size)[name]
+        print(f"  {size // 1024:>3} KB  segment-then-classify {time_call(new_extract, text) * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    benchmark_jd_parser()
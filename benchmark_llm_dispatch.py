@@ -0,0 +1,33 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from scoring.llm_dispatcher import FakeLLMBackend, LLMDispatcher
+
+def benchmark_llm_dispatch(prompts=48, latency=0.2):
+    print("=== Benchmarking LLM Feedback Dispatch ===")
+    print(f"{prompts} feedback prompts, {latency * 1000:.0f} ms fake model latency")
+    candidate_prompts = [f"Analyze candidate {i} against the job description." for i in range(prompts)]
+
+    # One prompt at a time, as feedback was generated before the dispatcher
+    backend = FakeLLMBackend(latency)
+    start = time.perf_counter()
+    for prompt in candidate_prompts:
+        backend.generate(prompt)
+    serial_time = time.perf_counter() - start
+    print(f"Sequential:                         {serial_time:.2f}s")
+
+    for concurrency, batch_size, rate in [(8, 1, 0), (8, 4, 0), (8, 1, 600)]:
+        backend = FakeLLMBackend(latency)
+        dispatcher = LLMDispatcher(backend, max_concurrency=concurrency, requests_per_minute=rate, burst=concurrency)
+        start = time.perf_counter()
+        answers = dispatcher.generate_many(candidate_prompts, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        assert all(answers)
+        limit = f"{rate:.0f}/min" if rate else "unlimited"
+        print(f"Concurrency {concurrency}, {batch_size} per request, {limit:>9}: {elapsed:.2f}s "
+              f"({backend.requests} requests, {serial_time / elapsed:.1f}x)")
+
+if __name__ == "__main__":
+    benchmark_llm_dispatch()
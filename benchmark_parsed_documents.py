@@ -0,0 +1,63 @@
+import sys
+import os
+import gc
+import time
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def as_plain_dict(parsed):
+    """The dict the parser used to return: section strings and keyword strings of its own"""
+    result = parsed.to_dict()
+    result["tokens"] = parsed.tokens
+    result["sections"] = {name: "".join(list(text)) for name, text in result["sections"].items()}
+    result["keywords"] = ["".join(list(keyword)) for keyword in result["keywords"]]
+    return result
+
+def measure(build):
+    """Bytes still allocated after building and holding the documents"""
+    gc.collect()
+    tracemalloc.start()
+    documents = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del documents
+    return size
+
+def benchmark_parsed_documents(count=2000):
+    print("=== Benchmarking Parsed Document Memory ===")
+    parser = ResumeParser()
+    base = read_sample('sample_resume.txt')
+    texts = [f"{base}\nReference number {index}\n" for index in range(count)]
+
+    parsed = [parser.parse_from_text(text) for text in texts]
+    text_bytes = measure(lambda: ["".join(list(text)) for text in texts])
+    # Every lazy field computed, as after scoring
+    compact = measure(lambda: [parser.parse_from_text(text).materialize() for text in texts])
+    plain = measure(lambda: [as_plain_dict(document) for document in parsed])
+    print(f"{count} resumes, text alone {text_bytes / count / 1024:.1f} KB each")
+    print(f"  ParsedResume: {compact / count / 1024:6.1f} KB each, plus the text")
+    print(f"  plain dicts:  {plain / count / 1024:6.1f} KB each, plus the text and tokens")
+
+def benchmark_lazy_fields(repeats=200):
+    print("=== Benchmarking Lazy Field Extraction ===")
+    parser = ResumeParser()
+    text = read_sample('sample_resume.txt') * 3
+    for label, read in (("email only", lambda resume: resume["email"]),
+                        ("scoring fields", lambda resume: (resume["sections"], resume["keywords"], resume["skill_ids"])),
+                        ("every field", lambda resume: resume.materialize())):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            read(parser.parse_from_text(text))
+        print(f"  {label:15s} {(time.perf_counter() - start) / repeats * 1000:7.3f} ms")
+
+if __name__ == "__main__":
+    benchmark_parsed_documents()
+    benchmark_lazy_fields()
@@ -0,0 +1,44 @@
+import sys
+import os
+import io
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pypdfium2 as pdfium
+from parser.resume_parser import ResumeParser
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def build_long_pdf(pages):
+    """Repeat the sample resume's pages into a long portfolio-style PDF"""
+    source = pdfium.PdfDocument(os.path.join(SAMPLES_DIR, 'Resume - 4 - Copy.pdf'))
+    document = pdfium.PdfDocument.new()
+    while len(document) < pages:
+        document.import_pages(source, list(range(min(len(source), pages - len(document)))))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def time_parse(parser, data, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        text = parser.parse_pdf(io.BytesIO(data))
+    return (time.perf_counter() - start) / repeats, text
+
+def benchmark_pdf_extraction(pages=40, repeats=3):
+    print("=== Benchmarking PDF Text Extraction ===")
+    data = build_long_pdf(pages)
+    print(f"{pages}-page PDF, {len(data) / 1024:.0f} KB")
+
+    full_time, full_text = time_parse(ResumeParser(page_workers=1), data, repeats)
+    parallel_time, parallel_text = time_parse(ResumeParser(page_workers=4), data, repeats)
+    budget_time, budget_text = time_parse(ResumeParser(max_chars=5000, page_workers=1), data, repeats)
+
+    assert parallel_text == full_text, "Page-parallel extraction changed the text"
+    assert budget_text == full_text[:5000], "Budgeted extraction is not a prefix of the full text"
+    print(f"Serial, all pages:        {full_time * 1000:.0f} ms ({len(full_text)} chars)")
+    print(f"4 page workers:           {parallel_time * 1000:.0f} ms ({full_time / parallel_time:.1f}x)")
+    print(f"5000-character budget:    {budget_time * 1000:.0f} ms ({full_time / budget_time:.1f}x)")
+
+if __name__ == "__main__":
+    benchmark_pdf_extraction()
@@ -0,0 +1,66 @@
+import sys
+import os
+import random
+import re
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from utils.skill_lexicon import SkillLexicon, get_skill_lexicon
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def get_skill_lexicon_entries():
+    """Entries of the bundled lexicon, with every term as an alias"""
+    lexicon = get_skill_lexicon()
+    entries = []
+    for skill_id, name in enumerate(lexicon.names):
+        aliases = [term for term, term_id in lexicon.terms.items() if term_id == skill_id]
+        entries.append({"name": name, "aliases": aliases})
+    return entries
+
+def build_entries(size, rng):
+    """The bundled lexicon padded with made-up multi-word skills up to the requested size"""
+    entries = [dict(entry) for entry in get_skill_lexicon_entries()]
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    while len(entries) < size:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        entries.append({"name": " ".join(words), "aliases": ["".join(words)]})
+    return entries
+
+def benchmark_skill_lexicon(repeats=5):
+    print("=== Benchmarking Skill Lexicon ===")
+    rng = random.Random(11)
+    text = (read_sample('sample_resume.txt') + "\n" + read_sample('sample_jd.txt')) * 5
+    print(f"Text: {len(text) // 1024} KB")
+
+    for size in (150, 1000, 10000):
+        entries = build_entries(size, rng)
+        terms = sorted({term.lower() for entry in entries for term in [entry["name"]] + entry["aliases"]},
+                       key=len, reverse=True)
+
+        start = time.perf_counter()
+        lexicon = SkillLexicon(entries)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            found = lexicon.skill_ids(text)
+        scan_time = (time.perf_counter() - start) / repeats
+
+        # One regex search per term, the obvious alternative to an automaton
+        patterns = [re.compile(r'(?<![\w+#])' + re.escape(term) + r'(?![\w+#])') for term in terms]
+        lowered = text.lower()
+        start = time.perf_counter()
+        per_term = [term for term, pattern in zip(terms, patterns) if pattern.search(lowered)]
+        per_term_time = time.perf_counter() - start
+
+        print(f"{size:6d} skills ({len(terms)} terms): build {build_time * 1000:8.1f} ms   "
+              f"automaton scan {scan_time * 1000:7.1f} ms ({len(found)} skills)   "
+              f"per-term regex {per_term_time * 1000:8.1f} ms ({len(per_term)} terms)")
+
+if __name__ == "__main__":
+    benchmark_skill_lexicon()
@@ -0,0 +1,82 @@
+import sys
+import os
+import re
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.job_context import JobContext
+from scoring.semantic_matcher import SemanticMatcher
+from utils.tokenizer import NgramAnalyzer, tokenize
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def string_similarity(vectorizer, resume_data, job):
+    """The matcher's steps before shared tokens: every transform re-tokenizes raw strings"""
+    jd_vector = vectorizer.transform([job.overall_text])
+    similarity = cosine_similarity(vectorizer.transform([resume_data["text"][:5000]]), jd_vector)[0][0]
+    jd_section_vector = vectorizer.transform([job.section_text])
+    sections = {}
+    for section in ["experience", "skills", "education", "projects"]:
+        text = resume_data["sections"].get(section, "")
+        if text:
+            sections[section] = cosine_similarity(vectorizer.transform([text[:1000]]), jd_section_vector)[0][0]
+    return similarity, sections
+
+def benchmark_tokenizer(repeats=50):
+    print("=== Benchmarking Shared Tokenization ===")
+    resume_text = read_sample('sample_resume.txt') * 3
+    resume = ResumeParser().parse_from_text(resume_text)
+    job = JobContext(JdParser().parse(read_sample('sample_jd.txt')))
+    print(f"Resume: {len(resume_text)} characters, {len(resume['tokens'])} tokens")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tokenize(resume_text)
+    print(f"tokenize once:                {(time.perf_counter() - start) / repeats * 1000:7.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        re.findall(r'\b[A-Za-z]{3,}\b', resume_text.lower())
+    print(f"keyword regex (per parser):   {(time.perf_counter() - start) / repeats * 1000:7.2f} ms")
+
+    # Analysis alone: raw-string analyzer over the overall text and sections vs n-grams of shared terms
+    word_analyzer = HashingVectorizer(stop_words='english', ngram_range=(1, 2)).build_analyzer()
+    sections = [text[:1000] for text in resume["sections"].values() if text]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in [resume_text[:5000]] + sections:
+            word_analyzer(text)
+    print(f"analyze raw strings:          {(time.perf_counter() - start) / repeats * 1000:7.2f} ms")
+
+    term_analyzer = NgramAnalyzer()
+    matcher = SemanticMatcher(vectorizer_mode="hashing")
+    start = time.perf_counter()
+    for _ in range(repeats):
+        term_analyzer(matcher._resume_terms(resume))
+        for section, text in resume["sections"].items():
+            if text:
+                term_analyzer(matcher._resume_section_terms(resume, section))
+    print(f"analyze shared tokens:        {(time.perf_counter() - start) / repeats * 1000:7.2f} ms")
+
+    raw = HashingVectorizer(n_features=2 ** 18, stop_words='english', ngram_range=(1, 2),
+                            alternate_sign=False, norm='l2')
+    start = time.perf_counter()
+    for _ in range(repeats):
+        string_similarity(raw, resume, job)
+    print(f"semantic match, raw strings:  {(time.perf_counter() - start) / repeats * 1000:7.2f} ms")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        matcher.calculate_semantic_similarity(resume, job)
+    print(f"semantic match, shared tokens:{(time.perf_counter() - start) / repeats * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    benchmark_tokenizer()
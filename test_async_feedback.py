@@ -0,0 +1,127 @@
+import sys
+import os
+import tempfile
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from main import ResumeEvaluator
+from services.feedback_manager import FeedbackManager
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Local stand-in for the Gemini model that answers only once released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        assert self.release.wait(10), "Stub model was never released"
+        return StubResponse("  Stub suggestions for the candidate.  ")
+
+def test_async_feedback():
+    print("=== Testing Asynchronous Feedback ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        evaluator = ResumeEvaluator(feedback_mode="async", db_path=os.path.join(tmp_dir, 'evaluations.db'))
+
+        model = StubModel()
+        evaluator.semantic_matcher.google_api_key = "stub-key"
+        evaluator.semantic_matcher._get_feedback_model = lambda: model
+
+        resume_path = os.path.join(os.path.dirname(__file__), 'sample_resume.docx')
+        jd_path = os.path.join(SAMPLES_DIR, 'sample_jd.txt')
+
+        # The score comes back while the model is still blocked
+        result = evaluator.evaluate(resume_path, jd_path)
+        evaluation_id = result["evaluation_id"]
+        print(f"Score {result['relevance_score']} returned with feedback {result['improved_feedback']}")
+        assert result["improved_feedback"] == "pending"
+        assert result["relevance_score"] > 0
+        assert evaluator.get_improved_feedback(evaluation_id)["status"] == "pending"
+        assert evaluator.get_evaluation(evaluation_id)["feedback_status"] == "pending"
+
+        # Once the model answers, the feedback is written into the row
+        model.release.set()
+        evaluator.feedback_manager.shutdown(wait=True)
+        feedback = evaluator.get_improved_feedback(evaluation_id)
+        print(f"Feedback after generation: {feedback}")
+        assert feedback == {
+            "evaluation_id": evaluation_id,
+            "status": "ready",
+            "improved_feedback": "Stub suggestions for the candidate."
+        }
+        assert model.calls == 1
+
+        # Rows left pending by a previous process are picked up again
+        evaluator.database.update_improved_feedback(evaluation_id, "", "pending")
+        evaluator.feedback_manager = FeedbackManager(evaluator.semantic_matcher, evaluator.database)
+        assert evaluator.resume_pending_feedback() == [evaluation_id]
+        evaluator.feedback_manager.shutdown(wait=True)
+        assert evaluator.get_improved_feedback(evaluation_id)["status"] == "ready"
+        assert evaluator.resume_pending_feedback() == []
+
+        # Pending feedback is generated by whichever process claims it first; a fresh claim is left alone
+        evaluator.database.update_improved_feedback(evaluation_id, "", "pending")
+        assert evaluator.database.claim_feedback(evaluation_id, "other-process")
+        assert not evaluator.database.claim_feedback(evaluation_id, "this-process")
+        assert evaluator.resume_pending_feedback() == []
+        evaluator.feedback_manager = FeedbackManager(evaluator.semantic_matcher, evaluator.database)
+        evaluator.feedback_manager.submit(evaluation_id, {"text": "resume"}, {"text": "job"}).result()
+        assert evaluator.get_improved_feedback(evaluation_id)["status"] == "pending"
+        # A claim whose process stopped renewing it goes stale and can be taken over
+        assert evaluator.database.get_pending_feedback(lease=0)[0]["id"] == evaluation_id
+        assert evaluator.database.claim_feedback(evaluation_id, "this-process", lease=0)
+        evaluator.database.update_improved_feedback(evaluation_id, "Done.", "ready")
+        assert not evaluator.database.claim_feedback(evaluation_id, "this-process", lease=0)
+
+        # Without an LLM, rule-based feedback is cheap and still generated inline
+        evaluator.semantic_matcher.google_api_key = None
+        result = evaluator.evaluate(resume_path, jd_path)
+        assert result["improved_feedback"].startswith("Based on semantic analysis")
+        assert evaluator.get_improved_feedback(result["evaluation_id"])["status"] == "ready"
+    print("Asynchronous feedback tests passed")
+
+def test_feedback_endpoint():
+    print("=== Testing Feedback Endpoint ===")
+    sys.path.insert(0, os.path.dirname(__file__))
+    from app.api.app import app
+    api = sys.modules[app.import_name]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The endpoint uses the module's evaluator; swap in one whose stores all live in the temporary database
+        original = api.evaluator
+        api.evaluator = ResumeEvaluator(db_path=os.path.join(tmp_dir, 'evaluations.db'))
+        try:
+            database = api.evaluator.database
+            evaluation_id = database.save_evaluation({
+                "resume_filename": "resume.txt",
+                "jd_filename": "jd.txt",
+                "improved_feedback": "pending",
+                "feedback_status": "pending"
+            })
+
+            client = app.test_client()
+            response = client.get(f'/api/evaluations/{evaluation_id}/feedback')
+            assert response.status_code == 202
+            assert response.get_json()["status"] == "pending"
+
+            database.update_improved_feedback(evaluation_id, "Add metrics to your projects.")
+            response = client.get(f'/api/evaluations/{evaluation_id}/feedback')
+            assert response.status_code == 200
+            assert response.get_json()["improved_feedback"] == "Add metrics to your projects."
+
+            assert client.get('/api/evaluations/999999/feedback').status_code == 404
+        finally:
+            api.evaluator = original
+    print("Feedback endpoint tests passed")
+
+if __name__ == "__main__":
+    test_async_feedback()
+    test_feedback_endpoint()
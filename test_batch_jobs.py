@@ -0,0 +1,108 @@
+import sys
+import os
+import shutil
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from main import ResumeEvaluator
+from models.job_store import BatchJobStore
+from services.job_manager import BatchJobManager
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def wait_for_job(manager, job_id, timeout=60):
+    """Poll a job until it leaves the queued/running states"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get_job(job_id)
+        if job["status"] not in ("queued", "running"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Job {job_id} did not finish in {timeout} seconds")
+
+def test_batch_jobs():
+    print("=== Testing Batch Jobs ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Every store (evaluations, parse and feedback caches) goes to the temporary database
+        evaluator = ResumeEvaluator(db_path=os.path.join(tmp_dir, 'evaluations.db'))
+        store = BatchJobStore(evaluator.database.db_path)
+
+        job_dir = os.path.join(tmp_dir, 'job')
+        os.makedirs(job_dir)
+        jd_path = shutil.copy(os.path.join(BASE_DIR, 'samples', 'sample_jd.txt'), job_dir)
+        resume_path = shutil.copy(os.path.join(BASE_DIR, 'sample_resume.docx'), job_dir)
+        bad_path = os.path.join(job_dir, 'notes.txt')
+
+        manager = BatchJobManager(evaluator, store, workers=1)
+        job_id = manager.submit(jd_path, [resume_path, bad_path], job_dir=job_dir)
+        job = wait_for_job(manager, job_id)
+        print(f"Job {job_id}: {job['status']} {job['progress']}")
+
+        assert job["status"] == "completed"
+        assert job["progress"]["processed"] == 2
+        assert job["progress"]["failed"] == 1
+        assert [r["resume_filename"] for r in job["results"]] == ["sample_resume.docx", "notes.txt"]
+        assert "resume_text" not in job["results"][0]
+        assert not os.path.exists(job_dir)
+
+        # A job left running by a previous process is resumed, skipping finished items
+        os.makedirs(job_dir)
+        jd_path = shutil.copy(os.path.join(BASE_DIR, 'samples', 'sample_jd.txt'), job_dir)
+        resume_path = shutil.copy(os.path.join(BASE_DIR, 'sample_resume.docx'), job_dir)
+        interrupted_id = store.create_job(jd_path, [resume_path, resume_path], job_dir=job_dir)
+        store.set_job_status(interrupted_id, "running")
+        store.record_item_result(interrupted_id, 0, {"resume_filename": "sample_resume.docx", "evaluation_id": 99})
+
+        restarted = BatchJobManager(evaluator, store, workers=1)
+        assert restarted.resume_unfinished_jobs() == [interrupted_id]
+        job = wait_for_job(restarted, interrupted_id)
+        print(f"Resumed job {interrupted_id}: {job['status']} {job['progress']}")
+
+        assert job["status"] == "completed"
+        assert job["results"][0]["evaluation_id"] == 99
+        assert job["results"][1]["evaluation_id"] != 99
+
+        # A job another live process is running (fresh lease) is left alone; an expired lease is taken over
+        os.makedirs(job_dir)
+        jd_path = shutil.copy(os.path.join(BASE_DIR, 'samples', 'sample_jd.txt'), job_dir)
+        resume_path = shutil.copy(os.path.join(BASE_DIR, 'sample_resume.docx'), job_dir)
+        owned_id = store.create_job(jd_path, [resume_path], job_dir=job_dir)
+        assert store.claim_job(owned_id, "other-process")
+        assert not store.claim_job(owned_id, "third-process")
+
+        second = BatchJobManager(evaluator, store, workers=1)
+        assert second.resume_unfinished_jobs() == []
+        second._schedule(owned_id)
+        second.executor.shutdown(wait=True)
+        assert store.get_job(owned_id)["status"] == "running"
+        assert store.get_job(owned_id)["progress"]["processed"] == 0
+
+        assert store.get_unfinished_job_ids(lease=0) == [owned_id]
+        assert store.claim_job(owned_id, "third-process", lease=0)
+        assert not store.renew_claim(owned_id, "other-process")
+        assert "owner" not in store.get_job(owned_id)
+
+        # A job submitted with process-pool settings keeps them and runs its resumes on the pool
+        pooled_dir = os.path.join(tmp_dir, 'pooled')
+        os.makedirs(pooled_dir)
+        jd_path = shutil.copy(os.path.join(BASE_DIR, 'samples', 'sample_jd.txt'), pooled_dir)
+        resume_path = shutil.copy(os.path.join(BASE_DIR, 'sample_resume.docx'), pooled_dir)
+        bad_path = os.path.join(pooled_dir, 'notes.txt')
+        pooled_id = manager.submit(jd_path, [resume_path, bad_path, resume_path], job_dir=pooled_dir,
+                                   workers=2, chunk_size=1)
+        assert store.get_job_files(pooled_id)["workers"] == 2
+        job = wait_for_job(manager, pooled_id)
+        print(f"Pooled job {pooled_id}: {job['status']} {job['progress']}")
+
+        assert job["status"] == "completed"
+        assert job["workers"] == 2 and job["chunk_size"] == 1
+        assert job["progress"]["processed"] == 3
+        assert job["progress"]["failed"] == 1
+        assert [r["resume_filename"] for r in job["results"]] == ["sample_resume.docx", "notes.txt", "sample_resume.docx"]
+        assert all(r.get("evaluation_id") for r in (job["results"][0], job["results"][2]))
+        assert "resume_text" not in job["results"][2]
+
+if __name__ == "__main__":
+    test_batch_jobs()
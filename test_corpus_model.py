@@ -0,0 +1,76 @@
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from models.database import EvaluationDatabase
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.corpus_model import CorpusTfidfModel, main as fit_corpus_model
+from scoring.semantic_matcher import SemanticMatcher
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_corpus_model():
+    print("=== Testing Corpus TF-IDF Model ===")
+
+    resume_text = read_sample('sample_resume.txt')
+    jd_texts = [read_sample('sample_jd.txt'), read_sample('sample_jd_2.txt')]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'evaluations.db')
+        model_path = os.path.join(tmp_dir, 'tfidf_corpus.pkl')
+
+        db = EvaluationDatabase(db_path)
+        for jd_text in jd_texts:
+            db.save_evaluation({"resume_filename": "r.txt", "jd_filename": "jd.txt",
+                                "resume_text": resume_text, "jd_text": jd_text})
+
+        # No model on disk yet: the matcher falls back to per-request fitting
+        matcher = SemanticMatcher(corpus_model_path=model_path)
+        assert matcher.corpus_model is None
+
+        fit_corpus_model(['--db', db_path, '--output', model_path])
+        assert matcher.reload_corpus_model()
+        print(f"Corpus model: {matcher.corpus_model.metadata}")
+        assert matcher.corpus_model.metadata["document_count"] == 3
+
+        resume_data = ResumeParser().parse_from_text(resume_text)
+        jd_data = JdParser().parse(jd_texts[0])
+        vocabulary = dict(matcher.corpus_model.vectorizer.vocabulary_)
+
+        result = matcher.calculate_semantic_similarity(resume_data, jd_data)
+        print(f"Semantic similarity with corpus model: {result}")
+        assert 0.0 < result["overall_similarity"] <= 1.0
+        # The request path never refits the model
+        assert matcher.corpus_model.vectorizer.vocabulary_ == vocabulary
+
+        # A fresh matcher picks the persisted model up at startup
+        assert CorpusTfidfModel.load(model_path) is not None
+        assert SemanticMatcher(corpus_model_path=model_path).corpus_model is not None
+
+def test_reload_endpoint_requires_admin_token():
+    print("=== Testing Corpus Model Reload Authorization ===")
+    from app.api.app import app
+
+    client = app.test_client()
+    original = app.config['ADMIN_TOKEN']
+    try:
+        # Disabled unless a token is configured
+        app.config['ADMIN_TOKEN'] = None
+        assert client.post('/api/corpus-model/reload').status_code == 403
+        app.config['ADMIN_TOKEN'] = 'secret-token'
+        assert client.post('/api/corpus-model/reload').status_code == 403
+        assert client.post('/api/corpus-model/reload', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+        response = client.post('/api/corpus-model/reload', headers={'X-Admin-Token': 'secret-token'})
+        assert response.status_code == 200 and "success" in response.get_json()
+    finally:
+        app.config['ADMIN_TOKEN'] = original
+
+if __name__ == "__main__":
+    test_corpus_model()
+    test_reload_endpoint_requires_admin_token()
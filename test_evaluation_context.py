@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.relevance_scorer import RelevanceScorer
+from scoring.semantic_matcher import SemanticMatcher
+from scoring.job_context import JobContext
+from scoring.pipeline import score_resume
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+class CountingMatcher(SemanticMatcher):
+    """Semantic matcher that counts how often the resume is vectorized"""
+
+    def __init__(self):
+        super().__init__()
+        # Rule-based feedback only
+        self.google_api_key = None
+        self.vectorizations = 0
+
+    def _get_tfidf_vectors(self, *args, **kwargs):
+        self.vectorizations += 1
+        return super()._get_tfidf_vectors(*args, **kwargs)
+
+def test_evaluation_context():
+    print("=== Testing Evaluation Context ===")
+
+    with open(os.path.join(SAMPLES_DIR, 'sample_resume.txt'), 'r', encoding='utf-8') as f:
+        resume_data = ResumeParser().parse_from_text(f.read())
+    job_context = JobContext.from_file(os.path.join(SAMPLES_DIR, 'sample_jd.txt'), JdParser())
+
+    scorer = RelevanceScorer()
+    matcher = CountingMatcher()
+
+    # Scoring plus rule-based feedback computes semantic similarity once
+    result = score_resume(resume_data, "sample_resume.txt", job_context, scorer, matcher)
+    print(f"Vectorizations per evaluation: {matcher.vectorizations}")
+    assert matcher.vectorizations == 1
+
+    # The shared result is the one a standalone computation gives, and so is the feedback
+    expected = matcher.calculate_semantic_similarity(resume_data, job_context)
+    assert result["semantic_similarity"] == expected["overall_similarity"]
+    assert result["section_similarities"] == expected["section_similarities"]
+    assert result["improved_feedback"] == matcher.get_improved_feedback(resume_data, job_context)
+    assert result["relevance_score"] == scorer.calculate_relevance(resume_data, job_context)["relevance_score"]
+
+    # A result computed for the whole batch is reused, not recomputed
+    batch_result = matcher.calculate_semantic_similarity_batch([resume_data], job_context)[0]
+    matcher.vectorizations = 0
+    score_resume(resume_data, "sample_resume.txt", job_context, scorer, matcher, batch_result)
+    assert matcher.vectorizations == 0
+    print("Evaluation context tests passed")
+
+if __name__ == "__main__":
+    test_evaluation_context()
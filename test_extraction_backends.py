@@ -0,0 +1,57 @@
+import sys
+import os
+import io
+import zipfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.extractors import is_usable_text
+from parser.resume_parser import ResumeParser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def read(path):
+    with open(os.path.join(BASE_DIR, path), 'rb') as f:
+        return f.read()
+
+def test_extraction_backends():
+    print("=== Testing Extraction Backends ===")
+
+    pdf_data = read(os.path.join('samples', 'Resume - 4 - Copy.pdf'))
+    docx_data = read('sample_resume.docx')
+
+    # The fast paths return the same text as pdfplumber and docx2txt on the samples
+    assert ResumeParser(pdf_backend='pdfium')._extract_text(pdf_data, 'pdf') == \
+        ResumeParser(pdf_backend='pdfplumber')._extract_text(pdf_data, 'pdf')
+    assert ResumeParser(docx_backend='xml')._extract_text(docx_data, 'docx') == \
+        ResumeParser(docx_backend='docx2txt')._extract_text(docx_data, 'docx')
+    assert ResumeParser(pdf_backend='pdfium', max_chars=300)._extract_text(pdf_data, 'pdf') == \
+        ResumeParser(pdf_backend='pdfplumber')._extract_text(pdf_data, 'pdf')[:300]
+
+    # Garbled or empty fast-path output falls back to the thorough backend
+    parser = ResumeParser()
+    parser._extract_pdf_pdfium = lambda data: '\ufffd' * 200
+    assert parser._extract_text(pdf_data, 'pdf') == ResumeParser(pdf_backend='pdfplumber')._extract_text(pdf_data, 'pdf')
+
+    # A DOCX whose package the streaming reader cannot handle still goes through docx2txt
+    broken = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(docx_data)) as source, zipfile.ZipFile(broken, 'w') as target:
+        for name in source.namelist():
+            data = source.read(name)
+            if name == 'word/document.xml':
+                data = data.replace(b'<w:body>', b'<w:body>\x00', 1)
+            target.writestr(name, data)
+    parser = ResumeParser()
+    assert parser._extract_text(broken.getvalue(), 'docx') == parser.parse_docx(io.BytesIO(broken.getvalue()))
+
+    assert not is_usable_text("")
+    assert not is_usable_text("(cid:12)(cid:34) 1234 5678")
+    assert is_usable_text("Python developer with 5 years of experience")
+
+    try:
+        ResumeParser(pdf_backend='unknown')
+        assert False, "unknown backends must be rejected"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_extraction_backends()
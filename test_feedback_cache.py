@@ -0,0 +1,89 @@
+import sys
+import os
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from scoring.feedback_cache import FeedbackCache
+from scoring.semantic_matcher import SemanticMatcher
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+class StubModel:
+    """Local stand-in for the Gemini model that numbers its answers"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt):
+        self.prompts.append(prompt)
+        return StubResponse(f"Suggestions #{len(self.prompts)}")
+
+def make_matcher(cache, model):
+    matcher = SemanticMatcher(feedback_cache=cache)
+    matcher.google_api_key = "stub-key"
+    matcher._get_feedback_model = lambda: model
+    return matcher
+
+def test_feedback_cache():
+    print("=== Testing LLM Feedback Cache ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'cache.db')
+        model = StubModel()
+        matcher = make_matcher(FeedbackCache(db_path), model)
+        resume = {"text": "Python developer with Flask experience. " * 100}
+        job = {"text": "We need a Python developer."}
+
+        # An identical prompt is generated once
+        first = matcher.get_improved_feedback(resume, job)
+        assert matcher.get_improved_feedback(resume, job) == first == "Suggestions #1"
+        assert len(model.prompts) == 1
+        assert "Python developer with Flask" in model.prompts[0]
+
+        # Text past the truncation limit does not change the prompt, so it is still a hit
+        longer = {"text": resume["text"] + "Also knows Rust."}
+        assert matcher.get_improved_feedback(longer, job) == first
+        assert len(model.prompts) == 1
+
+        # A different JD, prompt template or model misses
+        assert matcher.get_improved_feedback(resume, {"text": "We need a Go developer."}) == "Suggestions #2"
+        matcher.FEEDBACK_PROMPT = matcher.FEEDBACK_PROMPT + "Be brief.\n"
+        assert matcher.get_improved_feedback(resume, job) == "Suggestions #3"
+        matcher.FEEDBACK_MODEL = "another-model"
+        assert matcher.get_improved_feedback(resume, job) == "Suggestions #4"
+
+        # Another process sharing the database reuses the stored feedback
+        restarted_model = StubModel()
+        restarted = make_matcher(FeedbackCache(db_path), restarted_model)
+        assert restarted.get_improved_feedback(resume, job) == first
+        assert restarted_model.prompts == []
+        stats = restarted.feedback_cache.get_stats()
+        print(stats)
+        assert stats["hits"] == 1 and stats["entries"] == 4
+
+        # Entries older than the TTL are regenerated
+        expiring = make_matcher(FeedbackCache(db_path, ttl=0.05), restarted_model)
+        time.sleep(0.1)
+        assert expiring.get_improved_feedback(resume, job) == "Suggestions #1"
+        assert len(restarted_model.prompts) == 1
+        assert expiring.feedback_cache.get_stats()["expired"] == 1
+
+        # The store stays within its size bound, dropping least recently used entries
+        small = FeedbackCache(os.path.join(tmp_dir, 'small.db'), max_bytes=40)
+        small.put("a", "x" * 15)
+        small.put("b", "y" * 15)
+        assert small.get("a") == "x" * 15
+        small.put("c", "z" * 15)
+        assert small.get("b") is None and small.get("a") is not None and small.get("c") is not None
+        assert small.get_stats()["bytes"] <= 40
+
+        # Without an API key nothing is sent or cached
+        matcher.google_api_key = None
+        assert matcher.get_improved_feedback(resume, job).startswith("Based on semantic analysis")
+    print("LLM feedback cache tests passed")
+
+if __name__ == "__main__":
+    test_feedback_cache()
@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from difflib import SequenceMatcher
+from scoring.fuzzy_index import FuzzyIndex
+from scoring.similarity_cache import clear_similarity_cache, get_similarity_cache_stats, is_similar
+
+def test_fuzzy_cache():
+    print("=== Testing Fuzzy Similarity Cache ===")
+    clear_similarity_cache()
+
+    # Verdicts agree with SequenceMatcher, including for pairs where ratio() is not symmetric
+    pairs = [("python", "pyhton"), ("kubernetes", "kubernetis"), ("java", "javascript"), ("abcab", "bcabc")]
+    for target, candidate in pairs:
+        for a, b in [(target, candidate), (candidate, target)]:
+            assert is_similar(a, b, 0.8) == (SequenceMatcher(None, a, b).ratio() > 0.8), (a, b)
+
+    stats = get_similarity_cache_stats()
+    assert stats["misses"] == 8 and stats["hits"] == 0, stats
+
+    # A second evaluation over the same vocabulary reuses the verdicts
+    index = FuzzyIndex(["pyhton", "kubernetis", "javascript"])
+    assert index.has_match("python")
+    assert index.has_match("kubernetes")
+    stats = get_similarity_cache_stats()
+    print(f"Stats after second evaluation: {stats}")
+    assert stats["hits"] >= 2, stats
+    assert stats["entries"] <= stats["max_entries"]
+
+    # Exact matches are answered before any fuzzy comparison
+    lookups = stats["hits"] + stats["misses"]
+    assert FuzzyIndex(["docker", "terraform"]).has_match("docker")
+    assert FuzzyIndex(["docker", "terraform"]).has_match("terraform")
+    stats = get_similarity_cache_stats()
+    assert stats["hits"] + stats["misses"] == lookups, stats
+
+    clear_similarity_cache()
+    assert get_similarity_cache_stats() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0,
+                                            "max_entries": stats["max_entries"]}
+    print("Fuzzy similarity cache tests passed")
+
+if __name__ == "__main__":
+    test_fuzzy_cache()
@@ -0,0 +1,54 @@
+import sys
+import os
+import random
+from difflib import SequenceMatcher
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from scoring.fuzzy_index import FuzzyIndex
+
+def mutate(word, rng):
+    """Apply a few random edits to a word"""
+    chars = list(word)
+    for _ in range(rng.randint(0, 3)):
+        op = rng.choice("ids")
+        pos = rng.randint(0, len(chars))
+        if op == "i":
+            chars.insert(pos, rng.choice("abcdefgh"))
+        elif chars and pos < len(chars):
+            if op == "d":
+                del chars[pos]
+            else:
+                chars[pos] = rng.choice("abcdefgh")
+    return "".join(chars)
+
+def linear_match(target, candidates, threshold=0.8):
+    """Reference answer: compare the target with every candidate"""
+    return any(target == c or SequenceMatcher(None, target, c).ratio() > threshold for c in candidates)
+
+def test_fuzzy_index():
+    print("=== Testing Fuzzy Index ===")
+
+    rng = random.Random(42)
+    alphabet = "abcdefgh"
+
+    # Small alphabets and short words produce many near misses around the threshold
+    for _ in range(200):
+        candidates = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10))) for _ in range(30)]
+        index = FuzzyIndex(candidates)
+        for _ in range(20):
+            if rng.random() < 0.5:
+                target = mutate(rng.choice(candidates), rng)
+            else:
+                target = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 10)))
+            assert index.has_match(target) == linear_match(target, candidates), (target, candidates)
+
+    # Known pairs
+    index = FuzzyIndex(["python", "kubernetes", "tensorflow"])
+    assert index.has_match("python")
+    assert index.has_match("pythons")
+    assert not index.has_match("java")
+    assert not FuzzyIndex([]).has_match("python")
+    print("Fuzzy index agrees with the linear scan")
+
+if __name__ == "__main__":
+    test_fuzzy_index()
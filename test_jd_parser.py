@@ -0,0 +1,51 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.jd_parser import JdParser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def test_jd_parser():
+    print("=== Testing JD Requirement Extraction ===")
+
+    parser = JdParser()
+    with open(os.path.join(BASE_DIR, 'samples', 'sample_jd.txt'), 'r', encoding='utf-8') as f:
+        jd_data = parser.parse(f.read())
+    print(jd_data["must_have_skills"], jd_data["good_to_have_skills"], jd_data["qualifications"])
+
+    # Bullets follow their section header; lead-ins like "Experience with" are dropped
+    for skill in ["Python", "Flask", "Docker", "PostgreSQL", "MongoDB", "AWS"]:
+        assert skill in jd_data["must_have_skills"]
+    assert jd_data["good_to_have_skills"] == ["Kubernetes", "React", "other frontend frameworks",
+                                              "CI/CD pipelines", "microservices architecture"]
+    assert jd_data["qualifications"] == ["Bachelor's degree in Computer Science or related field"]
+    assert jd_data["experience"] == "5+ years"
+    # Responsibilities and benefits are not requirements, and items never span lines
+    assert not any("salary" in s or "APIs" in s for s in jd_data["must_have_skills"] + jd_data["good_to_have_skills"])
+    assert not any("\n" in s for s in jd_data["must_have_skills"] + jd_data["qualifications"])
+
+    # Inline cues, "key: value" lines and C++-style names
+    text = ("Candidates must have experience in C++, C# and Go.\n"
+            "Knowledge of Terraform is a plus.\n"
+            "Qualification: B.Tech, MCA\n"
+            "Location: Pune")
+    requirements = parser._extract_requirements(text)
+    assert requirements["must_have_skills"] == ["C++", "C#", "Go"]
+    assert requirements["good_to_have_skills"] == ["Terraform"]
+    assert requirements["qualifications"] == ["B.Tech", "MCA"]
+    assert parser._extract_requirements("Docker would be a bonus")["good_to_have_skills"] == ["Docker"]
+
+    # Inputs that made the old lazy patterns rescan the rest of the text stay fast
+    size = 100 * 1024
+    for adversarial in ["must " * (size // 5), "experience python " * (size // 18), "1" * size,
+                        "role: " + "-" * size, "nice good prefer " * (size // 17)]:
+        start = time.perf_counter()
+        parser.parse(adversarial)
+        elapsed = time.perf_counter() - start
+        print(f"{adversarial[:12]!r}... {elapsed * 1000:.1f} ms")
+        assert elapsed < 2, "JD parsing should be linear in the input size"
+
+if __name__ == "__main__":
+    test_jd_parser()
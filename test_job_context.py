@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.relevance_scorer import RelevanceScorer
+from scoring.semantic_matcher import SemanticMatcher
+from scoring.job_context import JobContext
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def test_job_context():
+    print("=== Testing Job Context ===")
+
+    with open(os.path.join(SAMPLES_DIR, 'sample_resume.txt'), 'r', encoding='utf-8') as f:
+        resume_data = ResumeParser().parse_from_text(f.read())
+
+    jd_parser = JdParser()
+    jd_path = os.path.join(SAMPLES_DIR, 'sample_jd.txt')
+    job_context = JobContext.from_file(jd_path, jd_parser)
+    print(f"Job title: {job_context.job_title}")
+    print(f"Must-have skills: {len(job_context.must_have_skills)}")
+
+    scorer = RelevanceScorer()
+    matcher = SemanticMatcher()
+
+    # Scoring against the prepared context must match scoring against the raw dict
+    from_dict = scorer.calculate_relevance(resume_data, job_context.jd_data)
+    from_context = scorer.calculate_relevance(resume_data, job_context)
+    print(f"Relevance (dict/context): {from_dict['relevance_score']} / {from_context['relevance_score']}")
+    assert from_dict == from_context
+
+    semantic_dict = matcher.calculate_semantic_similarity(resume_data, job_context.jd_data)
+    semantic_context = matcher.calculate_semantic_similarity(resume_data, job_context)
+    print(f"Semantic (dict/context): {semantic_dict['overall_similarity']:.4f} / {semantic_context['overall_similarity']:.4f}")
+    assert abs(semantic_dict["overall_similarity"] - semantic_context["overall_similarity"]) < 1e-9
+    assert semantic_dict["section_similarities"] == semantic_context["section_similarities"]
+
+    # The section representation is fitted once and then reused
+    first = job_context.get_section_representation()
+    second = job_context.get_section_representation()
+    assert first[0] is second[0]
+
+if __name__ == "__main__":
+    test_job_context()
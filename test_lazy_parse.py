@@ -0,0 +1,80 @@
+import sys
+import os
+import pickle
+import tempfile
+from collections import Counter
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.parse_cache import ParseCache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SAMPLES_DIR = os.path.join(BASE_DIR, 'samples')
+
+class CountingParser(ResumeParser):
+    """Resume parser that counts how often each extraction step runs"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = Counter()
+
+    def segment_sections(self, text):
+        self.calls["sections"] += 1
+        return super().segment_sections(text)
+
+    def extract_email(self, text):
+        self.calls["email"] += 1
+        return super().extract_email(text)
+
+    def extract_phone(self, text):
+        self.calls["phone"] += 1
+        return super().extract_phone(text)
+
+    def extract_job_title(self, text):
+        self.calls["job_title"] += 1
+        return super().extract_job_title(text)
+
+    def _extract_keywords(self, tokens):
+        self.calls["keywords"] += 1
+        return super()._extract_keywords(tokens)
+
+def test_lazy_parse():
+    print("=== Testing Lazy Resume Parsing ===")
+    with open(os.path.join(SAMPLES_DIR, 'sample_resume.txt'), 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    # Reading only the email runs only the email regex
+    parser = CountingParser()
+    resume = parser.parse_from_text(text)
+    assert resume["email"] == "john.doe@example.com"
+    assert resume["email"] == resume.get("email")
+    assert parser.calls == Counter({"email": 1})
+
+    # Other fields are computed on first access and memoized
+    sections = resume["sections"]
+    assert resume["sections"] == sections == ResumeParser().extract_sections(text)
+    resume["keywords"], resume["keywords"]
+    assert parser.calls == Counter({"email": 1, "sections": 1, "keywords": 1})
+
+    # The result is the same as computing everything
+    eager = ResumeParser().parse_from_text(text).materialize()
+    assert dict(resume) == dict(eager)
+    print({key: count for key, count in parser.calls.items()})
+    assert set(parser.calls.values()) == {1}
+
+    # Copies sent to other processes carry every field and no parser
+    fresh = CountingParser().parse_from_text(text)
+    copy = pickle.loads(pickle.dumps(fresh))
+    assert copy._parser is None and dict(copy) == dict(eager)
+
+    # The parse cache stores every field, so a cache hit extracts nothing again
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cached_parser = CountingParser(cache=ParseCache(os.path.join(tmp_dir, 'cache.db')))
+        first = cached_parser.parse(os.path.join(BASE_DIR, 'sample_resume.docx'))
+        cached_parser.calls.clear()
+        second = cached_parser.parse(os.path.join(BASE_DIR, 'sample_resume.docx'))
+        assert dict(second) == dict(first)
+        assert not cached_parser.calls
+
+if __name__ == "__main__":
+    test_lazy_parse()
@@ -0,0 +1,169 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from scoring.llm_dispatcher import CircuitBreaker, FakeLLMBackend, LLMDispatcher
+from scoring.semantic_matcher import SemanticMatcher
+
+def test_circuit_breaker():
+    print("=== Testing LLM Circuit Breaker ===")
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.is_open() and not breaker.allow()
+
+    # After the reset timeout exactly one probe goes through
+    time.sleep(0.12)
+    assert breaker.allow() and breaker.state == "half_open"
+    assert not breaker.allow()
+    # A failed probe opens the circuit again; a successful one closes it
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.12)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+    stats = breaker.get_stats()
+    print(stats)
+    assert stats["trips"] == 2 and stats["rejected"] == 3
+
+    # A slow request admitted before the trip cannot close the circuit ahead of the probe
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+    stale = breaker.admit()
+    breaker.record_failure(breaker.admit())
+    time.sleep(0.12)
+    probe = breaker.admit()
+    assert probe is not None and probe != stale
+    breaker.record_success(stale)
+    breaker.record_failure(stale)
+    assert breaker.state == "half_open" and not breaker.allow()
+    breaker.record_success(probe)
+    assert breaker.state == "closed"
+    print("Circuit breaker tests passed")
+
+def test_deadline():
+    print("=== Testing LLM Deadline ===")
+
+    # A slow provider is abandoned at the deadline rather than the client timeout
+    dispatcher = LLMDispatcher(FakeLLMBackend(latency=1.0), requests_per_minute=0, deadline=0.1)
+    start = time.perf_counter()
+    try:
+        dispatcher.generate("Prompt")
+        assert False, "A call past its deadline must fail"
+    except Exception as e:
+        assert "deadline" in str(e)
+    elapsed = time.perf_counter() - start
+    print(f"Gave up after {elapsed:.3f}s")
+    assert elapsed < 0.5
+    assert dispatcher.get_stats()["deadline_exceeded"] == 1
+
+    # Abandoned calls keep their request slot until the provider answers, so in-flight requests stay capped
+    backend = FakeLLMBackend(latency=0.3)
+    dispatcher = LLMDispatcher(backend, max_concurrency=2, requests_per_minute=0, deadline=0.05)
+    for _ in range(4):
+        try:
+            dispatcher.generate("Prompt")
+        except Exception as e:
+            assert "deadline" in str(e)
+    print(f"Peak in-flight requests after abandoning calls: {backend.max_in_flight}")
+    assert backend.max_in_flight == 2 and backend.requests == 2
+    time.sleep(0.35)
+    backend.latency = 0
+    assert dispatcher.generate("Prompt").startswith("Fake feedback")
+
+    # Backoff after quota errors is bounded by the same deadline
+    dispatcher = LLMDispatcher(FakeLLMBackend(latency=0, quota_errors=100), requests_per_minute=0,
+                               base_delay=10, max_retries=10, deadline=0.2)
+    start = time.perf_counter()
+    try:
+        dispatcher.generate("Prompt")
+        assert False, "A call past its deadline must fail"
+    except Exception:
+        pass
+    assert time.perf_counter() - start < 0.5
+    print("Deadline tests passed")
+
+def test_queueing_does_not_trip_breaker():
+    print("=== Testing LLM Queueing and the Circuit Breaker ===")
+
+    # A healthy but busy provider: prompts time out waiting for the one request slot, not at the provider
+    backend = FakeLLMBackend(latency=0.2)
+    dispatcher = LLMDispatcher(backend, max_concurrency=1, requests_per_minute=0, deadline=0.3,
+                               breaker=CircuitBreaker(failure_threshold=3, reset_timeout=30))
+    errors = []
+    def send():
+        try:
+            dispatcher.generate("Prompt")
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=send) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = dispatcher.get_stats()
+    print(stats)
+    assert sum("waiting for a free request slot" in str(e) for e in errors) >= 3
+    assert stats["circuit"]["state"] == "closed" and stats["circuit"]["trips"] == 0
+
+    # A half-open probe that times out in the queue frees the probe slot without re-opening the circuit
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure(breaker.admit())
+    time.sleep(0.06)
+    breaker.record_skipped(breaker.admit())
+    assert breaker.state == "half_open" and breaker.allow()
+    print("Queueing tests passed")
+
+def test_feedback_during_outage():
+    print("=== Testing Feedback During an LLM Outage ===")
+
+    backend = FakeLLMBackend(latency=0.3)
+    dispatcher = LLMDispatcher(backend, requests_per_minute=0, deadline=0.1,
+                               breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0.5))
+    matcher = SemanticMatcher(llm_dispatcher=dispatcher)
+    matcher.google_api_key = "stub-key"
+    resume = {"text": "Python developer", "sections": {}}
+    job = {"text": "We need a Python developer."}
+
+    # Slow calls time out and fall back until the breaker opens
+    for _ in range(2):
+        assert matcher.get_improved_feedback(resume, job).startswith("Based on semantic analysis")
+    assert matcher.get_llm_stats()["circuit"]["state"] == "open"
+
+    # While open, feedback is rule-based at once and the provider is not called
+    requests = backend.requests
+    start = time.perf_counter()
+    for _ in range(20):
+        assert matcher.get_improved_feedback(resume, job).startswith("Based on semantic analysis")
+    elapsed = time.perf_counter() - start
+    print(f"20 rule-based fallbacks while open: {elapsed:.3f}s")
+    assert backend.requests == requests
+    assert elapsed < 0.5
+    stats = matcher.get_llm_stats()
+    assert stats["short_circuited"] == 20
+
+    # Once the provider recovers, the half-open probe closes the circuit
+    backend.latency = 0
+    time.sleep(0.55)
+    assert matcher.get_improved_feedback(resume, job).startswith("Fake feedback")
+    assert matcher.get_llm_stats()["circuit"]["state"] == "closed"
+    print(matcher.get_llm_stats())
+
+    # An outage of fast failures opens it too
+    backend.outage = True
+    for _ in range(2):
+        matcher.get_improved_feedback(resume, job)
+    assert dispatcher.breaker.is_open()
+    print("Outage fallback tests passed")
+
+if __name__ == "__main__":
+    test_circuit_breaker()
+    test_deadline()
+    test_queueing_does_not_trip_breaker()
+    test_feedback_during_outage()
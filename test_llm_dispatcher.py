@@ -0,0 +1,118 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from scoring.llm_dispatcher import FakeLLMBackend, LLMDispatcher, TokenBucket, pack_prompts, unpack_answers
+from scoring.semantic_matcher import SemanticMatcher
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeModel:
+    """genai.GenerativeModel stand-in answering through a fake backend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def generate_content(self, prompt):
+        return FakeResponse(self.backend.generate(prompt))
+
+def test_llm_dispatcher():
+    print("=== Testing LLM Dispatcher ===")
+
+    # In-flight requests never exceed the cap
+    backend = FakeLLMBackend(latency=0.05)
+    dispatcher = LLMDispatcher(backend, max_concurrency=3, requests_per_minute=0)
+    answers = dispatcher.generate_many([f"Prompt {i}" for i in range(12)])
+    assert all(answers) and len(answers) == 12
+    print(f"Peak in-flight requests: {backend.max_in_flight}")
+    assert backend.max_in_flight == 3
+
+    # Quota errors are retried with backoff; other errors are not
+    backend = FakeLLMBackend(latency=0, quota_errors=2)
+    dispatcher = LLMDispatcher(backend, max_concurrency=1, requests_per_minute=0, base_delay=0.01)
+    assert dispatcher.generate("Prompt").startswith("Fake feedback")
+    stats = dispatcher.get_stats()
+    assert stats["quota_errors"] == 2 and stats["retries"] == 2 and stats["requests"] == 3
+    exhausted = LLMDispatcher(FakeLLMBackend(latency=0, quota_errors=5), requests_per_minute=0,
+                              max_retries=1, base_delay=0.01)
+    try:
+        exhausted.generate("Prompt")
+        assert False, "Quota errors past max_retries must be raised"
+    except Exception as e:
+        assert "429" in str(e)
+    assert exhausted.get_stats()["failures"] == 1
+
+    # The token bucket holds the request rate after the burst is spent
+    bucket = TokenBucket(rate=50, capacity=2)
+    start = time.perf_counter()
+    for _ in range(7):
+        bucket.acquire()
+    elapsed = time.perf_counter() - start
+    print(f"7 tokens at 50/s with a burst of 2: {elapsed:.3f}s")
+    assert elapsed >= 0.09
+
+    # Short prompts are packed into one request and answered separately
+    packed = pack_prompts(["First", "Second", "Third"])
+    assert "### REQUEST 3\nThird" in packed
+    assert unpack_answers("### ANSWER 2\nb\n### ANSWER 1\na\n", 3) == ["a", "b", None]
+    backend = FakeLLMBackend(latency=0)
+    dispatcher = LLMDispatcher(backend, requests_per_minute=0)
+    answers = dispatcher.generate_many([f"Prompt {i}" for i in range(7)], batch_size=3)
+    # The last group holds a single prompt, which is sent as it is
+    assert answers[:6] == [f"Fake feedback for request {i % 3 + 1}" for i in range(6)]
+    assert answers[6] == "Fake feedback (8 characters of prompt)"
+    assert backend.requests == 3 and dispatcher.get_stats()["packed_requests"] == 2
+
+    # Answers a packed response leaves out are requested on their own
+    class ForgetfulBackend(FakeLLMBackend):
+        def generate(self, prompt):
+            answer = super().generate(prompt)
+            return answer.split("### ANSWER 2")[0] if "### REQUEST" in prompt else answer
+    forgetful = ForgetfulBackend(latency=0)
+    answers = LLMDispatcher(forgetful, requests_per_minute=0).generate_many(["a", "b"], batch_size=2)
+    assert answers[0] == "Fake feedback for request 1" and answers[1].startswith("Fake feedback (")
+    assert forgetful.requests == 2
+    print("LLM dispatcher tests passed")
+
+def test_semantic_matcher_dispatch():
+    print("=== Testing Semantic Matcher LLM Dispatch ===")
+
+    # The model client is created once and reused for every prompt
+    created = []
+    backend = FakeLLMBackend(latency=0)
+    matcher = SemanticMatcher()
+    matcher.google_api_key = "stub-key"
+    def create_model():
+        created.append(1)
+        return FakeModel(backend)
+    matcher._get_feedback_model = create_model
+    job = {"text": "We need a Python developer."}
+    resumes = [{"text": f"Resume {i}: Python developer."} for i in range(5)]
+    for resume in resumes:
+        assert matcher.get_improved_feedback(resume, job).startswith("Fake feedback")
+    assert created == [1]
+    assert matcher.get_llm_stats()["requests"] == 5
+
+    # A batch of resumes is dispatched together; failed prompts fall back to rule-based feedback
+    class FailingBackend(FakeLLMBackend):
+        def generate(self, prompt):
+            if "Resume 3" in prompt:
+                raise RuntimeError("model unavailable")
+            return super().generate(prompt)
+    failing = FailingBackend(latency=0.05)
+    matcher.llm_dispatcher = LLMDispatcher(failing, max_concurrency=4, requests_per_minute=0)
+    start = time.perf_counter()
+    feedback = matcher.get_improved_feedback_batch(resumes, job)
+    elapsed = time.perf_counter() - start
+    print(f"5 feedbacks at 50 ms each, 4 at a time: {elapsed:.3f}s")
+    assert elapsed < 0.2
+    assert [f.startswith("Fake feedback") for f in feedback] == [True, True, True, False, True]
+    assert feedback[3].startswith("Based on semantic analysis")
+    print("Semantic matcher dispatch tests passed")
+
+if __name__ == "__main__":
+    test_llm_dispatcher()
+    test_semantic_matcher_dispatch()
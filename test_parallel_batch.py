@@ -0,0 +1,166 @@
+import sys
+import os
+import tempfile
+import time
+import multiprocessing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import main
+from main import ResumeEvaluator
+from scoring.llm_dispatcher import FakeLLMBackend, LLMDispatcher
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def test_parallel_batch():
+    print("=== Testing Parallel Batch Evaluation ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Every store (evaluations, parse and feedback caches) goes to the temporary database
+        evaluator = ResumeEvaluator(db_path=os.path.join(tmp_dir, 'evaluations.db'))
+
+        # A missing file in the middle must be isolated as an error without shifting results
+        resume_paths = [
+            os.path.join(BASE_DIR, 'sample_resume.docx'),
+            os.path.join(tmp_dir, 'missing.txt'),
+            os.path.join(BASE_DIR, 'samples', 'Resume - 4 - Copy.pdf'),
+            os.path.join(BASE_DIR, 'sample_resume.docx'),
+        ]
+        jd_path = os.path.join(BASE_DIR, 'samples', 'sample_jd.txt')
+
+        serial = evaluator.batch_evaluate(resume_paths, jd_path)
+        parallel = evaluator.batch_evaluate(resume_paths, jd_path, workers=2, chunk_size=1, item_timeout=60)
+        chunked = evaluator.batch_evaluate(resume_paths, jd_path, workers=2, chunk_size=3, item_timeout=60)
+
+        for results in (serial, parallel, chunked):
+            print([(r["resume_filename"], r.get("relevance_score", r.get("error"))) for r in results])
+            assert [r["resume_filename"] for r in results] == [os.path.basename(p) for p in resume_paths]
+            assert "error" in results[1]
+            assert all("evaluation_id" in r for i, r in enumerate(results) if i != 1)
+
+        for expected, actual in zip(serial, parallel):
+            assert expected.get("relevance_score") == actual.get("relevance_score")
+
+        # The streaming generator yields the same results one at a time
+        stream = evaluator.iter_batch_evaluate(resume_paths, jd_path, workers=2)
+        first = next(stream)
+        assert first["resume_filename"] == "sample_resume.docx"
+        assert [r["resume_filename"] for r in stream] == [os.path.basename(p) for p in resume_paths[1:]]
+
+def test_parallel_batch_llm_feedback_in_parent():
+    print("=== Testing Parallel Batch LLM Feedback ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        evaluator = ResumeEvaluator(feedback_mode="sync", db_path=os.path.join(tmp_dir, 'evaluations.db'))
+        # Worker processes only have copies of this backend, so its counter sees requests sent from this process
+        backend = FakeLLMBackend(latency=0)
+        evaluator.semantic_matcher.google_api_key = "stub-key"
+        evaluator.semantic_matcher.llm_dispatcher = LLMDispatcher(backend, requests_per_minute=0)
+
+        resume_paths = [
+            os.path.join(BASE_DIR, 'sample_resume.docx'),
+            os.path.join(BASE_DIR, 'samples', 'Resume - 4 - Copy.pdf'),
+        ]
+        jd_path = os.path.join(BASE_DIR, 'samples', 'sample_jd.txt')
+        results = evaluator.batch_evaluate(resume_paths, jd_path, workers=2, chunk_size=1)
+
+        print([(r["resume_filename"], r["feedback_status"]) for r in results])
+        assert all(r["feedback_status"] == "ready" for r in results)
+        assert all(r["improved_feedback"].startswith("Fake feedback") for r in results)
+        assert backend.requests == 2
+        stored = evaluator.get_improved_feedback(results[0]["evaluation_id"])
+        assert stored["improved_feedback"].startswith("Fake feedback")
+
+def test_stream_endpoint_omits_texts():
+    print("=== Testing Batch Stream Endpoint ===")
+    import io
+    import json
+    from app.api.app import app
+    api = sys.modules[app.import_name]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The endpoint uses the module's evaluator; swap in one whose stores all live in the temporary database
+        original = api.evaluator
+        api.evaluator = evaluator = ResumeEvaluator(db_path=os.path.join(tmp_dir, 'evaluations.db'))
+        try:
+            with open(os.path.join(BASE_DIR, 'sample_resume.docx'), 'rb') as f:
+                resume = f.read()
+            with open(os.path.join(BASE_DIR, 'samples', 'sample_jd.txt'), 'rb') as f:
+                jd = f.read()
+
+            response = app.test_client().post('/api/batch-evaluate/stream', data={
+                'jd': (io.BytesIO(jd), 'sample_jd.txt'),
+                'resumes': [(io.BytesIO(resume), 'sample_resume.docx'), (io.BytesIO(resume), 'copy.docx')],
+            }, content_type='multipart/form-data')
+            events = [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line.strip()]
+        finally:
+            api.evaluator = original
+
+        print([event["event"] for event in events])
+        assert [event["event"] for event in events] == ['result', 'result', 'complete']
+        results = [event["result"] for event in events[:2]]
+        assert all("relevance_score" in r for r in results)
+        # The texts stay in the database rather than being repeated in every event
+        assert all("resume_text" not in r and "jd_text" not in r for r in results)
+        assert evaluator.get_evaluation(results[0]["evaluation_id"])["resume_text"]
+
+def _hanging_chunk(resume_paths):
+    """Stand-in for _evaluate_chunk whose worker never returns for 'hang' entries"""
+    if any('hang' in path for path in resume_paths):
+        time.sleep(600)
+    return [{"resume_filename": path} for path in resume_paths]
+
+def _crashing_chunk(resume_paths):
+    """Stand-in for _evaluate_chunk whose worker process dies on 'crash' entries"""
+    if any('crash' in path for path in resume_paths):
+        os._exit(1)
+    return [{"resume_filename": path} for path in resume_paths]
+
+def test_parallel_batch_worker_crash_is_isolated():
+    print("=== Testing Parallel Batch Worker Crash ===")
+
+    executor_module = sys.modules[main.ParallelBatchExecutor.__module__]
+    original = executor_module._evaluate_chunk
+    executor_module._evaluate_chunk = _crashing_chunk
+    try:
+        executor = main.ParallelBatchExecutor(workers=2, chunk_size=1, item_timeout=30)
+        # Two workers even on one CPU, so other chunks are in flight when the pool breaks
+        executor.workers = 2
+        results = list(executor.iter_run(['a', 'crash', 'b', 'c', 'd'], job_context=None))
+    finally:
+        executor_module._evaluate_chunk = original
+
+    print([(r["resume_filename"], r.get("error")) for r in results])
+    # Only the resume that killed its worker fails; the chunks lost with the pool are rerun
+    assert [r["resume_filename"] for r in results] == ['a', 'crash', 'b', 'c', 'd']
+    assert "crashed" in results[1]["error"]
+    assert all("error" not in r for i, r in enumerate(results) if i != 1)
+    assert not multiprocessing.active_children()
+
+def test_parallel_batch_timeout_kills_worker():
+    print("=== Testing Parallel Batch Timeout ===")
+
+    executor_module = sys.modules[main.ParallelBatchExecutor.__module__]
+    original = executor_module._evaluate_chunk
+    executor_module._evaluate_chunk = _hanging_chunk
+    try:
+        executor = main.ParallelBatchExecutor(workers=2, chunk_size=1, item_timeout=1)
+        started = time.monotonic()
+        results = list(executor.iter_run(['a', 'hang', 'b', 'c'], job_context=None))
+        elapsed = time.monotonic() - started
+    finally:
+        executor_module._evaluate_chunk = original
+
+    print([(r["resume_filename"], r.get("error")) for r in results], f"{elapsed:.1f}s")
+    assert [r["resume_filename"] for r in results] == ['a', 'hang', 'b', 'c']
+    assert "timed out" in results[1]["error"]
+    assert all("error" not in r for i, r in enumerate(results) if i != 1)
+    assert elapsed < 30
+    # The stuck worker was terminated rather than left running
+    assert not multiprocessing.active_children()
+
+if __name__ == "__main__":
+    test_parallel_batch()
+    test_parallel_batch_llm_feedback_in_parent()
+    test_stream_endpoint_omits_texts()
+    test_parallel_batch_worker_crash_is_isolated()
+    test_parallel_batch_timeout_kills_worker()
@@ -0,0 +1,60 @@
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from main import ResumeEvaluator
+from parser.resume_parser import ResumeParser, ResumeUpload
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def test_parse_bytes():
+    print("=== Testing In-Memory Resume Parsing ===")
+
+    parser = ResumeParser()
+    docx_path = os.path.join(BASE_DIR, 'sample_resume.docx')
+    pdf_path = os.path.join(BASE_DIR, 'samples', 'Resume - 4 - Copy.pdf')
+
+    # Bytes, streams and paths all parse the same way
+    for path, kind in ((docx_path, 'docx'), (pdf_path, 'resume.PDF')):
+        with open(path, 'rb') as f:
+            data = f.read()
+        from_path = parser.parse(path)
+        assert from_path["text"]
+        assert parser.parse_bytes(data, kind) == from_path
+        with open(path, 'rb') as f:
+            assert parser.parse_bytes(f, kind) == from_path
+
+    try:
+        parser.parse_bytes(b"plain text", "notes.txt")
+        assert False, "unsupported formats must be rejected"
+    except ValueError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Every store (evaluations, parse and feedback caches) goes to the temporary database
+        evaluator = ResumeEvaluator(db_path=os.path.join(tmp_dir, 'evaluations.db'))
+        jd_path = os.path.join(BASE_DIR, 'samples', 'sample_jd.txt')
+
+        with open(docx_path, 'rb') as f:
+            docx_data = f.read()
+        with open(pdf_path, 'rb') as f:
+            pdf_data = f.read()
+
+        result = evaluator.evaluate_bytes(docx_data, 'resume.docx', jd_path)
+        assert result["resume_filename"] == 'resume.docx'
+        assert result["relevance_score"] == evaluator.evaluate(docx_path, jd_path)["relevance_score"]
+
+        # Uploads with the same name no longer collide, serially or on the process pool
+        uploads = [ResumeUpload('resume.pdf', pdf_data), ResumeUpload('resume.docx', docx_data),
+                   ResumeUpload('resume.pdf', pdf_data)]
+        serial = evaluator.batch_evaluate(uploads, jd_path)
+        parallel = evaluator.batch_evaluate(uploads, jd_path, workers=2)
+        for results in (serial, parallel):
+            print([(r["resume_filename"], r.get("relevance_score", r.get("error"))) for r in results])
+            assert [r["resume_filename"] for r in results] == ['resume.pdf', 'resume.docx', 'resume.pdf']
+            assert all("evaluation_id" in r for r in results)
+        assert [r["relevance_score"] for r in serial] == [r["relevance_score"] for r in parallel]
+
+if __name__ == "__main__":
+    test_parse_bytes()
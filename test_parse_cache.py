@@ -0,0 +1,60 @@
+import sys
+import os
+import shutil
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.parse_cache import ParseCache
+from parser.resume_parser import ResumeParser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def test_parse_cache():
+    print("=== Testing Parse Cache ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ParseCache(os.path.join(tmp_dir, 'cache.db'))
+        parser = ResumeParser(cache=cache)
+
+        # The same bytes under a different name are a cache hit
+        original = os.path.join(BASE_DIR, 'sample_resume.docx')
+        copy = os.path.join(tmp_dir, 'resubmitted.docx')
+        shutil.copy(original, copy)
+
+        first = parser.parse(original)
+        second = parser.parse(copy)
+        assert second == first
+        assert second == ResumeParser().parse(original)
+        stats = cache.get_stats()
+        print(stats)
+        assert stats["misses"] == 1 and stats["memory_hits"] == 1 and stats["disk_entries"] == 1
+
+        # Callers get their own copy
+        second["keywords"].append("mutated")
+        assert "mutated" not in parser.parse(original)["keywords"]
+
+        # A new process (empty memory tier) reads the persisted entry without re-parsing
+        restarted = ParseCache(cache.db_path)
+        restarted_parser = ResumeParser(cache=restarted)
+        restarted_parser.parse_docx = None
+        assert restarted_parser.parse(original) == first
+        assert restarted.get_stats()["disk_hits"] == 1
+
+        # A parser version bump never reuses old entries
+        bumped = ResumeParser(cache=restarted)
+        bumped.PARSER_VERSION = "next"
+        bumped.parse(original)
+        assert restarted.get_stats()["misses"] == 1
+
+        # Both tiers stay within their size bounds, dropping least recently used entries
+        small = ParseCache(os.path.join(tmp_dir, 'small.db'), max_memory_bytes=250, max_disk_bytes=250)
+        for i in range(5):
+            small.put(f"key{i}", {"text": "x" * 100})
+        stats = small.get_stats()
+        print(stats)
+        assert stats["memory_bytes"] <= 250 and stats["disk_bytes"] <= 250
+        assert small.get("key4") is not None
+        assert small.get("key0") is None
+
+if __name__ == "__main__":
+    test_parse_cache()
@@ -0,0 +1,63 @@
+import sys
+import os
+import json
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.job_context import JobContext
+from scoring.relevance_scorer import RelevanceScorer
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_parsed_documents():
+    print("=== Testing Compact Parsed Documents ===")
+
+    parser = ResumeParser()
+    text = read_sample('sample_resume.txt') + "\nSKILLS\nMachine Learning, Kubernetes\n"
+    resume = parser.parse_from_text(text)
+    print(resume)
+
+    # The dict view has the keys and values callers always had
+    assert list(resume) == ["text", "tokens", "sections", "section_ranges", "keywords", "skills", "skill_ids",
+                            "email", "phone", "job_title"]
+    assert resume["sections"] == parser.extract_sections(text)
+    assert resume.get("sections", {}).get("skills", "").endswith("Kubernetes")
+    assert resume["email"] == parser.extract_email(text)
+    assert "machine learning" in resume["keywords"] and len(set(resume["keywords"])) == len(resume["keywords"])
+    assert resume.get("missing", "default") == "default" and "email" in resume
+    # Sections are offsets into the one text
+    for name, ranges in resume["section_ranges"].items():
+        assert resume["sections"][name] == "\n\n".join(text[start:end] for start, end in ranges)
+
+    # Views are fresh copies; the document itself is read-only
+    resume["keywords"].append("mutated")
+    assert "mutated" not in resume["keywords"]
+    try:
+        resume["email"] = "other@example.com"
+        assert False, "parsed documents are read-only"
+    except TypeError:
+        pass
+
+    # Compact state for the parse cache, plain dicts for JSON, pickling for worker processes
+    state = json.loads(json.dumps(resume.to_state()))
+    assert type(resume).from_state(state, parser) == resume
+    assert json.loads(json.dumps(resume.to_dict()))["sections"] == resume["sections"]
+    assert pickle.loads(pickle.dumps(resume)) == resume
+
+    # Parsed jobs work wherever the dict did
+    job_data = JdParser().parse(read_sample('sample_jd.txt'))
+    assert "Python" in job_data["must_have_skills"] and job_data["experience"] == "5+ years"
+    context = JobContext(job_data)
+    restored = pickle.loads(pickle.dumps(context))
+    assert restored.must_have_skills == context.must_have_skills
+    scorer = RelevanceScorer()
+    assert scorer.calculate_relevance(resume, context) == scorer.calculate_relevance(resume.to_dict(), job_data.to_dict())
+
+if __name__ == "__main__":
+    test_parsed_documents()
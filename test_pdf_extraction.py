@@ -0,0 +1,56 @@
+import sys
+import os
+import io
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+import pypdfium2 as pdfium
+from parser.parse_cache import ParseCache
+from parser.resume_parser import ResumeParser
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def build_pdf(pages):
+    """Repeat the sample resume's first page into a longer PDF"""
+    source = pdfium.PdfDocument(os.path.join(BASE_DIR, 'samples', 'Resume - 4 - Copy.pdf'))
+    document = pdfium.PdfDocument.new()
+    document.import_pages(source, [0] * pages)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def test_pdf_extraction():
+    print("=== Testing Budgeted PDF Extraction ===")
+
+    data = build_pdf(ResumeParser.PARALLEL_MIN_PAGES)
+    full = ResumeParser(page_workers=1).parse_pdf(io.BytesIO(data))
+    one_page = ResumeParser().parse_pdf(os.path.join(BASE_DIR, 'samples', 'Resume - 4 - Copy.pdf'))
+    print(f"{len(full)} characters in {ResumeParser.PARALLEL_MIN_PAGES} pages")
+
+    # Page-parallel extraction returns exactly the serial text, and later PDFs reuse the same worker pool
+    parallel_parser = ResumeParser(page_workers=2, pdf_backend="pdfplumber")
+    assert parallel_parser.parse_pdf(io.BytesIO(data)) == full
+    pool = parallel_parser._page_pool
+    assert pool is not None
+    assert parallel_parser.parse_pdf(io.BytesIO(data)) == full
+    assert parallel_parser._page_pool is pool
+
+    # Short PDFs are read serially and never start the pool
+    short_parser = ResumeParser(page_workers=2)
+    assert short_parser.parse_pdf(io.BytesIO(build_pdf(ResumeParser.PARALLEL_MIN_PAGES - 1)))
+    assert short_parser._page_pool is None
+
+    # Budgets cut the text at a page or character limit
+    assert ResumeParser(max_pages=1).parse_pdf(io.BytesIO(data)) == one_page
+    assert ResumeParser(max_chars=500).parse_pdf(io.BytesIO(data)) == full[:500]
+    assert ResumeParser(max_chars=500, page_workers=2).parse_pdf(io.BytesIO(data)) == full[:500]
+
+    # A budgeted parse is never served to a full parse from the cache
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ParseCache(os.path.join(tmp_dir, 'cache.db'))
+        assert ResumeParser(cache=cache, max_chars=500).parse_bytes(data, 'pdf')["text"] == full[:500]
+        assert ResumeParser(cache=cache).parse_bytes(data, 'pdf')["text"] == full
+        assert cache.get_stats()["misses"] == 2
+
+if __name__ == "__main__":
+    test_pdf_extraction()
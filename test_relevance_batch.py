@@ -0,0 +1,43 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.relevance_scorer import RelevanceScorer
+from scoring.job_context import JobContext
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_relevance_batch():
+    print("=== Testing Batch Relevance Scoring ===")
+
+    resume_parser = ResumeParser()
+    resumes = [
+        resume_parser.parse_from_text(read_sample('sample_resume.txt')),
+        resume_parser.parse_from_text(read_sample('sample_jd_2.txt')),
+        resume_parser.parse_from_text("EDUCATION\nBachelor's degree in Computer Science\n\nEXPERIENCE\n6 years"),
+        resume_parser.parse_from_text(""),
+    ]
+    scorer = RelevanceScorer()
+
+    for jd_name in ('sample_jd.txt', 'sample_jd_2.txt'):
+        job = JobContext(JdParser().parse(read_sample(jd_name)))
+        batch = scorer.calculate_relevance_batch(resumes, job)
+        single = [scorer.calculate_relevance(resume, job) for resume in resumes]
+        print(f"{jd_name}: {[r['relevance_score'] for r in batch]}")
+        assert batch == single
+
+    # A job with no requirements scores every component as fully covered
+    empty_job = JobContext({"text": ""})
+    assert scorer.calculate_relevance_batch(resumes, empty_job) == [
+        scorer.calculate_relevance(resume, empty_job) for resume in resumes
+    ]
+    assert scorer.calculate_relevance_batch([], empty_job) == []
+
+if __name__ == "__main__":
+    test_relevance_batch()
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+
+RESUME = """Jane Smith
+Email: jane@example.com
+Phone: 555-123-4567
+
+Summary
+Experienced backend engineer. Skilled in Python.
+
+WORK EXPERIENCE
+Backend Engineer | Acme | 2019 - Present
+- Built APIs
+Education: B.S. in Computer
+Science | State University
+TECHNICAL SKILLS
+Python, SQL
+Projects
+Search engine"""
+
+def test_section_segmenter():
+    print("=== Testing Section Segmenter ===")
+
+    parser = ResumeParser()
+    spans = parser.segment_sections(RESUME)
+    print([(span.name, span.start, span.end) for span in spans])
+
+    # One span per header in document order; Phone continues the contact section
+    assert [span.name for span in spans] == ["contact", "summary", "experience", "education", "skills", "projects"]
+    assert all(a.end == b.start for a, b in zip(spans, spans[1:]))
+    assert spans[-1].end == len(RESUME)
+
+    sections = parser.extract_sections(RESUME)
+    assert sections["contact"] == "Email: jane@example.com\nPhone: 555-123-4567"
+    # Words inside sentences ("Experienced", "Skilled") are not headers
+    assert sections["summary"] == "Summary\nExperienced backend engineer. Skilled in Python."
+    assert sections["experience"].endswith("- Built APIs")
+    # Line breaks are kept, and an inline header's body is everything after the colon
+    assert spans[3].body(RESUME).strip() == "B.S. in Computer\nScience | State University"
+    assert sections["skills"] == "TECHNICAL SKILLS\nPython, SQL"
+    assert sections["certifications"] == ""
+
+    # A header that text extraction ran onto the end of a sentence is still found
+    assert parser.extract_sections("Objective\nGrow as an analyst. Education\nB.Tech")["education"] == "Education\nB.Tech"
+
+    # A mention of a section name no longer swallows the rest of the document
+    text = "Summary\nI list my skills below and my experience too.\n" + "filler line\n" * 1000
+    sections = parser.extract_sections(text)
+    assert sections["skills"] == "" and sections["experience"] == ""
+
+if __name__ == "__main__":
+    test_section_segmenter()
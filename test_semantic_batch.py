@@ -0,0 +1,59 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.semantic_matcher import SemanticMatcher
+from scoring.job_context import JobContext
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_semantic_batch():
+    print("=== Testing Batched Semantic Similarity ===")
+
+    resume_parser = ResumeParser()
+    base_resumes = [
+        resume_parser.parse_from_text(read_sample('sample_resume.txt')),
+        resume_parser.parse_from_text(read_sample('sample_jd_2.txt')),
+        resume_parser.parse_from_text(""),
+    ]
+    resumes = base_resumes * 100
+    job = JobContext(JdParser().parse(read_sample('sample_jd.txt')))
+
+    # With a fixed vectorizer the batch path must match per-resume scoring
+    matcher = SemanticMatcher(vectorizer_mode="hashing")
+
+    start = time.perf_counter()
+    single = [matcher.calculate_semantic_similarity(resume, job) for resume in resumes]
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = matcher.calculate_semantic_similarity_batch(resumes, job)
+    batch_time = time.perf_counter() - start
+
+    print(f"{len(resumes)} resumes: one-by-one {single_time:.3f}s, batched {batch_time:.3f}s")
+    assert len(batch) == len(resumes)
+    for want, got in zip(single, batch):
+        assert abs(want["overall_similarity"] - got["overall_similarity"]) < 1e-9
+        assert want["section_similarities"].keys() == got["section_similarities"].keys()
+        for section, value in want["section_similarities"].items():
+            assert abs(value - got["section_similarities"][section]) < 1e-9
+
+    # Auto mode without a corpus model still batches, using the hashing vectorizer, so its batch scores
+    # are the hashing scores and do not depend on how the resumes are split into batches
+    matcher = SemanticMatcher(vectorizer_mode="auto")
+    matcher.corpus_model = None
+    hashing = SemanticMatcher(vectorizer_mode="hashing")
+    batch = matcher.calculate_semantic_similarity_batch(base_resumes, job)
+    chunked = [matcher.calculate_semantic_similarity_batch([resume], job)[0] for resume in base_resumes]
+    for resume, got, got_chunked in zip(base_resumes, batch, chunked):
+        assert hashing.calculate_semantic_similarity(resume, job) == got == got_chunked
+
+if __name__ == "__main__":
+    test_semantic_batch()
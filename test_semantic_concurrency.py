@@ -0,0 +1,47 @@
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.semantic_matcher import SemanticMatcher
+from scoring.job_context import JobContext
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_semantic_concurrency():
+    print("=== Testing Concurrent Semantic Matching ===")
+
+    resume_parser = ResumeParser()
+    resumes = [
+        resume_parser.parse_from_text(read_sample('sample_resume.txt')),
+        resume_parser.parse_from_text(read_sample('sample_jd_2.txt')),
+    ]
+    jobs = [
+        JobContext(JdParser().parse(read_sample('sample_jd.txt'))),
+        JobContext(JdParser().parse(read_sample('sample_jd_2.txt'))),
+    ]
+    pairs = [(resume, job) for resume in resumes for job in jobs] * 25
+
+    for mode in ("auto", "hashing"):
+        matcher = SemanticMatcher(vectorizer_mode=mode)
+        # Exercise per-pair fitting even if a corpus model exists locally
+        matcher.corpus_model = None
+        expected = [matcher.calculate_semantic_similarity(resume, job) for resume, job in pairs]
+
+        # One shared matcher used from many threads must give the same answers as serial calls
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            actual = list(executor.map(lambda pair: matcher.calculate_semantic_similarity(*pair), pairs))
+
+        print(f"{mode}: {[round(r['overall_similarity'], 4) for r in expected[:4]]}")
+        for want, got in zip(expected, actual):
+            assert abs(want["overall_similarity"] - got["overall_similarity"]) < 1e-9
+            assert want["section_similarities"].keys() == got["section_similarities"].keys()
+
+if __name__ == "__main__":
+    test_semantic_concurrency()
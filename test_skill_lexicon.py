@@ -0,0 +1,66 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from utils.skill_lexicon import SkillLexicon, get_skill_lexicon
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.relevance_scorer import RelevanceScorer
+from scoring.job_context import JobContext
+
+def test_skill_lexicon():
+    print("=== Testing Skill Lexicon ===")
+
+    lexicon = get_skill_lexicon()
+    text = ("Built REST APIs in Python & Node.js; C++ / C# and Go.\n"
+            "Machine\n  learning with scikit-learn on k8s and Postgres. Let's go over the rest, etc.")
+    skills = lexicon.skills(text)
+    print(skills)
+    assert skills == ["REST APIs", "Python", "Node.js", "C++", "C#", "Go", "Machine Learning",
+                      "scikit-learn", "Kubernetes", "PostgreSQL"]
+    # Overlapping aliases keep the longest mention ("js" inside "Node.js"), and offsets point into the text
+    start, end, skill_id = lexicon.find("Node.js developer")[0]
+    assert (start, end, lexicon.names[skill_id]) == (0, 7, "Node.js")
+    # Synonyms resolve to one canonical ID; whole phrases can be looked up
+    assert lexicon.lookup("Postgres") == lexicon.lookup("PostgreSQL") == lexicon.skill_ids("postgresql")[0]
+    assert lexicon.lookup("  machine   LEARNING ") == lexicon.lookup("ML")
+    assert lexicon.lookup("other frontend frameworks") is None
+
+    # Terms match whole words only, and case-sensitive terms only in their own case
+    small = SkillLexicon([{"name": "C", "case_sensitive": ["C"]}, {"name": "Java"}, {"name": "JavaScript"}])
+    assert small.skills("C, c and C++ or Objective-C") == ["C"]
+    assert [small.names[i] for _, _, i in small.find("C, c and C++ or Objective-C")] == ["C", "C"]
+    assert small.skills("javascript, Java and Javanese") == ["JavaScript", "Java"]
+
+    # Single-letter skills need a list or language context; abbreviations, labels and "node" are not skills
+    for text in ["Led R&D for the platform team", "Based in Washington D.C. since 2019",
+                 "See Section C: Benefits", "Implemented a balanced tree node cache", "A C-suite facing role"]:
+        assert lexicon.skills(text) == [], text
+    assert lexicon.skills("Languages: C, R, Python") == ["C", "R", "Python"]
+    assert lexicon.skills("SKILLS\n- C\n- R") == ["C", "R"]
+    assert lexicon.skills("Strong C and R programming experience") == ["C", "R"]
+    assert lexicon.skills("C/C++ developer") == ["C", "C++"]
+
+    # Both parsers report canonical skills; multi-word and symbol names also become keywords
+    resume = ResumeParser().parse_from_text("SKILLS\nMachine Learning, C++, Node.js")
+    job = JdParser().parse("Requirements:\n- ML\n- C++\n- NodeJS\n- Rust")
+    assert resume["skills"] == ["Machine Learning", "C++", "Node.js"]
+    assert {"machine learning", "c++", "node.js"} <= set(resume["keywords"])
+    assert set(job["skill_ids"]) == set(resume["skill_ids"]) | {lexicon.lookup("Rust")}
+
+    # Scoring treats lexicon skills as a set intersection on IDs, in single and batch mode alike
+    context = JobContext(job)
+    scorer = RelevanceScorer()
+    result = scorer.calculate_relevance(resume, context)
+    print(result["missing_elements"])
+    assert result["missing_elements"]["must_have_skills"] == ["Rust"]
+
+    # Resumes parsed before the lexicon existed (no skill_ids) fall back to keyword matching
+    legacy = {key: value for key, value in resume.items() if key not in ("skills", "skill_ids")}
+    resumes = [resume, legacy, ResumeParser().parse_from_text("")]
+    assert scorer.calculate_relevance_batch(resumes, context) == [
+        scorer.calculate_relevance(r, context) for r in resumes
+    ]
+
+if __name__ == "__main__":
+    test_skill_lexicon()
@@ -0,0 +1,71 @@
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
+
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from utils.tokenizer import NgramAnalyzer, document_tokens, tokenize
+from parser.resume_parser import ResumeParser
+from parser.jd_parser import JdParser
+from scoring.job_context import JobContext
+from scoring.semantic_matcher import SemanticMatcher
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), 'samples')
+
+def read_sample(name):
+    with open(os.path.join(SAMPLES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_tokenizer():
+    print("=== Testing Shared Tokenizer ===")
+
+    tokens = tokenize("Python, python and C++ in Python3 (2019)")
+    assert tokens.terms == ["python", "and", "in", "python3", "2019"]
+    assert list(tokens.term_ids) == [0, 0, 1, 2, 3, 4]
+    assert tokens.counts()["python"] == 2 and len(tokens) == 6
+    assert (tokens.starts[1], tokens.ends[1]) == (8, 14)
+    # Only tokens lying entirely inside the range; words() keeps the parsers' alphabetic keywords
+    assert tokens.terms_between(8, 20) == ["python", "and"]
+    assert tokens.words() == ["python", "and"]
+    assert pickle.loads(pickle.dumps(tokens)) == tokens
+
+    # The analyzer over shared tokens produces exactly scikit-learn's English 1-2 grams
+    reference = TfidfVectorizer(stop_words='english', ngram_range=(1, 2)).build_analyzer()
+    analyzer = NgramAnalyzer()
+    for name in ('sample_resume.txt', 'sample_jd.txt', 'sample_jd_2.txt'):
+        text = read_sample(name)
+        assert analyzer(tokenize(text).terms_between()) == reference(text)
+        assert analyzer(text) == reference(text)
+
+    # Parsers keep their tokens; section terms are slices of them, not a second tokenization
+    resume = ResumeParser().parse_from_text(read_sample('sample_resume.txt'))
+    reference_tokens = tokenize(resume["text"])
+    assert resume["tokens"].terms == reference_tokens.terms
+    assert resume["tokens"].starts == reference_tokens.starts
+    matcher = SemanticMatcher(vectorizer_mode="hashing")
+    for section, section_text in resume["sections"].items():
+        if section_text and len(section_text) < 1000:
+            assert matcher._resume_section_terms(resume, section) == tokenize(section_text).terms_between()
+
+    # Results match vectorizing the raw strings with the word analyzer
+    jd = JdParser().parse(read_sample('sample_jd.txt'))
+    job = JobContext(jd)
+    result = matcher.calculate_semantic_similarity(resume, job)
+    raw = HashingVectorizer(n_features=2 ** 18, stop_words='english', ngram_range=(1, 2),
+                            alternate_sign=False, norm='l2')
+    expected = cosine_similarity(raw.transform([resume["text"][:5000]]), raw.transform([jd["text"][:5000]]))[0][0]
+    print(f"overall similarity {result['overall_similarity']:.4f} (raw strings {expected:.4f})")
+    assert abs(result["overall_similarity"] - expected) < 1e-9
+
+    # Dicts without tokens (e.g. built by hand) are tokenized on first use and keep them
+    document = {"text": "Flask and Docker"}
+    assert document_tokens(document) is document_tokens(document)
+
+    # A job whose section vectorizer is fitted can still be sent to worker processes
+    job.get_section_representation()
+    restored = pickle.loads(pickle.dumps(job))
+    assert restored.get_section_representation()[1].nnz == job.get_section_representation()[1].nnz
+
+if __name__ == "__main__":
+    test_tokenizer()